@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wf_lib  # noqa: E402
+from wf_engine import parse_angka  # noqa: E402
+
+# Katalog uji: 12 profil WF dengan properti diturunkan dari dimensi tanpa fillet pada I, S, Z dan J
+# (format snapshot wf_catalog)
+KATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "katalog_wf.json")
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    return wf_lib.load_catalog(KATALOG)
+
+
+def nilai(hasil, key, kondisi):
+    """"Nilai" of the row `kondisi` in result table `key`, as a float"""
+    for row in hasil[key][1:]:
+        if row[0] == kondisi:
+            return parse_angka(row[2])
+    raise KeyError(f"{kondisi} not in {key}")
+
+
+def status(hasil, key, kondisi):
+    for row in hasil[key][1:]:
+        if row[0] == kondisi:
+            return row[-1]
+    raise KeyError(f"{kondisi} not in {key}")
+
+
+def rasio_maks(hasil, metode):
+    """Largest ratio of the rows marked OK / TIDAK OK in the tables of `metode`"""
+    return max(parse_angka(row[5]) for key, tabel in hasil.items() if key.endswith(metode.lower())
+               for row in tabel[1:] if row[-1] in ("OK", "TIDAK OK"))
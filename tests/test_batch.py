@@ -0,0 +1,105 @@
+import csv
+import json
+import os
+
+import pytest
+
+from conftest import KATALOG
+import wf_batch
+
+GRID = {"profil": ["WF 200x100x5,5x8", "WF 300x150x6,5x9", "WF 400x200x8x13"],
+        "params": {"fy": 250, "fu": 410, "L": [3, 6], "Nc": [100, 400]}}
+
+
+def _sweep(tmp_path, grid, output, *opsi):
+    path = tmp_path / "sweep.json"
+    path.write_text(json.dumps(grid), encoding="utf-8")
+    return wf_batch.main([str(path), "-o", str(output), "--snapshot", KATALOG, "--workers", "1", *opsi])
+
+
+def _csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _kunci(rows):
+    return sorted((r["case_id"], r["hasil"], r["Kondisi"]) for r in rows)
+
+
+def test_expand_grid():
+    cases = wf_batch.expand_grid(GRID, ())
+    assert len(cases) == 3 * 2 * 2
+    assert cases[0] == ("WF 200x100x5,5x8", {"fy": 250, "fu": 410, "L": 3, "Nc": 100})
+
+
+def test_csv_lanjut_setelah_terhenti(tmp_path):
+    keluaran = tmp_path / "hasil.csv"
+    assert _sweep(tmp_path, GRID, keluaran) == 0
+    lengkap = _csv(keluaran)
+    # Terhenti di tengah kasus: baris terakhir terpotong
+    with open(keluaran, encoding="utf-8") as f:
+        baris = f.readlines()
+    with open(keluaran, "w", encoding="utf-8") as f:
+        f.writelines(baris[:len(baris) // 2])
+        f.write(baris[len(baris) // 2][:10])
+    assert _sweep(tmp_path, GRID, keluaran) == 0
+    assert _kunci(_csv(keluaran)) == _kunci(lengkap)
+
+
+def test_csv_kolom_berbeda_ditolak(tmp_path, capsys):
+    keluaran = tmp_path / "hasil.csv"
+    _sweep(tmp_path, GRID, keluaran)
+    with pytest.raises(SystemExit) as keluar:
+        _sweep(tmp_path, dict(GRID, params=dict(GRID["params"], Mux=10)), keluaran)
+    assert keluar.value.code == 2
+    assert "different columns" in capsys.readouterr().err
+
+
+def test_kasus_gagal_dicatat(tmp_path, monkeypatch):
+    def gagal(*args, **kwargs):
+        raise ZeroDivisionError("division by zero")
+
+    monkeypatch.setattr(wf_batch.wf_lib, "calculate_params", gagal)
+    wf_batch._init_worker(KATALOG)
+    cid, _, _, records, error = wf_batch._run(("c0", "WF 300x150x6,5x9", {"fy": 250}))
+    assert (cid, records, error) == ("c0", [], "ZeroDivisionError: division by zero")
+
+
+def test_parquet_lanjut_setelah_terhenti(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    keluaran = tmp_path / "hasil"
+    sebagian = dict(GRID, profil=GRID["profil"][:1])
+    assert _sweep(tmp_path, sebagian, keluaran, "--format", "parquet") == 0
+    # Part yang sedang ditulis saat proses dihentikan
+    (keluaran / "part-00001.parquet.tmp").write_bytes(b"PAR1")
+    assert _sweep(tmp_path, GRID, keluaran, "--format", "parquet") == 0
+    assert not any(p.endswith(".tmp") for p in os.listdir(keluaran))
+    tabel = pq.read_table(keluaran).to_pylist()
+
+    lengkap = tmp_path / "lengkap"
+    _sweep(tmp_path, GRID, lengkap, "--format", "parquet")
+    assert _kunci(tabel) == _kunci(pq.read_table(lengkap).to_pylist())
+
+
+def test_parquet_batch_tersimpan_tanpa_close(tmp_path):
+    pytest.importorskip("pyarrow")
+    kolom = ["case_id", "profil", "hasil", "Kondisi"]
+    sink = wf_batch.ParquetSink(str(tmp_path), kolom, batch=2)
+    for i in range(5):
+        sink.write([{"case_id": f"c{i}", "profil": "WF", "hasil": "tarik_dfbt", "Kondisi": "-"}])
+    # Proses dihentikan sebelum close(): batch yang sudah di-flush tetap terbaca
+    lanjut = wf_batch.ParquetSink(str(tmp_path), kolom, batch=2)
+    assert lanjut.done == {"c0", "c1", "c2", "c3"}
+
+
+def test_parquet_part_rusak_dihitung_ulang(tmp_path, caplog):
+    pytest.importorskip("pyarrow")
+    kolom = ["case_id", "profil", "hasil", "Kondisi"]
+    sink = wf_batch.ParquetSink(str(tmp_path), kolom, batch=1)
+    sink.write([{"case_id": "c0", "profil": "WF", "hasil": "tarik_dfbt", "Kondisi": "-"}])
+    (tmp_path / "part-00001.parquet").write_bytes(b"PAR1 rusak")
+    with caplog.at_level("WARNING", logger="wf_batch"):
+        lanjut = wf_batch.ParquetSink(str(tmp_path), kolom)
+    assert lanjut.done == {"c0"}
+    assert "part-00001.parquet" in caplog.text
+    assert not (tmp_path / "part-00001.parquet").exists()
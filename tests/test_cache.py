@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+
+import wf_cache
+from wf_cache import ResultCache, cache_key
+
+
+class Jam:
+    def __init__(self):
+        self.sekarang = 1000.0
+
+    def time(self):
+        self.sekarang += 1
+        return self.sekarang
+
+
+@pytest.fixture(autouse=True)
+def jam(monkeypatch):
+    monkeypatch.setattr(wf_cache, "time", Jam())
+
+
+def test_kunci_kanonik():
+    dasar = ("WF 300x150x6,5x9", ["250", "3"], "Tidak", ["20"], "v1", "m1")
+    assert cache_key(*dasar) == cache_key("WF 300x150x6,5x9", ["250,0", " 3 "], "Tidak", ["16"], "v1", "m1")
+    assert cache_key(*dasar) != cache_key(*dasar[:4], "v2", "m1")
+
+
+def test_memori_lalu_sqlite(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_memory=1)
+    cache.put("a", {"x": 1})
+    cache.put("b", {"x": 2})
+    # "a" sudah keluar dari LRU memori dan dibaca dari SQLite
+    assert cache.get("a") == {"x": 1}
+    assert cache.get("a") == {"x": 1}
+    assert cache.stats()["hits"] == {"memory": 1, "disk": 1}
+    # Proses lain (atau setelah restart) membaca file yang sama
+    assert ResultCache(str(tmp_path / "cache.sqlite")).get("b") == {"x": 2}
+
+
+def test_buang_yang_paling_lama_dipakai(tmp_path):
+    blob = len(pickle.dumps("x" * 100, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_memory=0, max_disk_bytes=2 * blob)
+    cache.put("a", "x" * 100)
+    cache.put("b", "x" * 100)
+    cache.get("a")  # "a" baru dipakai, "b" yang tertua
+    cache.put("c", "x" * 100)
+    assert [cache.get(k) is not None for k in "abc"] == [True, False, True]
+
+
+def test_direktori_tidak_bisa_ditulis(tmp_path, caplog):
+    (tmp_path / "berkas").write_text("bukan direktori", encoding="utf-8")
+    cache = ResultCache(str(tmp_path / "berkas" / "cache.sqlite"))
+    with caplog.at_level("WARNING", logger="wf_cache"):
+        cache.put("a", 1)
+        assert cache.get("b") is None
+    # Tetap berfungsi dari memori
+    assert cache.get("a") == 1
+    assert "Result cache write failed" in caplog.text and "Result cache read failed" in caplog.text
@@ -0,0 +1,46 @@
+import pytest
+
+from conftest import KATALOG
+import wf_cli
+
+
+def test_read_cases_csv(tmp_path):
+    path = tmp_path / "kasus.csv"
+    path.write_text('profil,fy,L,Nc\n"WF 300x150x6,5x9",250,3,\n', encoding="utf-8")
+    assert wf_cli.read_cases(str(path)) == [("WF 300x150x6,5x9", {"fy": "250", "L": "3"})]
+
+
+def test_read_cases_koma_tanpa_kutip(tmp_path):
+    path = tmp_path / "kasus.csv"
+    path.write_text("profil,fy,L\nWF 300x150x6,5x9,250,3\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        wf_cli.read_cases(str(path))
+
+
+def test_main_file_tidak_valid(tmp_path, capsys):
+    path = tmp_path / "kasus.csv"
+    path.write_text("profil,fy,L\nWF 300x150x6,5x9,250,3\n", encoding="utf-8")
+    with pytest.raises(SystemExit) as keluar:
+        wf_cli.main(["-f", str(path), "--snapshot", KATALOG])
+    assert keluar.value.code == 2
+    assert "line 2" in capsys.readouterr().err
+
+
+def test_lightest_parameter_tidak_dikenal(capsys):
+    assert wf_cli.main(["--lightest", "3", "-p", "fy=250", "-p", "foo=1", "--snapshot", KATALOG]) == 1
+    assert "error: Unknown parameter(s): foo" in capsys.readouterr().err
+
+
+def test_lightest(capsys):
+    assert wf_cli.main(["--lightest", "2", "-p", "fy=250", "-p", "fu=410", "-p", "L=3", "-p", "Nc=100",
+                        "--format", "json", "--snapshot", KATALOG]) == 0
+    # KL/r ≤ 200 menyingkirkan WF 100x50 dan WF 150x75 pada L = 3 m
+    assert '"profil": "WF 200x100x5,5x8"' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("n", ["0", "-2", "dua"])
+def test_lightest_n_tidak_valid(n, capsys):
+    with pytest.raises(SystemExit) as keluar:
+        wf_cli.main(["--lightest", n, "-p", "fy=250", "--snapshot", KATALOG])
+    assert keluar.value.code == 2
+    assert "--lightest" in capsys.readouterr().err
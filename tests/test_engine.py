@@ -0,0 +1,82 @@
+"""
+calculate_wf against hand calculations per SNI 1729:2020 for WF 300x150x6,5x9
+(fy = 250 MPa, fu = 410 MPa, E = 200000 MPa):
+
+    A = 4678,07 mm2, rx = 121,73 mm, ry = 32,917 mm, Zx = 522077 mm3, h/tw = 256/6,5
+"""
+import pytest
+
+from conftest import nilai, status
+import wf_lib
+
+PROFIL = "WF 300x150x6,5x9"
+DASAR = {"fy": 250, "fu": 410, "L": 3, "K": 1, "Lb": 3, "Nt": 100, "Nc": 100, "Mux": 50, "Vu": 50}
+
+
+@pytest.fixture(scope="module")
+def hasil(catalog):
+    return wf_lib.calculate_params(catalog, PROFIL, DASAR)
+
+
+def test_tarik_leleh(hasil):
+    # D2-1: φt Fy Ag = 0,9 x 250 x 4678,07; tanpa sambungan keruntuhan neto tidak berlaku
+    assert nilai(hasil, "tarik_dfbt", "Kuat tarik desain") == pytest.approx(1052.57, rel=1e-4)
+    assert nilai(hasil, "tarik_dki", "Kuat tarik desain") == pytest.approx(250 * 4678.07 / 1.67 / 1e3, rel=1e-4)
+    assert status(hasil, "tarik_dfbt", "Keruntuhan tarik pada penampang neto efektif") == "Tidak berlaku"
+
+
+def test_tarik_sambungan_baut(catalog):
+    # An = 4678,07 - 2 (20 + 2 + 2) 9 = 4246,07; U = 1 - 20/100 = 0,8; Ae = 3396,86
+    # D2-2: φt Fu Ae = 0,75 x 410 x 3396,86 = 1044,53 kN (menentukan)
+    hasil = wf_lib.calculate_params(catalog, PROFIL, DASAR, {"db": 20, "n": 2, "t": 9, "xbar": 20, "l": 100})
+    assert nilai(hasil, "tarik_dfbt", "Keruntuhan tarik pada penampang neto efektif") == pytest.approx(1044.53, rel=1e-4)
+    assert nilai(hasil, "tarik_dfbt", "Kuat tarik desain") == pytest.approx(1044.53, rel=1e-4)
+
+
+def test_tekan(hasil):
+    # KL/r = 3000 / 32,917 = 91,14; Fe = π2 E / (KL/r)2 = 237,6 MPa (torsi-lentur 419,6 MPa)
+    # E3-2: Fcr = 0,658^(250/237,6) x 250 = 160,96 MPa; elemen nonlangsing
+    # φc Fcr Ag = 0,9 x 160,96 x 4678,07 = 677,7 kN
+    assert nilai(hasil, "tekan_dfbt", "Tegangan kritis") == pytest.approx(160.96, rel=1e-4)
+    assert nilai(hasil, "tekan_dfbt", "Kuat tekan desain") == pytest.approx(677.7, rel=1e-4)
+
+
+def test_lentur_mayor_tekuk_torsi_lateral(hasil):
+    # Mp = 250 x 522077 = 130,52 kNm; Lp = 1,76 ry √(E/Fy) = 1638,6 mm; Lr (F2-6) = 4982,7 mm
+    # F2-2: Mn = Mp - (Mp - 0,7 Fy Sx)(Lb - Lp)/(Lr - Lp) = 110,31 kNm untuk Lb = 3000 mm
+    assert nilai(hasil, "momen_mayor_dfbt", "Momen plastis") == pytest.approx(130.52, rel=1e-4)
+    assert nilai(hasil, "momen_mayor_dfbt", "Panjang batas kondisi plastis") == pytest.approx(1638.6, rel=1e-4)
+    assert nilai(hasil, "momen_mayor_dfbt", "Panjang batas tekuk torsi lateral inelastis") == pytest.approx(4982.7, rel=1e-4)
+    assert nilai(hasil, "momen_mayor_dfbt", "Kuat lentur desain sumbu mayor") == pytest.approx(0.9 * 110.31, rel=1e-3)
+    assert nilai(hasil, "momen_mayor_dki", "Kuat lentur desain sumbu mayor") == pytest.approx(110.31 / 1.67, rel=1e-3)
+
+
+def test_lentur_mayor_plastis(catalog):
+    # Lb = 1000 mm < Lp: Mn = Mp, φb Mn = 0,9 x 130,52
+    hasil = wf_lib.calculate_params(catalog, PROFIL, dict(DASAR, Lb=1))
+    assert nilai(hasil, "momen_mayor_dfbt", "Kuat lentur desain sumbu mayor") == pytest.approx(117.47, rel=1e-4)
+
+
+def test_geser(hasil):
+    # h/tw = 39,4 ≤ 2,24 √(E/Fy): Cv1 = 1, φv = 1,0, Ωv = 1,5 (G2.1a)
+    # Vn = 0,6 Fy Aw Cv1 = 0,6 x 250 x 300 x 6,5 = 292,5 kN
+    assert nilai(hasil, "geser_dfbt", "Kuat geser desain") == pytest.approx(292.5, rel=1e-6)
+    assert nilai(hasil, "geser_dki", "Kuat geser desain") == pytest.approx(195.0, rel=1e-6)
+
+
+def test_batas_kelangsingan(catalog):
+    # L/r = 12000 / 32,917 = 364,6 > 300 dan KL/r > 200
+    hasil = wf_lib.calculate_params(catalog, PROFIL, dict(DASAR, L=12))
+    assert status(hasil, "tarik_dfbt", "Batas kelangsingan batang tarik (L/r ≤ 300)") == "TIDAK OK"
+    assert status(hasil, "tekan_dfbt", "Batas kelangsingan batang tekan (KL/r ≤ 200)") == "TIDAK OK"
+
+
+def test_batas_kelangsingan_tanpa_gaya_aksial(catalog):
+    hasil = wf_lib.calculate_params(catalog, PROFIL, dict(DASAR, L=12, Nt=0, Nc=0))
+    assert status(hasil, "tarik_dfbt", "Batas kelangsingan batang tarik (L/r ≤ 300)") == "Tidak berlaku"
+    assert status(hasil, "tekan_dki", "Batas kelangsingan batang tekan (KL/r ≤ 200)") == "Tidak berlaku"
+
+
+def test_profil_tidak_dikenal(catalog):
+    with pytest.raises(ValueError, match="tidak ditemukan"):
+        wf_lib.calculate_params(catalog, "WF 999", DASAR)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from wf_engine import TIDAK_BERLAKU, parse_angka
+from wf_hasil import _angka_kolom, parse_hasil, tabel_tampilan
+
+HEADER = ["Kondisi", "Simbol", "Nilai", "Satuan", "Perlu", "Rasio", "Keterangan"]
+
+
+@pytest.mark.parametrize("teks, harapan", [
+    ("1.234,5", 1234.5),
+    ("1,234.5", 1234.5),
+    ("1.234.567,25", 1234567.25),
+    ("12,5", 12.5),
+    ("0.85", 0.85),
+    ("1 234,5", 1234.5),
+    ("-3,0", -3.0),
+    ("250", 250.0),
+])
+def test_angka_sama_dengan_parse_angka(teks, harapan):
+    import pandas as pd
+
+    x = _angka_kolom(pd.Series([teks]))[0]
+    assert x == pytest.approx(harapan)
+    assert parse_angka(teks) == pytest.approx(harapan)
+
+
+def test_parse_hasil():
+    tabel = parse_hasil([
+        HEADER,
+        ["Kuat tarik leleh", "φPn", "1.234,5", "kN", "100", "0,081", "OK"],
+        ["Kuat tarik putus", "φPn", "-", "kN", "", "", TIDAK_BERLAKU],
+        ["Kelangsingan", "L/r", "312,50", "-", "300", "1,04", "TIDAK OK"],
+        ["Catatan", "-"],  # baris pendek diisi sel kosong
+    ])
+    assert tabel.angka == ("Nilai", "Perlu", "Rasio")
+    assert tabel.data["Nilai"].iloc[0] == 1234.5
+    assert np.isnan(tabel.data["Nilai"].iloc[1]) and tabel.teks["Nilai"].iloc[1] == "-"
+    assert tabel.tidak_berlaku.tolist() == [False, True, False, False]
+    assert tabel.status.tolist() == ["OK", TIDAK_BERLAKU, "TIDAK OK", ""]
+
+
+def test_kolom_campuran_tetap_teks():
+    tabel = parse_hasil([HEADER, ["a", "b", "12,5", "kN", "", "", "OK"], ["c", "d", "lihat tabel", "", "", "", "OK"]])
+    assert "Nilai" not in tabel.angka
+    assert tabel.data["Nilai"].tolist() == ["12,5", "lihat tabel"]
+
+
+def test_tampilan_tanpa_baris_tidak_berlaku():
+    tabel = parse_hasil([
+        HEADER,
+        ["Kuat tarik leleh", "φPn", "1.234,5", "kN", "100", "0,081", "OK"],
+        ["Kuat tarik putus", "φPn", "-", "kN", "", "", TIDAK_BERLAKU],
+    ])
+    tampil = tabel_tampilan(tabel)
+    assert len(tampil) == 1 and tampil["Nilai"].iloc[0] == "1234.50"
+
+
+@pytest.mark.parametrize("kosong", [None, [], [HEADER]])
+def test_tanpa_baris(kosong):
+    assert parse_hasil(kosong) is None
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from wf_jobs import GAGAL, SELESAI, JobQueue
+
+
+def _tunggu(queue, job_id, batas=5.0):
+    akhir = time.monotonic() + batas
+    while time.monotonic() < akhir:
+        job = queue.get(job_id)
+        if job["status"] in (SELESAI, GAGAL):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def queue():
+    return JobQueue(workers=2)
+
+
+def test_kunci_sama_digabung(queue):
+    lepas = threading.Event()
+    dipanggil = []
+
+    def hitung(progress, x):
+        dipanggil.append(x)
+        lepas.wait(5)
+        return x * 2, ["catatan"]
+
+    a = queue.submit(hitung, 1, key="k")
+    b = queue.submit(hitung, 1, key="k")
+    c = queue.submit(hitung, 2, key="lain")
+    assert a == b and c != a
+    assert queue.stats()["coalesced"] == 1
+    lepas.set()
+    assert _tunggu(queue, a)["hasil"] == 2
+    assert _tunggu(queue, c)["hasil"] == 4
+    assert sorted(dipanggil) == [1, 2]
+    # Setelah selesai, kunci yang sama menjadi job baru
+    d = queue.submit(hitung, 1, key="k")
+    assert d != a and _tunggu(queue, d)["catatan"] == ["catatan"]
+
+
+def test_tanpa_kunci_tidak_digabung(queue):
+    ids = {queue.submit(lambda progress: (None, [])) for _ in range(3)}
+    assert len(ids) == 3 and queue.stats()["coalesced"] == 0
+
+
+def test_job_gagal_melepas_kunci(queue, caplog):
+    def gagal(progress):
+        raise ValueError("rusak")
+
+    with caplog.at_level("ERROR", logger="wf_jobs"):
+        a = _tunggu(queue, queue.submit(gagal, key="k"))
+    assert (a["status"], a["error"]) == (GAGAL, "rusak")
+    assert "job k failed" in caplog.text
+    assert queue.submit(gagal, key="k") != a["id"]
@@ -0,0 +1,22 @@
+import pytest
+
+import wf_kapasitas
+from wf_kapasitas import MAKS_TABEL_LAIN, load_table
+
+
+def test_sama_dengan_engine(catalog, tmp_path):
+    # Lihat test_engine: WF 300x150, fy 250, L = Lb = 3 m
+    tabel = load_table(catalog, 250, folder=str(tmp_path))
+    assert float(tabel.design("WF 300x150x6,5x9", "tekan", 3000.0)) / 1e3 == pytest.approx(677.7, rel=1e-4)
+    assert float(tabel.design("WF 300x150x6,5x9", "momen_mayor", 3000.0)) / 1e6 == pytest.approx(99.28, rel=1e-3)
+
+
+def test_hanya_mutu_standar_disimpan(catalog, tmp_path):
+    load_table(catalog, 240, folder=str(tmp_path))
+    for i in range(MAKS_TABEL_LAIN + 3):
+        load_table(catalog, 251 + i, folder=str(tmp_path))
+    assert [p.name for p in tmp_path.iterdir()] == ["wf_fy240_E200000.npz"]
+    assert len(wf_kapasitas._tables_lain) == MAKS_TABEL_LAIN
+    # Mutu lain yang baru dipakai tetap di memori
+    assert load_table(catalog, 251 + MAKS_TABEL_LAIN + 2, folder=str(tmp_path)) is \
+        wf_kapasitas._tables_lain[(catalog.version, 251.0 + MAKS_TABEL_LAIN + 2, 200000.0)]
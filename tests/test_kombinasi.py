@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+import wf_lib
+from wf_engine import normalize_inputs
+from wf_kombinasi import BEBAN, SKALA_AKSI, check, evaluate, generate
+from wf_optimasi import PROPERTI, kapasitas_desain
+from wf_penampang import complete
+
+SEMUA = {jenis: {"N": -10.0} for jenis in BEBAN}
+
+# SNI 1727:2020 Pasal 2.3.1 (DFBT) dan 2.4.1 (DKI); faktor (D, L, Lr, W, E)
+DFBT = [
+    (1.4, 0, 0, 0, 0),
+    (1.2, 1.6, 0.5, 0, 0),
+    (1.2, 1.0, 1.6, 0, 0),
+    (1.2, 0, 1.6, 0.5, 0), (1.2, 0, 1.6, -0.5, 0),
+    (1.2, 1.0, 0.5, 1.0, 0), (1.2, 1.0, 0.5, -1.0, 0),
+    (0.9, 0, 0, 1.0, 0), (0.9, 0, 0, -1.0, 0),
+    (1.2, 1.0, 0, 0, 1.0), (1.2, 1.0, 0, 0, -1.0),
+    (0.9, 0, 0, 0, 1.0), (0.9, 0, 0, 0, -1.0),
+]
+DKI = [
+    (1.0, 0, 0, 0, 0),
+    (1.0, 1.0, 0, 0, 0),
+    (1.0, 0, 1.0, 0, 0),
+    (1.0, 0.75, 0.75, 0, 0),
+    (1.0, 0, 0, 0.6, 0), (1.0, 0, 0, -0.6, 0),
+    (1.0, 0.75, 0.75, 0.45, 0), (1.0, 0.75, 0.75, -0.45, 0),
+    (0.6, 0, 0, 0.6, 0), (0.6, 0, 0, -0.6, 0),
+    (1.0, 0, 0, 0, 0.7), (1.0, 0, 0, 0, -0.7),
+    (1.0, 0.75, 0, 0, 0.525), (1.0, 0.75, 0, 0, -0.525),
+    (0.6, 0, 0, 0, 0.7), (0.6, 0, 0, 0, -0.7),
+]
+
+
+@pytest.mark.parametrize("metode, faktor", [("DFBT", DFBT), ("DKI", DKI)])
+def test_tabel_faktor(metode, faktor):
+    _, matriks, _ = generate(SEMUA, metode)
+    np.testing.assert_allclose(matriks, np.array(faktor, dtype=float))
+
+
+def test_label():
+    nama, _, _ = generate(SEMUA, "DFBT")
+    assert nama[:2] == ["1,4D", "1,2D + 1,6L + 0,5Lr"]
+    assert "0,9D − W" in nama and "1,2D − E + L" in nama
+
+
+def test_beban_utama_kosong_dilewati():
+    nama, _, aksi = generate({"D": {"N": -10.0}, "L": {"Mux": 5.0}}, "DFBT")
+    assert nama == ["1,4D", "1,2D + 1,6L + 0,5Lr"]
+    np.testing.assert_allclose(aksi[1], [-12.0, 8.0, 0, 0, 0])
+
+
+def test_angin_gempa_bolak_balik():
+    # Aksi W/E berbalik tanda; aksi beban lain tetap
+    nama, _, aksi = generate({"D": {"N": -10.0, "Mux": 2.0}, "W": {"N": 4.0, "Mux": 3.0}}, "DFBT")
+    plus, minus = aksi[nama.index("0,9D + W")], aksi[nama.index("0,9D − W")]
+    np.testing.assert_allclose(plus[:2], [-9.0 + 4.0, 1.8 + 3.0])
+    np.testing.assert_allclose(minus[:2], [-9.0 - 4.0, 1.8 - 3.0])
+
+
+@pytest.fixture(scope="module")
+def penampang(catalog):
+    p = complete(wf_lib.section(catalog, "WF 300x150x6,5x9"))
+    return {k: np.array([p[k]], dtype=float) for k in PROPERTI}
+
+
+@pytest.fixture(scope="module")
+def q(catalog):
+    values, _, _ = wf_lib.request_from_params(catalog, {"fy": 250, "fu": 410, "L": 3, "K": 1, "Lb": 3})
+    return normalize_inputs(wf_lib.inputs_from_form(wf_lib._rows(catalog.input_template), values))
+
+
+@pytest.mark.parametrize("pr_pc", [0.1, 0.19, 0.21, 0.5])
+def test_interaksi_h1(penampang, q, pr_pc):
+    c = kapasitas_desain(penampang, q)
+    pc, mc = float(c["tekan"][0]), float(c["momen_mayor"][0])
+    mu = 0.3 * mc
+    hasil = check(penampang, q, [[-pr_pc * pc, mu, 0.0, 0.0, 0.0]])
+    # H1-1a untuk Pr/Pc ≥ 0,2, H1-1b di bawahnya
+    harapan = pr_pc + 8 / 9 * 0.3 if pr_pc >= 0.2 else pr_pc / 2 + 0.3
+    assert hasil["rasio"][0, 0, 0] == pytest.approx(harapan, rel=1e-9)
+
+
+def test_tarik_memakai_kuat_tarik(penampang, q):
+    c = kapasitas_desain(penampang, q)
+    hasil = check(penampang, q, [[0.5 * float(c["tarik"][0]), 0.0, 0.0, 0.0, 0.0]])
+    assert hasil["rasio"][0, 0, 0] == pytest.approx(0.5)
+
+
+def test_evaluate_satuan(penampang, q):
+    hasil = evaluate(penampang, q, {"D": {"N": -100.0, "Mux": 20.0}})
+    assert [r["kombinasi"] for r in hasil["kombinasi"]] == ["1,4D", "1,2D + 1,6L + 0,5Lr"]
+    baris = hasil["penentu"]
+    assert (baris["N"], baris["Mux"]) == (pytest.approx(-140.0), pytest.approx(28.0))
+    c = kapasitas_desain(penampang, q)
+    pr = 140.0 * SKALA_AKSI[0] / float(c["tekan"][0])
+    mr = 28.0 * SKALA_AKSI[1] / float(c["momen_mayor"][0])
+    assert baris["rasio aksial-lentur (H1)"] == pytest.approx(pr / 2 + mr if pr < 0.2 else pr + 8 / 9 * mr)
+
+
+def test_load_combinations_abaikan_gaya_form(catalog):
+    beban = {"D": {"N": -100.0, "Mux": 20.0}, "L": {"N": -50.0, "Vu": 30.0}, "W": {"Mux": 15.0}}
+    dasar = {"fy": 250, "fu": 410, "L": 3, "K": 1, "Lb": 3}
+    tanpa = wf_lib.load_combinations_params(catalog, "WF 300x150x6,5x9", dasar, beban)
+    dengan = wf_lib.load_combinations_params(
+        catalog, "WF 300x150x6,5x9", dict(dasar, Nt=800, Nc=900, Mux=300, Muy=50, Vu=400, Tu=5), beban)
+    assert dengan == tanpa
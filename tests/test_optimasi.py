@@ -0,0 +1,46 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from conftest import rasio_maks
+import wf_lib
+from wf_optimasi import BATAS_LOLOS, evaluate_all, optimize
+
+KASUS = [
+    dict(zip(("L", "Lb", "Nt", "Nc", "Mux", "Muy", "Vu", "Tu"), nilai))
+    for nilai in itertools.product((3, 12), (1, 6), (0, 300), (0, 300), (0, 80), (0, 5), (60,), (0, 0.5))
+]
+
+
+def _inputs(catalog, params):
+    values, _, _ = wf_lib.request_from_params(catalog, params)
+    return wf_lib.inputs_from_form(wf_lib._rows(catalog.input_template), values)
+
+
+@pytest.mark.parametrize("metode", ["DFBT", "DKI"])
+@pytest.mark.parametrize("params", KASUS[::5])
+def test_rasio_sama_dengan_engine(catalog, params, metode):
+    params = dict(params, fy=250, fu=410, K=1)
+    maks, _ = evaluate_all(catalog, _inputs(catalog, params), metode=metode)
+    for i, profil in enumerate(catalog.profil):
+        engine = rasio_maks(wf_lib.calculate_params(catalog, profil, params), metode)
+        # Tabel engine dibulatkan 4 angka penting
+        assert maks[i] == pytest.approx(engine, rel=1e-3, abs=1e-4), profil
+
+
+def test_profil_teringan(catalog):
+    params = {"fy": 250, "fu": 410, "L": 4, "K": 1, "Lb": 4, "Nc": 400, "Mux": 60, "Vu": 80}
+    hasil = wf_lib.lightest_profiles_params(catalog, params, top=3)
+    lolos = [p for p in catalog.profil
+             if rasio_maks(wf_lib.calculate_params(catalog, p, params), "DFBT") <= BATAS_LOLOS]
+    berat = {p: catalog.penampang[catalog.row(p)]["W"] for p in lolos}
+    assert [k["profil"] for k in hasil["kandidat"]] == sorted(lolos, key=berat.get)[:3]
+
+
+def test_pencarian_berhenti_lebih_awal(catalog):
+    params = {"fy": 250, "fu": 410, "L": 2, "K": 1, "Lb": 1, "Nt": 10}
+    hasil = optimize(catalog, _inputs(catalog, params), top=1, blok=2)
+    assert hasil["kandidat"][0]["profil"] == catalog.profil[0]
+    assert hasil["dievaluasi"] < hasil["jumlah_profil"]
+    assert np.isfinite(hasil["kandidat"][0]["rasio"])
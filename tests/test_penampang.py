@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from wf_penampang import complete, custom_name, parse_custom_name, section_properties, validate_catalog
+
+# Nilai tabel yang dipublikasikan: JIS G 3192 (mm, cm2, cm4, cm3) dan AISC Shapes Database v15 (in, r = kdes - tf)
+TABEL = [
+    ((300, 150, 6.5, 9, 13), {"A": 46.78e2, "Ix": 7210e4, "Iy": 508e4, "Sx": 481e3, "Sy": 67.7e3}),
+    ((400, 200, 8, 13, 13), {"A": 83.37e2, "Ix": 23500e4, "Iy": 1740e4, "Sx": 1190e3, "Sy": 174e3}),
+    ((14.0, 14.5, 0.44, 0.71, 0.60), {"A": 26.5, "Ix": 999, "Iy": 362, "Zx": 157, "Zy": 75.6, "J": 4.06, "Cw": 16000}),
+    ((12.2, 6.49, 0.23, 0.38, 0.30), {"A": 7.65, "Ix": 204, "Iy": 17.3, "Zx": 37.2, "Zy": 8.17, "J": 0.300, "Cw": 607}),
+]
+
+
+@pytest.mark.parametrize("dimensi, publikasi", TABEL)
+def test_sesuai_tabel_publikasi(dimensi, publikasi):
+    p = section_properties(*dimensi)
+    for k, v in publikasi.items():
+        assert p[k] == pytest.approx(v, rel=0.02), k
+
+
+def test_array_sama_dengan_skalar():
+    kolom = np.array([d for d, _ in TABEL], dtype=float).T
+    p = section_properties(*kolom)
+    assert p["valid"].all()
+    for i, (dimensi, _) in enumerate(TABEL):
+        skalar = section_properties(*dimensi)
+        for k in ("A", "Ix", "Zx", "J", "Cw", "rts"):
+            assert p[k][i] == pytest.approx(skalar[k], rel=1e-12), k
+
+
+def test_tanpa_fillet():
+    # Penampang tersusun (r = 0): rumus pelat persegi
+    p = section_properties(400, 200, 8, 13)
+    assert p["Ix"] == pytest.approx((200 * 400 ** 3 - 192 * 374 ** 3) / 12)
+    assert p["J"] == pytest.approx((2 * 200 * 13 ** 3 + 387 * 8 ** 3) / 3)
+
+
+def test_nilai_katalog_dipertahankan():
+    p = complete({"d": 300, "bf": 150, "tw": 6.5, "tf": 9, "r": 13, "Ix": 7.21e7})
+    assert p["Ix"] == 7.21e7
+    assert p["Sx"] == pytest.approx(2 * 7.21e7 / 300)
+
+
+@pytest.mark.parametrize("section", [{"d": 300, "bf": 150, "tw": 6.5}, {"d": 30, "bf": 150, "tw": 6.5, "tf": 9, "r": 13}])
+def test_dimensi_tidak_valid(section):
+    with pytest.raises(ValueError):
+        complete(section)
+
+
+def test_validate_catalog():
+    jis = dict(zip(("d", "bf", "tw", "tf", "r"), TABEL[0][0]), **TABEL[0][1])
+    catalog = SimpleNamespace(
+        profil=["WF 300x150x6,5x9", "WF salah Ix", "WF rusak"],
+        penampang=[jis, dict(jis, Ix=6.0e7), {"d": 300, "bf": 150}],
+    )
+    temuan = validate_catalog(catalog, kunci=("A", "Ix", "Iy", "Sx", "Sy"))
+    assert [(t["profil"], t["properti"]) for t in temuan] == [("WF salah Ix", "Ix"), ("WF rusak", None)]
+    assert temuan[0]["selisih"] == pytest.approx(6.0e7 / section_properties(*TABEL[0][0])["Ix"] - 1)
+
+
+@pytest.mark.parametrize("dimensi, nama", [
+    ((300, 150, 6.5, 9, 13), "Kustom 300x150x6,5x9 r13"),
+    ((400, 200, 8, 13, 0), "Kustom 400x200x8x13"),
+    ((250.5, 125, 6, 9, 10.5), "Kustom 250,5x125x6x9 r10,5"),
+])
+def test_nama_kustom_bolak_balik(dimensi, nama):
+    assert custom_name(*dimensi) == nama
+    assert parse_custom_name(nama) == dict(zip(("d", "bf", "tw", "tf", "r"), map(float, dimensi)))
+
+
+@pytest.mark.parametrize("nama, harapan", [
+    ("kustom 300 x 150 x 6.5 x 9", (300, 150, 6.5, 9, 0)),
+    ("Kustom 300x150x6,5x9 r 13", (300, 150, 6.5, 9, 13)),
+    ("WF 300x150x6,5x9", None),
+    ("Kustom 300x150x6,5", None),
+    ("Kustom 300x150x6,,5x9", None),
+    (None, None),
+])
+def test_parse_custom_name(nama, harapan):
+    hasil = parse_custom_name(nama)
+    assert hasil == (None if harapan is None else dict(zip(("d", "bf", "tw", "tf", "r"), map(float, harapan))))
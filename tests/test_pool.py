@@ -0,0 +1,62 @@
+import pytest
+
+import wf_pool
+from wf_pool import LeaseLost, PoolTimeout, WorksheetPool
+
+
+class Jam:
+    def __init__(self):
+        self.sekarang = 1000.0
+
+    def monotonic(self):
+        return self.sekarang
+
+
+@pytest.fixture
+def jam(monkeypatch):
+    jam = Jam()
+    monkeypatch.setattr(wf_pool, "time", jam)
+    return jam
+
+
+def test_lembar_berbeda_lalu_penuh(jam):
+    pool = WorksheetPool(["WF", "WF 2"], lease_ttl=60)
+    a, b = pool.acquire("a"), pool.acquire("b")
+    assert {a.nama, b.nama} == {"WF", "WF 2"}
+    with pytest.raises(PoolTimeout):
+        pool.acquire("c", timeout=0)
+    a.release()
+    assert pool.acquire("c", timeout=0).nama == a.nama
+
+
+def test_lease_kedaluwarsa_diambil_alih(jam, caplog):
+    pool = WorksheetPool(["WF"], lease_ttl=60)
+    lama = pool.acquire("mati")
+    jam.sekarang += 61
+    with caplog.at_level("WARNING", logger="wf_pool"):
+        baru = pool.acquire("hidup", timeout=0)
+    assert baru.nama == "WF" and "mati" in caplog.text
+    with pytest.raises(LeaseLost):
+        lama.renew()
+    # Melepas lease yang hilang tidak melepas lease pemilik baru
+    lama.release()
+    assert pool.status()["leases"] == {"WF": "hidup"}
+
+
+def test_renew_memperpanjang(jam):
+    pool = WorksheetPool(["WF"], lease_ttl=60)
+    lease = pool.acquire("a")
+    jam.sekarang += 50
+    lease.renew()
+    jam.sekarang += 50
+    with pytest.raises(PoolTimeout):
+        pool.acquire("b", timeout=0)
+    lease.renew()
+    assert pool.status()["in_use"] == 1
+
+
+def test_context_manager_melepas(jam):
+    pool = WorksheetPool(["WF"])
+    with pool.acquire("a") as lease:
+        assert pool.status()["leases"] == {lease.nama: "a"}
+    assert pool.status()["in_use"] == 0
@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+import wf_lib
+import wf_proyek
+
+JADWAL = (
+    "id;profil;fy;fu;L;Lb;K;Nc;Mux;Vu;db;n\n"
+    "B1;WF 300x150x6,5x9;250;410;3;3;1;100;50;60;;\n"
+    "B2;WF 200x100x5,5x8;250;410;4;4;1;200;10;20;16;2\n"
+    "B3;WF 999x999;250;410;4;4;1;200;10;20;;\n"
+).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def proyek(catalog):
+    anggota = wf_proyek.read_schedule(JADWAL, "jadwal.csv")
+    error = wf_proyek.validate(catalog, anggota)
+    hasil = {a.id: wf_lib.calculate_params(catalog, a.profil, a.params, a.sendi)
+             for a in anggota if a.id not in error}
+    return anggota, hasil, error
+
+
+def test_baca_csv(proyek):
+    anggota, _, error = proyek
+    assert [a.id for a in anggota] == ["B1", "B2", "B3"]
+    assert anggota[1].sendi == {"db": "16", "n": "2"}
+    assert list(error) == ["B3"]
+
+
+def test_excel_bolak_balik(proyek):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+    anggota, hasil, error = proyek
+    data = wf_proyek.export_excel(anggota, hasil, error)
+    # Lembar "Ringkasan" yang diekspor dapat diunggah ulang sebagai jadwal
+    assert wf_proyek.read_schedule(data, "proyek.xlsx") == anggota
+    ringkasan = pd.read_excel(io.BytesIO(data), sheet_name="Ringkasan")
+    assert list(ringkasan["status"].fillna("")) == [wf_proyek.governing(hasil[i])["status"] for i in ("B1", "B2")] + [""]
+    detail = pd.read_excel(io.BytesIO(data), sheet_name="Detail")
+    assert set(detail["id"]) == {"B1", "B2"}
+
@@ -0,0 +1,69 @@
+import pytest
+
+import wf_quota
+from wf_quota import FileBucket, MemoryBucket, QuotaTimeout
+
+
+class Jam:
+    def __init__(self):
+        self.sekarang = 1000.0
+        self.tidur = []
+
+    def time(self):
+        return self.sekarang
+
+    def sleep(self, detik):
+        self.tidur.append(detik)
+        self.sekarang += detik
+
+
+@pytest.fixture
+def jam(monkeypatch):
+    jam = Jam()
+    monkeypatch.setattr(wf_quota, "time", jam)
+    return jam
+
+
+def test_burst_lalu_menunggu(jam):
+    bucket = MemoryBucket(60, burst=2)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+    assert bucket.stats()["waited"] == 1
+
+
+def test_isi_ulang(jam):
+    bucket = MemoryBucket(60, burst=2)
+    bucket.acquire(2)
+    jam.sekarang += 1.5
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+    # Tidak pernah melebihi kapasitas walau lama menganggur
+    jam.sekarang += 3600
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+
+def test_timeout(jam):
+    bucket = MemoryBucket(60, burst=1)
+    bucket.acquire()
+    with pytest.raises(QuotaTimeout):
+        bucket.acquire(timeout=0.5)
+
+
+def test_file_bucket_berbagi_state(jam, tmp_path):
+    path = str(tmp_path / "kuota" / "sheets_write.json")
+    a, b = FileBucket(path, 60, burst=2), FileBucket(path, 60, burst=2)
+    assert a.acquire(2) == 0.0
+    # Proses lain melihat token yang sudah diambil
+    assert b.acquire() == pytest.approx(1.0)
+    # Terisi ulang hingga kapasitas setelah 3 s (termasuk 1 s tunggu b)
+    jam.sekarang += 2
+    assert a.acquire() == 0.0
+    assert b.acquire(2) == pytest.approx(1.0)
+
+
+def test_file_bucket_state_rusak(jam, tmp_path):
+    path = tmp_path / "sheets_read.json"
+    path.write_text("{rusak", encoding="utf-8")
+    bucket = FileBucket(str(path), 60, burst=2)
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
@@ -0,0 +1,43 @@
+import pytest
+
+import wf_lib
+
+PROFIL = "WF 300x150x6,5x9"
+DASAR = {"fy": 250, "fu": 410, "L": 3, "K": 1, "Lb": 3, "Nt": 100, "Nc": 100, "Mux": 50, "Muy": 5, "Vu": 50, "Tu": 1}
+SENDI = {"db": 20, "n": 2, "t": 9, "xbar": 20, "l": 100}
+
+
+def _permintaan(catalog, profil, params, sendi=None):
+    return (profil, *wf_lib.request_from_params(catalog, params, sendi))
+
+
+@pytest.mark.parametrize("profil, ubah, sendi", [
+    (PROFIL, {"Lb": 5}, None),
+    (PROFIL, {"Nt": 300}, None),
+    (PROFIL, {"fy": 290}, None),
+    (PROFIL, {"K": 2, "Vu": 80}, None),
+    (PROFIL, {}, SENDI),
+    ("WF 400x200x8x13", {}, None),
+    ("Kustom 400x200x8x13", {"Tu": 3}, None),
+])
+def test_sama_dengan_hitung_penuh(catalog, profil, ubah, sendi):
+    lama = _permintaan(catalog, PROFIL, DASAR)
+    baru = _permintaan(catalog, profil, dict(DASAR, **ubah), sendi)
+    hasil_lama = wf_lib.calculate(catalog, *lama)
+    hasil, _ = wf_lib.recalculate(catalog, *baru, lama, hasil_lama)
+    assert hasil == wf_lib.calculate(catalog, *baru)
+
+
+def test_hanya_kelompok_terdampak(catalog):
+    lama = _permintaan(catalog, PROFIL, DASAR)
+    baru = _permintaan(catalog, PROFIL, dict(DASAR, Lb=5))
+    _, dihitung = wf_lib.recalculate(catalog, *baru, lama, wf_lib.calculate(catalog, *lama))
+    assert dihitung == ["momen_mayor_dfbt", "momen_mayor_dki"]
+    assert wf_lib.affected_results(catalog, lama, baru) == dihitung
+
+
+def test_permintaan_sama_tidak_menghitung(catalog):
+    lama = _permintaan(catalog, PROFIL, DASAR)
+    hasil_lama = wf_lib.calculate(catalog, *lama)
+    hasil, dihitung = wf_lib.recalculate(catalog, *lama, lama, hasil_lama)
+    assert dihitung == [] and hasil == hasil_lama
@@ -1,25 +1,85 @@
 import streamlit as st
-import pandas as pd
-from st_aggrid import AgGrid, GridOptionsBuilder
-from st_aggrid.shared import GridUpdateMode
-from tenacity import retry, stop_after_attempt, wait_exponential
-import gspread
-from google.oauth2.service_account import Credentials
 import time
 import os
 import json
+import uuid
+import threading
+import datetime
+import functools
+import logging
+import math
+import wf_lib
+from wf_engine import METODE
+from wf_pool import LeaseLost, WorksheetPool
+from wf_quota import governor_from_env
+from wf_jobs import JobQueue, ANTRI, BERJALAN, SELESAI, GAGAL
+from wf_cache import ResultCache, cache_key, source_version
+from wf_catalog import build_catalog, catalog_version, load_snapshot, save_snapshot, section_display
+from wf_penampang import complete, custom_name, parse_custom_name
+
+# Skrip dijalankan Streamlit sebagai __main__, jadi logger diberi nama sendiri
+logger = logging.getLogger("wf")
 
 # ========== HALAMAN DAN STATE SETUP ==========
 st.set_page_config(page_title="Perhitungan Struktur Baja WF", layout="wide")
 st.title("Perhitungan Struktur Baja WF")
 
+# ========== LAZY IMPORT HELPERS ==========
+# pandas, st_aggrid, gspread, google-auth dan tenacity hanya diimpor pada jalur
+# yang memakainya, sehingga worker Streamlit baru bisa menampilkan halaman lebih cepat.
+def with_retry(func):
+    """Retry with exponential backoff (3 attempts); tenacity is imported on first call"""
+    wrapped = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal wrapped
+        if wrapped is None:
+            from tenacity import retry, stop_after_attempt, wait_exponential
+            wrapped = retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))(func)
+        return wrapped(*args, **kwargs)
+    return wrapper
+
 # ========== SETUP GOOGLE SHEETS CLIENT ==========
+TOKEN_REFRESH_MARGIN = 300  # Refresh access token 5 minutes before it expires
+
+def _keep_token_fresh(credentials):
+    """Background loop refreshing the cached access token ahead of expiry"""
+    from google.auth.transport.requests import Request
+    while True:
+        try:
+            if not credentials.token or credentials.expiry is None:
+                credentials.refresh(Request())
+            now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+            remaining = (credentials.expiry - now).total_seconds() - TOKEN_REFRESH_MARGIN
+            if remaining <= 0:
+                credentials.refresh(Request())
+                continue
+            time.sleep(remaining)
+        except Exception as e:
+            logger.warning("Access token refresh failed: %s", e)
+            time.sleep(60)
+
+def _authorize(credentials):
+    """gspread client whose token is fetched in the background, not on the first request"""
+    import gspread
+    threading.Thread(target=_keep_token_fresh, args=(credentials,), daemon=True).start()
+    return gspread.authorize(credentials)
+
+@st.cache_resource
+def get_quota_governor():
+    """Token buckets for Sheets read/write quota, shared by every session (see wf_quota)"""
+    return governor_from_env()
+
 @st.cache_resource
 def get_gsheet_client():
     """
-    Create and return an authenticated Google Sheets client using service account credentials.
-    Fixed version with better error handling and validation.
+    Create and return a Google Sheets client using service account credentials.
+    No API call is made here: authentication happens on first real use and the
+    access token is cached for the process and refreshed ahead of expiry.
     """
+    from google.oauth2.service_account import Credentials
+
     scopes = [
         'https://www.googleapis.com/auth/spreadsheets',
         'https://www.googleapis.com/auth/drive'
@@ -28,14 +88,9 @@ def get_gsheet_client():
     try:
         # Method 1: Streamlit Secrets (Primary method for Streamlit Cloud)
         if hasattr(st, 'secrets') and 'gcp_service_account' in st.secrets:
-            st.write("🔑 Using Streamlit secrets for authentication")
-            
             # Get credentials info and validate
             creds_info = st.secrets['gcp_service_account']
             
-            # Debug: Show available keys (without sensitive data)
-            st.write(f"📋 Available credential keys: {list(creds_info.keys())}")
-            
             # Validate required fields
             required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 
                              'client_email', 'client_id', 'auth_uri', 'token_uri']
@@ -61,62 +116,26 @@ def get_gsheet_client():
                 creds_dict, 
                 scopes=scopes
             )
-            
-            # Create client
-            client = gspread.authorize(credentials)
-            
-            # Test the connection with a simple operation
-            try:
-                # Try to list spreadsheets (this validates the connection)
-                files = client.list_spreadsheet_files()
-                st.success(f"✅ Successfully connected to Google Sheets! Found {len(files)} accessible spreadsheets.")
-                return client
-                
-            except Exception as test_error:
-                st.error(f"❌ Connection test failed: {str(test_error)}")
-                
-                # Provide specific troubleshooting based on error
-                error_str = str(test_error).lower()
-                if 'invalid_grant' in error_str:
-                    st.error("**Invalid Grant Error Solutions:**")
-                    st.error("1. Check if your service account JSON is correctly formatted")
-                    st.error("2. Ensure the private_key field has proper line breaks (not \\n)")
-                    st.error("3. Verify the service account email is correct")
-                    st.error("4. Make sure the service account key hasn't expired")
-                elif 'forbidden' in error_str or 'permission' in error_str:
-                    st.error("**Permission Error Solutions:**")
-                    st.error("1. Share your Google Sheet with the service account email")
-                    st.error("2. Enable Google Sheets API in Google Cloud Console")
-                    st.error("3. Verify service account has proper IAM roles")
-                elif 'not found' in error_str:
-                    st.error("**API Not Found Error Solutions:**")
-                    st.error("1. Enable Google Sheets API in Google Cloud Console")
-                    st.error("2. Enable Google Drive API in Google Cloud Console")
-                
-                return None
+            return _authorize(credentials)
 
         # Method 2: Environment Variable JSON (Backup method)
         elif 'GOOGLE_APPLICATION_CREDENTIALS_JSON' in os.environ:
-            st.write("🔑 Using environment variable for authentication")
             try:
                 creds_info = json.loads(os.environ['GOOGLE_APPLICATION_CREDENTIALS_JSON'])
                 credentials = Credentials.from_service_account_info(creds_info, scopes=scopes)
-                client = gspread.authorize(credentials)
-                return client
+                return _authorize(credentials)
             except json.JSONDecodeError:
                 st.error("❌ Invalid JSON in GOOGLE_APPLICATION_CREDENTIALS_JSON environment variable")
                 return None
 
         # Method 3: Service Account File Path (Local development)
         elif 'GOOGLE_APPLICATION_CREDENTIALS' in os.environ:
-            st.write("🔑 Using service account file for authentication")
             try:
                 credentials = Credentials.from_service_account_file(
                     os.environ['GOOGLE_APPLICATION_CREDENTIALS'], 
                     scopes=scopes
                 )
-                client = gspread.authorize(credentials)
-                return client
+                return _authorize(credentials)
             except FileNotFoundError:
                 st.error("❌ Service account file not found")
                 return None
@@ -178,25 +197,50 @@ def validate_service_account_json(creds_dict):
     
     return True, "Valid"
 
+def show_connection_troubleshooting(error):
+    """Explain the likely cause of a failed first request to Google Sheets"""
+    error_str = str(error).lower()
+    if 'invalid_grant' in error_str:
+        st.error("**Invalid Grant Error Solutions:**")
+        st.error("1. Check if your service account JSON is correctly formatted")
+        st.error("2. Ensure the private_key field has proper line breaks (not \\n)")
+        st.error("3. Verify the service account email is correct")
+        st.error("4. Make sure the service account key hasn't expired")
+    elif 'forbidden' in error_str or 'permission' in error_str:
+        st.error("**Permission Error Solutions:**")
+        st.error("1. Share your Google Sheet with the service account email")
+        st.error("2. Enable Google Sheets API in Google Cloud Console")
+        st.error("3. Verify service account has proper IAM roles")
+    elif 'not found' in error_str:
+        st.error("**API Not Found Error Solutions:**")
+        st.error("1. Enable Google Sheets API in Google Cloud Console")
+        st.error("2. Enable Google Drive API in Google Cloud Console")
+
 # Improved retry function with better error handling
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+@with_retry
 def fetch_sheet_data(client_func, spreadsheet_key, worksheet_name=None, range_name=None):
     """
     Fetch data from Google Sheets with improved retry logic and error handling
     """
+    import gspread
+
     client = client_func()
     if client is None:
         raise Exception("Cannot connect to Google Sheets client")
     
     try:
         # Open spreadsheet
+        quota = get_quota_governor()
+        quota.acquire("read")
         spreadsheet = client.open_by_key(spreadsheet_key)
         
         if worksheet_name and range_name:
+            quota.acquire("read", 2)
             worksheet = spreadsheet.worksheet(worksheet_name)
             data = worksheet.get(range_name)
             return data
         elif worksheet_name:
+            quota.acquire("read")
             worksheet = spreadsheet.worksheet(worksheet_name)
             return worksheet
         else:
@@ -210,51 +254,142 @@ def fetch_sheet_data(client_func, spreadsheet_key, worksheet_name=None, range_na
         raise
     except gspread.exceptions.APIError as e:
         if 'RATE_LIMIT_EXCEEDED' in str(e):
-            st.warning("⚠️ Rate limit exceeded, waiting before retry...")
-            time.sleep(5)
+            st.warning("⚠️ Rate limit exceeded, retrying...")
         elif 'PERMISSION_DENIED' in str(e):
             st.error("❌ Permission denied. Make sure the spreadsheet is shared with your service account.")
         raise e
     except Exception as e:
         st.error(f"❌ Error fetching data: {str(e)}")
+        show_connection_troubleshooting(e)
         raise
 
 # ========== LOAD SEMUA DATA SEKALIGUS DI AWAL ==========
-@st.cache_data(ttl=1800)  # Cache for 30 minutes
+SPREADSHEET_KEY = "17TSibAziP_oLHo0jMynpb1LZc7yfWQs78hb-Z5DOaNE"
+
+# Range data statis yang dimuat saat startup (satu permintaan values.batchGet);
+# tabel profil tanpa batas baris agar profil baru di sheet ikut terbaca
+CATALOG_RANGES = {
+    "tabel_profil_wf": "'Tabel WF'!A1:F",
+    "tabel_wf": "'Tabel WF'!B1:W",
+    "input_template": "WF!C6:F16",
+    "sendi_template": "WF!C207:F211",
+}
+
+@st.cache_resource
+def get_spreadsheet():
+    """Spreadsheet handle opened once per process and shared by every loader"""
+    return fetch_sheet_data(get_gsheet_client, SPREADSHEET_KEY)
+
+@st.cache_resource
+def get_worksheet(nama="WF"):
+    """Worksheet handle opened on first use, one per worksheet name"""
+    spreadsheet = get_spreadsheet()
+    get_quota_governor().acquire("read")
+    return spreadsheet.worksheet(nama)
+
+# Lembar perhitungan identik (salinan sheet "WF") yang dipakai bergiliran oleh
+# sesi-sesi yang menghitung bersamaan, mis. WF_SHEET_POOL="WF,WF 2,WF 3"
+SHEET_POOL = [nama.strip() for nama in os.environ.get("WF_SHEET_POOL", "WF").split(",") if nama.strip()]
+LEASE_TTL = 60  # detik; lease dari sesi yang mati dilepas otomatis
+
+@st.cache_resource
+def get_sheet_pool():
+    """
+    Process-wide pool of calculation worksheets. Leases live in this process's
+    memory only: run a single server process per spreadsheet, or give each
+    process its own WF_SHEET_POOL worksheets.
+    """
+    return WorksheetPool(SHEET_POOL, lease_ttl=LEASE_TTL)
+
+@st.cache_resource
+def catalog_load_timing():
+    """Process-wide record of the last network catalog load"""
+    return {}
+
+@with_retry
+def _values_batch_get(spreadsheet, ranges):
+    get_quota_governor().acquire("read")
+    return spreadsheet.values_batch_get(ranges)
+
+def fetch_catalog_from_sheet(progress_placeholder=None):
+    """
+    Download the static catalog tables and form templates in a single batched
+    request on the shared spreadsheet handle. Returns (data, timing) where timing
+    holds the elapsed seconds of each step and the size of each range.
+    """
+    if progress_placeholder is not None:
+        progress_placeholder.text("📊 Loading profile data and templates...")
+    
+    t0 = time.perf_counter()
+    spreadsheet = get_spreadsheet()
+    t1 = time.perf_counter()
+    response = _values_batch_get(spreadsheet, list(CATALOG_RANGES.values()))
+    t2 = time.perf_counter()
+    
+    all_data = {}
+    timing = {"open_spreadsheet": t1 - t0, "values_batch_get": t2 - t1, "ranges": {}}
+    for key, value_range in zip(CATALOG_RANGES, response.get("valueRanges", [])):
+        all_data[key] = value_range.get("values", [])
+        timing["ranges"][key] = {"range": value_range.get("range", CATALOG_RANGES[key]),
+                                 "rows": len(all_data[key]), "seconds": t2 - t1}
+    missing = [key for key in CATALOG_RANGES if key not in all_data]
+    if missing:
+        raise Exception(f"Ranges missing from batch response: {missing}")
+    logger.info("Catalog loaded: open %.3f s, batchGet %.3f s", timing["open_spreadsheet"], timing["values_batch_get"])
+    catalog_load_timing().update(timing)
+    return all_data, timing
+
+@st.cache_resource
+def _snapshot_refresh_lock():
+    return threading.Lock()
+
+def refresh_catalog_snapshot(snapshot):
+    """
+    Re-download the catalog only when the spreadsheet changed since the snapshot.
+    Runs in a background thread; failures (offline, rate limit) keep the snapshot.
+    """
+    lock = _snapshot_refresh_lock()
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        modified = get_spreadsheet().get_lastUpdateTime()
+        if snapshot is not None and modified == snapshot.get("source_modified"):
+            return
+        # modifiedTime juga berubah saat input perhitungan ditulis, jadi bandingkan isi
+        data, _ = fetch_catalog_from_sheet()
+        fresh = save_snapshot(data, source_modified=modified)
+        if snapshot is None or fresh["version"] != snapshot["version"]:
+            load_all_sheet_data.clear()
+            get_catalog.clear()
+    except Exception as e:
+        logger.warning("Catalog snapshot refresh skipped: %s", e)
+    finally:
+        lock.release()
+
+@st.cache_data(ttl=1800)  # Re-check the spreadsheet version every 30 minutes
 def load_all_sheet_data():
     """
-    Load all necessary data from Google Sheets with improved error handling
+    Load the catalog tables and templates from the local snapshot, falling back to
+    Google Sheets when no snapshot exists yet. A stale snapshot is refreshed in the background.
     """
-    client_func = get_gsheet_client
-    spreadsheet_key = "17TSibAziP_oLHo0jMynpb1LZc7yfWQs78hb-Z5DOaNE"
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        threading.Thread(target=refresh_catalog_snapshot, args=(snapshot,), daemon=True).start()
+        return dict(snapshot["data"], versi_katalog=snapshot["version"])
     
     with st.spinner("🔄 Loading data from Google Sheets..."):
         try:
-            # Test client first
-            client = client_func()
-            if client is None:
-                raise Exception("Failed to create Google Sheets client")
-            
             # Load data with progress updates
             progress_placeholder = st.empty()
+            all_data, _ = fetch_catalog_from_sheet(progress_placeholder)
             
-            progress_placeholder.text("📊 Loading profile data...")
-            all_data = {}
-            
-            all_data["tabel_profil_wf"] = fetch_sheet_data(client_func, spreadsheet_key, "Tabel WF", "A1:F37")
-            
-            progress_placeholder.text("📋 Loading WF table data...")
-            all_data["tabel_wf"] = fetch_sheet_data(client_func, spreadsheet_key, "Tabel WF", "b1:W37")
-            
-            progress_placeholder.text("⚙️ Loading input templates...")
-            all_data["input_template"] = fetch_sheet_data(client_func, spreadsheet_key, "WF", "C6:F16")
-            all_data["sendi_template"] = fetch_sheet_data(client_func, spreadsheet_key, "WF", "C207:F211")
-            
-            progress_placeholder.text("🔗 Getting worksheet reference...")
-            all_data["sheet_wf"] = fetch_sheet_data(client_func, spreadsheet_key, "WF")
+            try:
+                modified = get_spreadsheet().get_lastUpdateTime()
+                save_snapshot(all_data, source_modified=modified)
+            except Exception as e:
+                logger.warning("Catalog snapshot not saved: %s", e)
+            all_data["versi_katalog"] = catalog_version(all_data)
             
-            progress_placeholder.text("✅ Data loaded successfully!")
-            time.sleep(1)
             progress_placeholder.empty()
             
             return all_data
@@ -298,42 +433,38 @@ if st.sidebar.button("🔍 Validate Credentials"):
     else:
         st.sidebar.error("❌ No credentials found in secrets")
 
+MODE_LOKAL = "Lokal (SNI 1729)"
+MODE_SHEETS = "Google Sheets"
+mode_hitung = st.sidebar.radio("⚙️ Mesin Perhitungan", [MODE_LOKAL, MODE_SHEETS], key="mode_hitung")
+
+if mode_hitung == MODE_SHEETS:
+    with st.sidebar.expander("📊 Kuota Google Sheets"):
+        # Antrean dan waktu tunggu per jenis permintaan, untuk menentukan ukuran deployment
+        st.json({"kuota": get_quota_governor().stats(), "lembar_hitung": get_sheet_pool().status()})
+
+@st.cache_resource(ttl=1800)
+def get_catalog():
+    """Parsed, indexed profile catalog built once per process and shared read-only by all sessions"""
+    all_data = load_all_sheet_data()
+    return build_catalog(all_data, version=all_data.get("versi_katalog"))
+
+def build_df_profil(baris):
+    """DataFrame of the given profile table rows (one page), only built when the table panel is opened"""
+    import pandas as pd
+    return pd.DataFrame([catalog.tabel_rows[i] for i in baris], columns=list(catalog.tabel_header))
+
 # Load all data at startup with better error handling
 try:
     with st.spinner("🚀 Initializing application..."):
-        all_sheet_data = load_all_sheet_data()
-        sheet_wf = all_sheet_data["sheet_wf"]
-        
-        # Parse data tabel WF
-        range_profil_wf = all_sheet_data["tabel_profil_wf"]
-        header = range_profil_wf[0]
-        data = range_profil_wf[3:37]
-        df_profil = pd.DataFrame(data, columns=header)
-        profil_list = [row[0] for row in range_profil_wf[3:37] if row]
-        
-        # Parse parameter penampang
-        range_wf = all_sheet_data["tabel_wf"]
-        parameter = range_wf[0]
-        simbol = range_wf[1]
-        satuan = range_wf[2]
-        nilai_semua = range_wf[3:37]
-        
-        df_nilai = pd.DataFrame(nilai_semua, columns=parameter)
-        df_nilai['Profil'] = profil_list
-        
-        header_info = {
-            "Parameter": parameter,
-            "Simbol": simbol,
-            "Satuan": satuan,
-        }
-        
-        # Parse template input dan sendi
-        input_df_template = pd.DataFrame(all_sheet_data["input_template"], 
-                                         columns=["Parameter", "Simbol", "Nilai", "Satuan"])
-        sendi_df_template = pd.DataFrame(all_sheet_data["sendi_template"], 
-                                         columns=["Parameter", "Simbol", "Nilai", "Satuan"])
+        catalog = get_catalog()
+        profil_list = catalog.profil
+        input_template = catalog.input_template
+        sendi_template = catalog.sendi_template
         
         st.success("🎉 Application initialized successfully!")
+        if catalog_load_timing():
+            with st.sidebar.expander("⏱️ Catalog load timing"):
+                st.json(catalog_load_timing())
         
 except Exception as e:
     st.error(f"💥 Critical error during initialization: {str(e)}")
@@ -404,8 +535,11 @@ if "penampang_open" not in st.session_state:
     st.session_state.penampang_open = False
 if "hasil_perhitungan" not in st.session_state:
     st.session_state.hasil_perhitungan = None
-if "calculating" not in st.session_state:
-    st.session_state.calculating = False
+if "hasil_model" not in st.session_state:
+    st.session_state.hasil_model = None
+if "job_id" not in st.session_state:
+    # Id job disimpan di URL agar perhitungan yang berjalan tetap ditemukan setelah refresh
+    st.session_state.job_id = st.query_params.get("job")
 
 def toggle_tabel():
     st.session_state.tabel_open = not st.session_state.tabel_open
@@ -421,40 +555,132 @@ def on_profil_change():
     selected = st.session_state.profil_select
     st.session_state.profil_terpilih = selected
 
-# ========== FORMAT ANGKA ==========
-def format_angka(val):
-    if isinstance(val, pd.DataFrame):
-        return val.applymap(lambda x: format_angka(x))
-    
-    if not val:
-        return ""
+# Dimensi penampang kustom: (kunci, label, nilai awal mm)
+DIMENSI_KUSTOM = (("d", "d (mm)", 400.0), ("bf", "bf (mm)", 200.0), ("tw", "tw (mm)", 8.0),
+                  ("tf", "tf (mm)", 13.0), ("r", "r (mm)", 0.0))
+
+def pakai_kustom():
+    """Make the custom dimensions the selected profile (a "Kustom ..." name the engine derives)"""
+    dimensi = {kunci: st.session_state[f"kustom_{kunci}"] for kunci, _, _ in DIMENSI_KUSTOM}
     try:
-        val_clean = str(val).replace(",", ".").strip()
-        val_num = float(val_clean)
-        return str(int(val_num)) if val_num.is_integer() else f"{val_num:.2f}"
-    except (ValueError, TypeError):
-        return str(val).strip()
+        complete(dimensi)
+    except ValueError as e:
+        st.session_state.galat_kustom = str(e)
+        return
+    st.session_state.galat_kustom = None
+    st.session_state.profil_terpilih = custom_name(**dimensi)
+
+def penampang_kustom():
+    """Custom / built-up section entry below the profile picker"""
+    profil = st.session_state.profil_terpilih
+    if parse_custom_name(profil) is not None:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.info(f"Penampang aktif: **{profil}** (properti dihitung dari dimensi)")
+        with col2:
+            st.button("Kembali ke profil katalog", on_click=on_profil_change, use_container_width=True)
+    with st.expander("Penampang Kustom / Built-up"):
+        st.caption("Properti dihitung dari d, bf, tw, tf dan r; isi r = 0 untuk penampang las (built-up).")
+        cols = st.columns(len(DIMENSI_KUSTOM))
+        for col, (kunci, label, bawaan) in zip(cols, DIMENSI_KUSTOM):
+            with col:
+                st.number_input(label, min_value=0.0, value=bawaan, step=1.0, key=f"kustom_{kunci}")
+        st.button("Pakai Penampang Kustom", on_click=pakai_kustom, use_container_width=True)
+        if st.session_state.get("galat_kustom"):
+            st.error(f"❌ {st.session_state.galat_kustom}")
+
+# ========== Kurva Kapasitas ==========
+def tampilkan_kurva_kapasitas(profil):
+    """Design strengths vs. unbraced length, read from the precomputed capacity tables"""
+    import pandas as pd
+    from wf_kapasitas import load_table, section_table
+
+    st.subheader("Kurva Kapasitas terhadap Panjang Tak Terkekang")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fy = st.number_input("fy (MPa)", min_value=1.0, value=250.0, step=10.0, key="kurva_fy")
+    with col2:
+        cb = st.number_input("Cb", min_value=1.0, value=1.0, step=0.05, key="kurva_cb")
+    with col3:
+        metode = st.radio("Metode", METODE, horizontal=True, key="kurva_metode")
+    
+    dimensi = parse_custom_name(profil)
+    if dimensi is not None:
+        # Penampang kustom: satu baris, cukup cepat dihitung setiap kali
+        tabel = section_table(profil, complete(dimensi), fy)
+    else:
+        # Mutu standar dibangun sekali per versi katalog lalu dibaca dari memori/disk; mutu lain hanya di memori
+        tabel = load_table(catalog, fy)
+    if profil not in tabel.profil:
+        st.info("Kurva kapasitas untuk profil ini tidak tersedia.")
+        return
+    kurva = tabel.curves(profil, metode, Cb=cb)
+    df = pd.DataFrame({
+        "Panjang (m)": tabel.grid / 1000,
+        "Kuat tekan (kN)": kurva["tekan"] / 1e3,
+        "Kuat lentur mayor (kNm)": kurva["momen_mayor"] / 1e6,
+    })
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Kuat tekan desain terhadap KL")
+        st.line_chart(df, x="Panjang (m)", y="Kuat tekan (kN)")
+    with col2:
+        st.caption(f"Kuat lentur mayor desain terhadap Lb (Cb = {cb:g})")
+        st.line_chart(df, x="Panjang (m)", y="Kuat lentur mayor (kNm)")
+    minor, geser = kurva["momen_minor"][0] / 1e6, kurva["geser"][0] / 1e3
+    st.caption(f"Kuat lentur minor {minor:.2f} kNm dan kuat geser {geser:.2f} kN tidak bergantung panjang ({metode})".replace(".", ","))
 
 # ========== UI: Pilih Profil ==========
-with st.container():
-    st.markdown("<h3>Pilih Profil WF</h3>", unsafe_allow_html=True)
-    st.selectbox(
-        "", 
-        profil_list, 
-        index=profil_list.index(st.session_state.profil_terpilih),
-        key="profil_select",
-        on_change=on_profil_change
-    )
+# Urutan daftar profil: label -> kunci ProfileCatalog.urutan (None = urutan tabel)
+URUTAN_PROFIL = {"Katalog": None, "Nama": "nama", "Tinggi (d)": "d", "Berat": "berat"}
+UKURAN_HALAMAN = (25, 50, 100)
+
+def _filter_rentang(kunci, label):
+    """Range slider over the catalog bounds of `kunci`; None while it still spans the whole catalog"""
+    batas = catalog.bounds(kunci)
+    if batas is None or batas[0] == batas[1]:
+        return None
+    bawah, atas = float(math.floor(batas[0])), float(math.ceil(batas[1]))
+    nilai = st.slider(label, bawah, atas, (bawah, atas), step=1.0, key=f"filter_{kunci}")
+    return None if tuple(nilai) == (bawah, atas) else tuple(nilai)
+
+def filter_profil():
+    """Filter widgets of the profile picker; row numbers of the matching profiles (ProfileCatalog.search)"""
+    with st.expander("🔎 Filter Profil"):
+        col1, col2 = st.columns(2)
+        with col1:
+            teks = st.text_input("Nama / ukuran diawali", key="filter_nama", placeholder="mis. WF 300 atau 300x150")
+        with col2:
+            seri = st.multiselect("Seri", sorted(s for s in catalog.baris_seri if s), key="filter_seri")
+        col1, col2 = st.columns(2)
+        with col1:
+            d = _filter_rentang("d", "Tinggi d (mm)")
+        with col2:
+            berat = _filter_rentang("berat", "Berat (kg/m)")
+        urut = st.radio("Urutkan", list(URUTAN_PROFIL), horizontal=True, key="filter_urut")
+    return catalog.search(teks.strip(), seri, d, berat, URUTAN_PROFIL[urut])
 
-col1, col2 = st.columns(2)
-with col1:
-    st.button("Lihat Tabel Profil" if not st.session_state.tabel_open else "Tutup Tabel Profil", on_click=toggle_tabel, use_container_width=True)
-with col2:
-    st.button("Lihat Parameter Penampang" if not st.session_state.penampang_open else "Tutup Parameter Penampang", on_click=toggle_penampang, use_container_width=True)
+def tabel_profil(baris):
+    """One page of the profile table; only that page is built and sent to the grid"""
+    from st_aggrid import AgGrid, GridOptionsBuilder
 
-# ========== Panel: Tabel Profil WF ==========
-if st.session_state.tabel_open:
     st.subheader("Tabel Profil WF")
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        ukuran = st.selectbox("Baris per halaman", UKURAN_HALAMAN, key="tabel_ukuran")
+    jumlah_halaman = max(1, math.ceil(len(baris) / ukuran))
+    # Filter atau ukuran halaman berubah: halaman aktif bisa melewati halaman terakhir
+    if st.session_state.get("tabel_halaman", 1) > jumlah_halaman:
+        st.session_state.tabel_halaman = jumlah_halaman
+    with col1:
+        halaman = st.number_input(f"Halaman (dari {jumlah_halaman})", min_value=1, max_value=jumlah_halaman,
+                                  step=1, key="tabel_halaman")
+    awal = (halaman - 1) * ukuran
+    halaman_baris = baris[awal:awal + ukuran]
+    if not halaman_baris:
+        st.info("ℹ️ Tidak ada profil yang sesuai filter.")
+        return
+    df_profil = build_df_profil(halaman_baris)
     gb = GridOptionsBuilder.from_dataframe(df_profil)
     gb.configure_default_column(
         suppressMenu=True,
@@ -466,128 +692,136 @@ if st.session_state.tabel_open:
         headerClass="ag-center-header"
     )
     AgGrid(df_profil, gridOptions=gb.build(), fit_columns_on_grid_load=True)
+    st.caption(f"Baris {awal + 1}–{awal + len(halaman_baris)} dari {len(baris)} profil")
+
+@st.fragment
+def bagian_profil():
+    """Profile picker and its panels; reruns on its own when these widgets change"""
+    with st.container():
+        st.markdown("<h3>Pilih Profil WF</h3>", unsafe_allow_html=True)
+        baris = filter_profil()
+        pilihan = list(baris)
+        # Profil yang sedang dipilih tetap ada di daftar walau tersaring
+        aktif = catalog.row(st.session_state.profil_select)
+        if aktif is not None and aktif not in set(baris):
+            pilihan.insert(0, aktif)
+        opsi = [profil_list[i] for i in pilihan]
+        st.selectbox(
+            "", 
+            opsi, 
+            index=pilihan.index(aktif) if aktif in pilihan else 0,
+            key="profil_select",
+            on_change=on_profil_change
+        )
+        if len(baris) < len(profil_list):
+            st.caption(f"{len(baris)} dari {len(profil_list)} profil sesuai filter")
+        penampang_kustom()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("Lihat Tabel Profil" if not st.session_state.tabel_open else "Tutup Tabel Profil", on_click=toggle_tabel, use_container_width=True)
+    with col2:
+        st.button("Lihat Parameter Penampang" if not st.session_state.penampang_open else "Tutup Parameter Penampang", on_click=toggle_penampang, use_container_width=True)
+
+    # ========== Panel: Tabel Profil WF ==========
+    if st.session_state.tabel_open:
+        tabel_profil(baris)
 
-# ========== Panel: Parameter Penampang ==========
-elif st.session_state.penampang_open:
-    st.subheader("Parameter Penampang Profil")
+    # ========== Panel: Parameter Penampang ==========
+    elif st.session_state.penampang_open:
+        st.subheader("Parameter Penampang Profil")
     
-    # Filter data parameter sesuai profil terpilih dari cache lokal
-    df_param = df_nilai[df_nilai['Profil'] == st.session_state.profil_terpilih]
-    if df_param.empty:
-        st.info(f"Data parameter penampang untuk profil tidak tersedia.")
-    else:
-        # Buat DataFrame dengan kolom Parameter, Simbol, Nilai, Satuan
-        df_show = pd.DataFrame({
-            "Parameter": header_info["Parameter"],
-            "Simbol": header_info["Simbol"],
-            "Nilai": df_param.iloc[0][header_info["Parameter"]].values,
-            "Satuan": header_info["Satuan"]
-        })
+        # Ambil baris tampilan (sudah terformat) dari katalog bersama
+        baris = catalog.row(st.session_state.profil_terpilih)
+        dimensi = parse_custom_name(st.session_state.profil_terpilih)
+        if baris is None and dimensi is None:
+            st.info(f"Data parameter penampang untuk profil tidak tersedia.")
+        else:
+            # Baris dengan kolom Parameter, Simbol, Nilai, Satuan
+            df_show = catalog.tampilan[baris] if baris is not None else section_display(catalog, complete(dimensi))
         
-        # Tampilkan dalam format sesuai request (2 kolom baris pertama, 3 kolom sisa)
-        df1 = df_show.iloc[:14]
-        df2 = df_show.iloc[14:]
-
-        for i in range(0, len(df1), 2):
-            cols = st.columns([2.9, 2, 1, 2.9, 2, 1])
-            row1 = df1.iloc[i]
-            with cols[0]:
-                st.markdown(f"{row1['Parameter']} ({row1['Simbol']})")
-            with cols[1]:
-                st.text_input("", value=format_angka(row1["Nilai"]), disabled=True, key=f"val_{i}", label_visibility="collapsed")
-            with cols[2]:
-                st.markdown(row1["Satuan"])
-
-            if i + 1 < len(df1):
-                row2 = df1.iloc[i + 1]
-                with cols[3]:
-                    st.markdown(f"{row2['Parameter']} ({row2['Simbol']})")
-                with cols[4]:
-                    st.text_input("", value=format_angka(row2["Nilai"]), disabled=True, key=f"val_{i+1}", label_visibility="collapsed")
-                with cols[5]:
-                    st.markdown(row2["Satuan"])
-            else:
-                for j in [3, 4, 5]:
-                    with cols[j]: st.write("")
-
-        for i, row in df2.reset_index(drop=True).iterrows():
-            cols = st.columns([8, 3, 1])
-            with cols[0]:
-                st.markdown(f"{row['Parameter']} ({row['Simbol']})")
-            with cols[1]:
-                st.text_input("", value=format_angka(row["Nilai"]), disabled=True, key=f"val2_{i}", label_visibility="collapsed")
-            with cols[2]:
-                st.markdown(row["Satuan"])
+            # Tampilkan dalam format sesuai request (2 kolom baris pertama, 3 kolom sisa)
+            df1 = df_show[:14]
+            df2 = df_show[14:]
+
+            for i in range(0, len(df1), 2):
+                cols = st.columns([2.9, 2, 1, 2.9, 2, 1])
+                row1 = df1[i]
+                with cols[0]:
+                    st.markdown(f"{row1['Parameter']} ({row1['Simbol']})")
+                with cols[1]:
+                    st.text_input("", value=row1["Nilai"], disabled=True, key=f"val_{i}", label_visibility="collapsed")
+                with cols[2]:
+                    st.markdown(row1["Satuan"])
+
+                if i + 1 < len(df1):
+                    row2 = df1[i + 1]
+                    with cols[3]:
+                        st.markdown(f"{row2['Parameter']} ({row2['Simbol']})")
+                    with cols[4]:
+                        st.text_input("", value=row2["Nilai"], disabled=True, key=f"val_{i+1}", label_visibility="collapsed")
+                    with cols[5]:
+                        st.markdown(row2["Satuan"])
+                else:
+                    for j in [3, 4, 5]:
+                        with cols[j]: st.write("")
+
+            for i, row in enumerate(df2):
+                cols = st.columns([8, 3, 1])
+                with cols[0]:
+                    st.markdown(f"{row['Parameter']} ({row['Simbol']})")
+                with cols[1]:
+                    st.text_input("", value=row["Nilai"], disabled=True, key=f"val2_{i}", label_visibility="collapsed")
+                with cols[2]:
+                    st.markdown(row["Satuan"])
+
+            tampilkan_kurva_kapasitas(st.session_state.profil_terpilih)
+
+bagian_profil()
 
 # ========== Input Parameter Struktur ==========
-def input_parameter_struktur(df_template, prefix="input"):
+def input_parameter_struktur(template, prefix="input"):
     """Render input form for structural parameters"""
     values = []
-    status_sendi = None
-
-    sendi_pos = df_template.index[df_template["Parameter"].str.contains("Tegangan Tarik", case=False)].tolist()
-    sendi_pos = sendi_pos[0] if sendi_pos else None
-
-    for i in range(0, len(df_template), 2):
-        if sendi_pos is not None and i <= sendi_pos < i + 2:
-            cols = st.columns([4.7, 2.2, 1, 4.7, 3.3])
-            row1 = df_template.iloc[i]
-            with cols[0]:
-                st.markdown(f"{row1['Parameter']} ({row1['Simbol']})")
-            with cols[1]:
-                val1 = st.text_input("", key=f"{prefix}_{i}", placeholder="Masukan", label_visibility="collapsed")
-                values.append(val1.strip())
-            with cols[2]:
-                st.markdown(row1["Satuan"])
+    for i in range(0, len(template), 2):
+        cols = st.columns([4.7, 2.2, 1, 4.7, 2.2, 1])
+        row1 = template[i]
+        with cols[0]:
+            st.markdown(f"{row1['Parameter']} ({row1['Simbol']})")
+        with cols[1]:
+            val1 = st.text_input("", key=f"{prefix}_{i}", placeholder="Masukan", label_visibility="collapsed")
+            values.append(val1.strip())
+        with cols[2]:
+            st.markdown(row1["Satuan"])
+        if i + 1 < len(template):
+            row2 = template[i + 1]
             with cols[3]:
-                st.markdown("Status Sendi Profil")
+                st.markdown(f"{row2['Parameter']} ({row2['Simbol']})")
             with cols[4]:
-                if "status_sendi" not in st.session_state:
-                    st.session_state["status_sendi"] = "Pilih Opsi"
-                status_sendi = st.selectbox("", ["Pilih Opsi", "Ya", "Tidak"], key="status_sendi", label_visibility="collapsed")
-        else:
-            cols = st.columns([4.7, 2.2, 1, 4.7, 2.2, 1])
-            row1 = df_template.iloc[i]
-            with cols[0]:
-                st.markdown(f"{row1['Parameter']} ({row1['Simbol']})")
-            with cols[1]:
-                val1 = st.text_input("", key=f"{prefix}_{i}", placeholder="Masukan", label_visibility="collapsed")
-                values.append(val1.strip())
-            with cols[2]:
-                st.markdown(row1["Satuan"])
-            if i + 1 < len(df_template):
-                row2 = df_template.iloc[i + 1]
-                with cols[3]:
-                    st.markdown(f"{row2['Parameter']} ({row2['Simbol']})")
-                with cols[4]:
-                    val2 = st.text_input("", key=f"{prefix}_{i+1}", placeholder="Masukan", label_visibility="collapsed")
-                    values.append(val2.strip())
-                with cols[5]:
-                    st.markdown(row2["Satuan"])
-    if status_sendi is None:
-        col1, col2, col3 = st.columns([8, 3, 1])
-        with col1:
-            st.markdown("Status Sendi Profil")
-        with col2:
-            status_sendi = st.selectbox("", ["Pilih Opsi", "Ya", "Tidak"], key="status_sendi", label_visibility="collapsed")
-        with col3:
-            st.markdown("")
-    return values, status_sendi
-
-st.subheader("Parameter Struktur")
-st.info("Jika terdapat parameter yang tidak ditinjau, masukkan nilai 0!")
-
-param_input_df = input_df_template.iloc[:-1]
-param_status_row = input_df_template.iloc[-1]
+                val2 = st.text_input("", key=f"{prefix}_{i+1}", placeholder="Masukan", label_visibility="collapsed")
+                values.append(val2.strip())
+            with cols[5]:
+                st.markdown(row2["Satuan"])
+    return values
 
-input_values, status_sendi = input_parameter_struktur(input_df_template, "input")
+def input_status_sendi():
+    """Joint status selector; kept outside the form so the joint fields can appear immediately"""
+    if "status_sendi" not in st.session_state:
+        st.session_state["status_sendi"] = "Pilih Opsi"
+    col1, col2, col3 = st.columns([8, 3, 1])
+    with col1:
+        st.markdown("Status Sendi Profil")
+    with col2:
+        status_sendi = st.selectbox("", ["Pilih Opsi", "Ya", "Tidak"], key="status_sendi", label_visibility="collapsed")
+    with col3:
+        st.markdown("")
+    return status_sendi
 
 # ========== Input Parameter Sendi ==========
-sendi_values = []
-def input_parameter_sendi(df_template, prefix="sendi_input"):
+def input_parameter_sendi(template, prefix="sendi_input"):
     """Render input form for joint parameters"""
     values = []
-    for i, row in df_template.iterrows():
+    for i, row in enumerate(template):
         cols = st.columns([8, 3, 1])
         with cols[0]:
             st.markdown(f"{row['Parameter']} ({row['Simbol']})")
@@ -600,10 +834,6 @@ def input_parameter_sendi(df_template, prefix="sendi_input"):
             st.markdown(satuan if satuan else "")
     return values
 
-if status_sendi == "Ya":
-    st.markdown("### Parameter Sendi")
-    sendi_values = input_parameter_sendi(sendi_df_template, "sendi_input")
-
 def check_empty(vals):
     """Check if any values are empty"""
     return any(v.strip() == "" for v in vals)
@@ -611,6 +841,9 @@ def check_empty(vals):
 # ========== Formatting Tabel Hasil ==========
 def build_consistent_grid(df_result, key):
     """Build a consistent AG Grid for displaying results"""
+    from st_aggrid import AgGrid, GridOptionsBuilder
+    from st_aggrid.shared import GridUpdateMode
+
     gb = GridOptionsBuilder.from_dataframe(df_result)
     gb.configure_default_column(flex=1, resizable=False, suppressMenu=True, sortable=False, editable=False)
     for col in df_result.columns:
@@ -626,148 +859,670 @@ def build_consistent_grid(df_result, key):
     AgGrid(df_result, gridOptions=grid_options, height=height, fit_columns_on_grid_load=False,
            update_mode=GridUpdateMode.NO_UPDATE, allow_unsafe_jscode=True, key=key)
 
-# Improved calculation results function
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def get_calculation_results():
-    """Retrieve calculation results with improved retry logic"""
+# Range hasil perhitungan pada sheet "WF"
+RANGE_HASIL = {
+    "tarik_dfbt": "C59:I63",
+    "tarik_dki": "C66:I70",
+    "tekan_dfbt": "C94:I99",
+    "tekan_dki": "C102:I107",
+    "momen_mayor_dfbt": "C131:I143",
+    "momen_mayor_dki": "C146:I158",
+    "momen_minor_dfbt": "C161:I163",
+    "momen_minor_dki": "C166:I168",
+    "geser_dfbt": "C172:I174",
+    "geser_dki": "C177:I179",
+    "torsi_dfbt": "C183:I186",
+    "torsi_dki": "C189:I192",
+}
+
+@with_retry
+def batch_get_ranges(sheet, ranges):
+    """Read several ranges of a calculation sheet in a single values.batchGet request"""
+    get_quota_governor().acquire("read")
+    return [list(values) for values in sheet.batch_get(ranges)]
+
+def result_range_complete(values):
+    """A result range is usable once it has a header and rows and is not still loading"""
+    if not values or len(values) < 2:
+        return False
+    return not any("Loading..." in str(cell) for row in values for cell in row)
+
+# Protokol selesai-hitung: nonce per permintaan ditulis ke NONCE_CELL, dan
+# NONCE_ECHO_CELL berisi formula yang bergantung pada seluruh blok hasil, mis.
+# =IF(ISERROR(SUM(C59:I192)), "", E21), sehingga baru sama dengan nonce
+# setelah semua formula dependen selesai dihitung ulang.
+NONCE_CELL = "E21"
+NONCE_ECHO_CELL = "I193"
+
+class StaleResultError(Exception):
+    """Raised when the sheet does not echo the request nonce before the deadline"""
+
+def new_nonce():
+    """Per-request token written next to the inputs"""
+    return uuid.uuid4().hex[:12]
+
+def get_calculation_results(sheet, nonce=None, timeout=20.0, max_delay=2.0, lease=None):
+    """
+    Retrieve all result ranges with one batched read per poll. With a nonce, poll
+    (short exponential backoff, overall deadline) until NONCE_ECHO_CELL echoes it,
+    so results of an earlier recalculation are detected instead of returned.
+    A worksheet lease is renewed on every poll.
+    """
     try:
-        hasil = {
-            "tarik_dfbt": sheet_wf.get("C59:I63"),
-            "tarik_dki": sheet_wf.get("C66:I70"),
-            "tekan_dfbt": sheet_wf.get("C94:I99"),
-            "tekan_dki": sheet_wf.get("C102:I107"),
-            "momen_mayor_dfbt": sheet_wf.get("C131:I143"),
-            "momen_mayor_dki": sheet_wf.get("C146:I158"),
-            "momen_minor_dfbt": sheet_wf.get("C161:I163"),
-            "momen_minor_dki": sheet_wf.get("C166:I168"),
-            "geser_dfbt": sheet_wf.get("C172:I174"),
-            "geser_dki": sheet_wf.get("C177:I179"),
-            "torsi_dfbt": sheet_wf.get("C183:I186"),
-            "torsi_dki": sheet_wf.get("C189:I192")
-        }
-        return hasil
+        hasil = {}
+        pending = list(RANGE_HASIL)
+        deadline = time.monotonic() + timeout
+        delay = 0.25
+        while True:
+            ranges = [RANGE_HASIL[key] for key in pending]
+            if nonce is not None:
+                ranges.append(NONCE_ECHO_CELL)
+            if lease is not None:
+                lease.renew()
+            values_list = batch_get_ranges(sheet, ranges)
+            fresh = nonce is None or (values_list.pop() or [[""]])[0][0] == nonce
+            if fresh:
+                for key, values in zip(pending, values_list):
+                    hasil[key] = values
+                pending = [key for key in pending if not result_range_complete(hasil[key])]
+                if not pending:
+                    return hasil
+            if time.monotonic() + delay > deadline:
+                if not fresh:
+                    raise StaleResultError(f"Sheet did not finish recalculating within {timeout:.0f} s")
+                return hasil
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+    except StaleResultError:
+        raise
+    except LeaseLost:
+        raise
     except Exception as e:
         st.error(f"Error retrieving results: {str(e)}")
         raise
 
 # ========== Improved Update Google Sheets Function ==========
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def update_sheet_values(updates):
-    """Update Google Sheet with improved error handling and rate limiting"""
+@with_retry
+def update_sheet_values(sheet, updates):
+    """Write all input ranges in one values.batchUpdate request (idempotent, safe to retry)"""
+    import gspread
+
     try:
-        for i, (range_name, values) in enumerate(updates):
-            st.write(f"Updating range {i+1}/{len(updates)}: {range_name}")
-            sheet_wf.update(range_name, values)
-            # Add delay to avoid rate limits
-            if i < len(updates) - 1:  # Don't wait after the last update
-                time.sleep(1)
+        get_quota_governor().acquire("write")
+        sheet.batch_update([{"range": range_name, "values": values} for range_name, values in updates])
         return True
     except gspread.exceptions.APIError as e:
         if 'RATE_LIMIT_EXCEEDED' in str(e):
-            st.warning("Rate limit exceeded, waiting before retry...")
-            time.sleep(10)
+            st.warning("Rate limit exceeded, retrying...")
         st.error(f"API Error updating sheet: {str(e)}")
         raise
     except Exception as e:
         st.error(f"Error updating sheet: {str(e)}")
         raise
 
-# ========== Tombol Hitung ==========
-can_hitung = (not check_empty(input_values)) and (status_sendi in ["Ya", "Tidak"]) and (status_sendi == "Tidak" or (status_sendi == "Ya" and not check_empty(sendi_values)))
+# ========== Perhitungan Lokal (SNI 1729) ==========
+def calculate_local(profil, input_values, status_sendi, sendi_values):
+    """Compute all result tables in-process from the cached catalog row"""
+    return wf_lib.calculate(catalog, profil, input_values, status_sendi, sendi_values)
 
-# Create a container for the calculate button
-calculate_container = st.container()
-
-with calculate_container:
-    if st.button("🧮 Hitung", disabled=not can_hitung or st.session_state.calculating, use_container_width=True):
-        st.session_state.calculating = True
+def calculate_via_sheet(progress, profil, input_values, status_sendi, sendi_values):
+    """Send inputs to the WF sheet, wait for recalculation and read the results"""
+    nonce = new_nonce()
+    updates = []
+    updates.append(('E20', [[profil]]))
+    updates.append(("E6:E17", [[v] for v in input_values+[status_sendi]]))
+    
+    if status_sendi == "Ya" and sendi_values:
+        updates.append(("E207:E211", [[v] for v in sendi_values]))
+    updates.append((NONCE_CELL, [[nonce]]))
+    
+    # Lease a calculation sheet so concurrent sessions never share input/output cells
+    progress(20, "🔒 Waiting for a free calculation sheet...")
+    
+    with get_sheet_pool().acquire(owner=nonce, timeout=LEASE_TTL) as lease:
+        sheet = get_worksheet(lease.nama)
+        
+        # Update Google Sheets in a single batch request
+        progress(30, f"☁️ Sending data to Google Sheets ({lease.nama})...")
+        
+        # Penulisan bisa lama saat kuota/backoff; pastikan lease masih dipegang sebelum dan sesudahnya
+        lease.renew()
+        update_success = update_sheet_values(sheet, updates)
+        lease.renew()
+        
+        if not update_success:
+            raise Exception("Failed to send data to server. Please try again.")
         
-        progress_bar = st.progress(0)
-        progress_text = st.empty()
+        # Poll until the sheet echoes the nonce, reading the results in the same requests
+        progress(60, "⏳ Waiting for sheet recalculation...")
         
+        return get_calculation_results(sheet, nonce=nonce, lease=lease)
+
+# ========== Tombol Hitung ==========
+def can_hitung(input_values, status_sendi, sendi_values):
+    """All structural inputs filled, joint status chosen and joint inputs filled when needed"""
+    return (not check_empty(input_values)) and (status_sendi in ["Ya", "Tidak"]) and (status_sendi == "Tidak" or (status_sendi == "Ya" and not check_empty(sendi_values)))
+
+JOB_WORKERS = int(os.environ.get("WF_JOB_WORKERS", 4))
+
+@st.cache_resource
+def get_job_queue():
+    """Process-wide worker pool and job store for calculations"""
+    return JobQueue(workers=JOB_WORKERS)
+
+@st.cache_resource
+def get_result_cache():
+    """Memory + SQLite result cache shared by every session (see wf_cache)"""
+    return ResultCache()
+
+@st.cache_resource
+def model_versions():
+    """Version of each calculation engine; a formula change gives new cache keys"""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    tabel = source_version(os.path.join(folder, "wf_hasil.py"))
+    engine = source_version(os.path.join(folder, "wf_engine.py"), os.path.join(folder, "wf_penampang.py"))
+    return {
+        MODE_LOKAL: f"lokal:{engine}:{tabel}",
+        # Rumus pada spreadsheet tidak bisa di-hash dari sini; naikkan versinya saat rumus diubah
+        MODE_SHEETS: f"sheets:{os.environ.get('WF_SHEET_MODEL_VERSION', '1')}:{tabel}",
+    }
+
+def kunci_hasil(profil, input_values, status_sendi, sendi_values):
+    """Cache key of this request for each engine"""
+    return {mode: cache_key(profil, input_values, status_sendi, sendi_values, catalog.version, versi)
+            for mode, versi in model_versions().items()}
+
+def hitung_job(progress, mode, kunci, profil, input_values, status_sendi, sendi_values, parse=True, sebelumnya=None):
+    """
+    Calculation job run by a worker: returns ({hasil, model, mode, permintaan}, notes) and caches
+    the result. With parse=False the typed tables are left to the reader (model None).
+    With `sebelumnya` (see hasil_sebelumnya) the local engine only computes and parses the
+    result groups whose inputs changed; the rest is reused. The sheet's dependencies are
+    not known here, so the sheet engine always reads every result range.
+    """
+    from wf_hasil import parse_semua_hasil
+
+    catatan = []
+    permintaan = (profil, list(input_values), status_sendi, list(sendi_values))
+    if mode != MODE_LOKAL and parse_custom_name(profil) is not None:
+        # Sheet hanya mengenal profil katalog
+        catatan.append("ℹ️ Penampang kustom dihitung secara lokal")
+        mode, sebelumnya = MODE_LOKAL, None
+    progress(10, "📝 Preparing calculation data...")
+    if mode == MODE_LOKAL:
+        progress(30, "🧮 Calculating (SNI 1729)...")
+        if sebelumnya:
+            hasil_perhitungan, dihitung = wf_lib.recalculate(catalog, *permintaan, sebelumnya["permintaan"],
+                                                             sebelumnya["hasil"])
+        else:
+            hasil_perhitungan, dihitung = calculate_local(*permintaan), list(RANGE_HASIL)
+    else:
+        sebelumnya = None
         try:
-            # Collect all updates into a batch
-            progress_text.text("📝 Preparing calculation data...")
-            progress_bar.progress(10)
-            
-            updates = []
-            updates.append(('E20', [[st.session_state.profil_terpilih]]))
-            updates.append(("E6:E17", [[v] for v in input_values+[status_sendi]]))
-            
-            if status_sendi == "Ya" and sendi_values:
-                updates.append(("E207:E211", [[v] for v in sendi_values]))
-            
-            # Update Google Sheets in batch
-            progress_text.text("☁️ Sending data to Google Sheets...")
-            progress_bar.progress(30)
-            
-            update_success = update_sheet_values(updates)
-            
-            if not update_success:
-                st.error("Failed to send data to server. Please try again.")
-                st.session_state.calculating = False
-                st.stop()
-            
-            # Give Google Sheets time to calculate
-            progress_text.text("⏳ Processing calculations...")
-            progress_bar.progress(60)
-            time.sleep(3)  # Increased wait time for calculations
-            
-            # Get all calculation results at once
-            progress_text.text("📊 Retrieving calculation results...")
-            progress_bar.progress(80)
-            
-            hasil_perhitungan = get_calculation_results()
-            st.session_state.hasil_perhitungan = hasil_perhitungan
-            
-            progress_bar.progress(100)
-            progress_text.text("✅ Calculation completed successfully!")
-            time.sleep(1)
-            progress_text.empty()
-            progress_bar.empty()
-            
+            hasil_perhitungan, dihitung = calculate_via_sheet(progress, *permintaan), list(RANGE_HASIL)
         except Exception as e:
-            st.error(f"❌ Calculation failed: {str(e)}")
-            st.error("**Please try the following:**")
-            st.error("1. Check your internet connection")
-            st.error("2. Verify all input values are valid")
-            st.error("3. Wait a moment and try again")
-        finally:
-            st.session_state.calculating = False
+            # Quota habis / Sheets tidak tersedia -> tetap hitung secara lokal
+            catatan.append(f"⚠️ Google Sheets unavailable ({str(e)}), using local calculation instead")
+            hasil_perhitungan, dihitung = calculate_local(*permintaan), list(RANGE_HASIL)
+            mode = MODE_LOKAL
+    # Hasil diparse sekali di worker; render ulang hanya memformat kolom
+    progress(90, "📊 Preparing result tables...")
+    model = None
+    if parse:
+        model_lama = (sebelumnya or {}).get("model") or {}
+        model = {key: model_lama[key] for key in hasil_perhitungan if key not in dihitung and key in model_lama}
+        model.update(parse_semua_hasil({key: tabel for key, tabel in hasil_perhitungan.items() if key not in model}))
+    hasil = {"hasil": hasil_perhitungan, "model": model, "mode": mode, "permintaan": permintaan}
+    # Disimpan di bawah kunci mesin yang benar-benar menghitung
+    get_result_cache().put(kunci[mode], hasil)
+    return hasil, catatan
+
+def simpan_hasil(hasil):
+    """Make a finished result the session's current one (and the base of the next recalculation)"""
+    st.session_state.hasil_perhitungan = hasil["hasil"]
+    st.session_state.hasil_model = hasil["model"]
+    st.session_state.asal_hasil = {"mode": hasil.get("mode"), "permintaan": hasil.get("permintaan"),
+                                   "versi": catalog.version}
+
+def hasil_sebelumnya():
+    """The session's current result as {permintaan, hasil, model} when a recalculation may reuse it"""
+    asal = st.session_state.get("asal_hasil")
+    if not asal or not asal["permintaan"] or not st.session_state.hasil_perhitungan:
+        return None
+    # Hasil mesin lain atau katalog lama tidak boleh dicampur
+    if asal["mode"] != mode_hitung or asal["versi"] != catalog.version:
+        return None
+    return {"permintaan": asal["permintaan"], "hasil": st.session_state.hasil_perhitungan,
+            "model": st.session_state.hasil_model}
+
+def jalankan_perhitungan(input_values, status_sendi, sendi_values):
+    """
+    Serve a cached result, recompute only the changed result groups in place (local engine),
+    or submit the calculation as a background job the status section polls
+    """
+    profil = st.session_state.profil_terpilih
+    kunci = kunci_hasil(profil, input_values, status_sendi, sendi_values)
+    hasil = get_result_cache().get(kunci[mode_hitung])
+    if hasil is not None:
+        simpan_hasil(hasil)
+        st.rerun()
+    # Pemakaian ulang hasil hanya untuk mesin lokal: GANTUNGAN tidak menggambarkan rumus sheet
+    sebelumnya = hasil_sebelumnya() if mode_hitung == MODE_LOKAL else None
+    if sebelumnya:
+        try:
+            terdampak = wf_lib.affected_results(catalog, sebelumnya["permintaan"],
+                                                (profil, input_values, status_sendi, sendi_values))
+        except ValueError:
+            terdampak = RANGE_HASIL
+        # Sebagian kecil tabel berubah: hitung dan parse langsung tanpa antrean job
+        if len(terdampak) < len(RANGE_HASIL):
+            hasil, _ = hitung_job(lambda *_: None, mode_hitung, kunci, profil, list(input_values), status_sendi,
+                                  list(sendi_values), sebelumnya=sebelumnya)
+            simpan_hasil(hasil)
             st.rerun()
+    # Permintaan identik yang sedang dihitung sesi lain ikut menunggu job yang sama
+    job_id = get_job_queue().submit(hitung_job, mode_hitung, kunci, profil, list(input_values), status_sendi,
+                                    list(sendi_values), sebelumnya=sebelumnya, label=profil, key=kunci[mode_hitung])
+    st.session_state.job_id = job_id
+    st.query_params["job"] = job_id
+    # Rerun the whole page once so the status section starts polling
+    st.rerun()
+
+def selesaikan_job(job):
+    """Move a finished job into the session and stop polling it"""
+    st.session_state.job_id = None
+    if "job" in st.query_params:
+        del st.query_params["job"]
+    if job["status"] == SELESAI:
+        simpan_hasil(job["hasil"])
+        st.session_state.pesan_perhitungan = {"catatan": job["catatan"], "error": None}
+    else:
+        st.session_state.pesan_perhitungan = {"catatan": [], "error": job["error"]}
+
+def status_perhitungan():
+    """Progress of the running job, polled every second until it finishes"""
+    job = get_job_queue().get(st.session_state.job_id)
+    if job is None:
+        st.session_state.job_id = None
+        if "job" in st.query_params:
+            del st.query_params["job"]
+        st.warning("⚠️ Perhitungan tidak ditemukan (sudah kedaluwarsa atau server dimulai ulang).")
+        return
+    if job["status"] in (ANTRI, BERJALAN):
+        st.progress(job["progress"], text=job["pesan"])
+        return
+    selesaikan_job(job)
+    # Rerun the whole page so the input and results sections see the new state
+    st.rerun()
+
+# ========== Cari Profil Teringan ==========
+JUMLAH_KANDIDAT = 5
 
-# Display results if available
-if "hasil_perhitungan" in st.session_state and st.session_state.hasil_perhitungan:
-    hasil = st.session_state.hasil_perhitungan
+def pakai_profil():
+    profil = st.session_state.profil_optimasi
+    st.session_state.profil_terpilih = profil
+    st.session_state.profil_select = profil
+
+def tampilkan_optimasi(hasil):
+    """Lightest passing profiles (local engine, every catalog row checked at once)"""
+    import pandas as pd
+
+    st.markdown(f"#### Profil Teringan ({hasil['metode']})")
+    st.caption(f"{hasil['dievaluasi']} dari {hasil['jumlah_profil']} profil dievaluasi, urut berat lalu rasio")
+    if not hasil["kandidat"]:
+        st.warning("⚠️ Tidak ada profil di katalog yang memenuhi semua pemeriksaan.")
+        return
+    df = pd.DataFrame([{"Profil": k["profil"], "Berat (kg/m)": f"{k['berat']:.2f}".replace(".", ","),
+                        "Rasio": f"{k['rasio']:.3f}".replace(".", ","), "Penentu": k["penentu"]}
+                       for k in hasil["kandidat"]])
+    st.table(df.set_index("Profil"))
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.selectbox("Profil", df["Profil"], key="profil_optimasi", label_visibility="collapsed")
+    with col2:
+        if st.button("Gunakan profil ini", on_click=pakai_profil, use_container_width=True):
+            # Pemilih profil ada di fragment lain: rerun seluruh halaman
+            st.rerun()
+
+@st.fragment
+def bagian_input():
+    """Input section; typing only reruns this fragment and Hitung submits the form"""
+    st.subheader("Parameter Struktur")
+    st.info("Jika terdapat parameter yang tidak ditinjau, masukkan nilai 0!")
     
-    st.header("📈 Hasil Analisis Kekuatan Struktur")
-    def tampilkan_hasil(judul, result_range, key_suffix):
-        if not result_range or len(result_range) < 2:
-            st.warning(f"Data {judul} tidak tersedia.")
-            return
-            
-        header = result_range[0]
-        values = result_range[1:]
-        df_result = pd.DataFrame(values, columns=header)
-        df_result = format_angka(df_result)
-        df_result = df_result[~df_result.apply(lambda row: row.astype(str).str.contains("Tidak berlaku").any(), axis=1)]
+    status_sendi = input_status_sendi()
+    with st.form("form_hitung", border=False):
+        input_values = input_parameter_struktur(input_template, "input")
         
-        if df_result.empty:
-            st.info(f"Tidak ada data yang relevan untuk {judul}")
-            return
-            
-        st.subheader(judul)
+        sendi_values = []
+        if status_sendi == "Ya":
+            st.markdown("### Parameter Sendi")
+            sendi_values = input_parameter_sendi(sendi_template, "sendi_input")
+        
+        submitted = st.form_submit_button("🧮 Hitung", disabled=st.session_state.job_id is not None, use_container_width=True)
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            metode = st.radio("Metode", METODE, horizontal=True, key="metode_optimasi", label_visibility="collapsed")
+        with col2:
+            cari = st.form_submit_button("🔎 Cari Profil Teringan", use_container_width=True)
+    
+    if submitted:
+        if not can_hitung(input_values, status_sendi, sendi_values):
+            st.warning("⚠️ Lengkapi semua parameter dan pilih status sendi sebelum menghitung.")
+        else:
+            jalankan_perhitungan(input_values, status_sendi, sendi_values)
+    if cari:
+        if not can_hitung(input_values, status_sendi, sendi_values):
+            st.warning("⚠️ Lengkapi semua parameter dan pilih status sendi sebelum mencari profil.")
+        else:
+            try:
+                st.session_state.hasil_optimasi = wf_lib.lightest_profiles(
+                    catalog, input_values, status_sendi, sendi_values, metode, top=JUMLAH_KANDIDAT)
+            except ValueError as e:
+                st.session_state.hasil_optimasi = None
+                st.error(f"❌ {e}")
+    if st.session_state.get("hasil_optimasi"):
+        tampilkan_optimasi(st.session_state.hasil_optimasi)
+
+bagian_input()
+
+# ========== Status Perhitungan ==========
+pesan = st.session_state.pop("pesan_perhitungan", None)
+if pesan:
+    for catatan in pesan["catatan"]:
+        st.warning(catatan)
+    if pesan["error"]:
+        st.error(f"❌ Calculation failed: {pesan['error']}")
+        st.error("**Please try the following:**")
+        st.error("1. Check your internet connection")
+        st.error("2. Verify all input values are valid")
+        st.error("3. Wait a moment and try again")
+if st.session_state.job_id is not None:
+    st.fragment(status_perhitungan, run_every=1.0)()
+
+# ========== Hasil Perhitungan ==========
+# Kondisi batas -> [(kunci hasil, judul tabel)], ditampilkan satu kondisi per render
+KELOMPOK_HASIL = {
+    "Tarik": [
+        ("tarik_dfbt", "Kekuatan Desain Struktur Terhadap Aksial Tarik (DFBT)"),
+        ("tarik_dki", "Kekuatan Desain Izin Terhadap Aksial Tarik (DKI)"),
+    ],
+    "Tekan": [
+        ("tekan_dfbt", "Kekuatan Desain Struktur Terhadap Aksial Tekan (DFBT)"),
+        ("tekan_dki", "Kekuatan Izin Struktur Terhadap Aksial Tekan (DKI)"),
+    ],
+    "Momen Mayor": [
+        ("momen_mayor_dfbt", "Kekuatan Desain Struktur Terhadap Momen Mayor (DFBT)"),
+        ("momen_mayor_dki", "Kekuatan Izin Struktur Terhadap Momen Mayor (DKI)"),
+    ],
+    "Momen Minor": [
+        ("momen_minor_dfbt", "Kekuatan Desain Struktur Terhadap Momen Minor (DFBT)"),
+        ("momen_minor_dki", "Kekuatan Izin Struktur Terhadap Momen Minor (DKI)"),
+    ],
+    "Geser": [
+        ("geser_dfbt", "Kekuatan Desain Struktur Terhadap Geser (DFBT)"),
+        ("geser_dki", "Kekuatan Izin Struktur Terhadap Geser (DKI)"),
+    ],
+    "Torsi": [
+        ("torsi_dfbt", "Kekuatan Desain Struktur Terhadap Torsi (DFBT)"),
+        ("torsi_dki", "Kekuatan Izin Struktur Terhadap Torsi (DKI)"),
+    ],
+}
+
+def tampilkan_hasil(judul, tabel, key_suffix, interaktif=False):
+    if tabel is None:
+        st.warning(f"Data {judul} tidak tersedia.")
+        return
+        
+    from wf_hasil import tabel_tampilan
+
+    df_result = tabel_tampilan(tabel)
+    
+    if df_result.empty:
+        st.info(f"Tidak ada data yang relevan untuk {judul}")
+        return
+        
+    st.subheader(judul)
+    if interaktif:
         build_consistent_grid(df_result, key=key_suffix)
+    else:
+        # Tabel statis: tanpa iframe/komponen JS, cukup HTML biasa
+        st.table(df_result.set_index(df_result.columns[0]))
+
+@st.fragment
+def bagian_hasil():
+    """Results section, isolated so input and profile interactions don't re-render it"""
+    if "hasil_perhitungan" in st.session_state and st.session_state.hasil_perhitungan:
+        model = st.session_state.hasil_model
+        if model is None:
+            from wf_hasil import parse_semua_hasil
+            model = st.session_state.hasil_model = parse_semua_hasil(st.session_state.hasil_perhitungan)
+        
+        st.header("📈 Hasil Analisis Kekuatan Struktur")
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            kondisi = st.radio("Kondisi Batas", list(KELOMPOK_HASIL), horizontal=True, key="kondisi_hasil")
+        with col2:
+            interaktif = st.toggle("Tabel interaktif", key="hasil_interaktif",
+                                   help="Tampilkan hasil dengan AgGrid (lebih berat dimuat)")
+        # Hanya kondisi batas yang dipilih yang dirender
+        for key, judul in KELOMPOK_HASIL[kondisi]:
+            tampilkan_hasil(judul, model.get(key), key, interaktif)
+
+bagian_hasil()
+
+# ========== Kombinasi Beban (SNI 1727) ==========
+def nilai_form():
+    """Current (submitted) values of the structural and joint forms"""
+    input_values = [st.session_state.get(f"input_{i}", "").strip() for i in range(len(input_template))]
+    status_sendi = st.session_state.get("status_sendi")
+    sendi_values = [st.session_state.get(f"sendi_input_{i + 1}", "").strip() for i in range(len(sendi_template))]
+    return input_values, status_sendi, sendi_values
+
+@st.fragment
+def bagian_kombinasi():
+    """Nominal D/L/Lr/W/E actions entered once; every combination checked in one evaluation"""
+    import pandas as pd
+    from wf_kombinasi import AKSI, BEBAN, PEMERIKSAAN
+
+    st.header("⚖️ Kombinasi Beban (SNI 1727)")
+    st.info("Data batang (fy, fu, panjang, K, Lb, sendi) diambil dari Parameter Struktur; gaya dalam per jenis "
+            "beban diisi di tabel ini. N positif = tarik.")
+    satuan = {"N": "N (kN)", "Mux": "Mux (kNm)", "Muy": "Muy (kNm)", "Vu": "Vu (kN)", "Tu": "Tu (kNm)"}
+    awal = pd.DataFrame(0.0, index=list(BEBAN), columns=[satuan[a] for a in AKSI])
+    beban_df = st.data_editor(awal, key="kombinasi_beban", use_container_width=True)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        metode = st.radio("Metode", METODE, horizontal=True, key="kombinasi_metode")
+    with col2:
+        periksa = st.button("Periksa Kombinasi", use_container_width=True)
     
-    tampilkan_hasil("Kekuatan Desain Struktur Terhadap Aksial Tarik (DFBT)", hasil["tarik_dfbt"], "tarik_dfbt")
-    tampilkan_hasil("Kekuatan Desain Izin Terhadap Aksial Tarik (DKI)", hasil["tarik_dki"], "tarik_dki")
-    tampilkan_hasil("Kekuatan Desain Struktur Terhadap Aksial Tekan (DFBT)", hasil["tekan_dfbt"], "tekan_dfbt")
-    tampilkan_hasil("Kekuatan Izin Struktur Terhadap Aksial Tekan (DKI)", hasil["tekan_dki"], "tekan_dki")
-    tampilkan_hasil("Kekuatan Desain Struktur Terhadap Momen Mayor (DFBT)", hasil["momen_mayor_dfbt"], "momen_mayor_dfbt")
-    tampilkan_hasil("Kekuatan Izin Struktur Terhadap Momen Mayor (DKI)", hasil["momen_mayor_dki"], "momen_mayor_dki")
-    tampilkan_hasil("Kekuatan Desain Struktur Terhadap Momen Minor (DFBT)", hasil["momen_minor_dfbt"], "momen_minor_dfbt")
-    tampilkan_hasil("Kekuatan Izin Struktur Terhadap Momen Minor (DKI)", hasil["momen_minor_dki"], "momen_minor_dki")
-    tampilkan_hasil("Kekuatan Desain Struktur Terhadap Geser (DFBT)", hasil["geser_dfbt"], "geser_dfbt")
-    tampilkan_hasil("Kekuatan Izin Struktur Terhadap Geser (DKI)", hasil["geser_dki"], "geser_dki")
-    tampilkan_hasil("Kekuatan Desain Struktur Terhadap Torsi (DFBT)", hasil["torsi_dfbt"], "torsi_dfbt")
-    tampilkan_hasil("Kekuatan Izin Struktur Terhadap Torsi (DKI)", hasil["torsi_dki"], "torsi_dki")
+    if periksa:
+        input_values, status_sendi, sendi_values = nilai_form()
+        beban_df = beban_df.fillna(0)
+        beban = {jenis: {a: beban_df.loc[jenis, satuan[a]] for a in AKSI} for jenis in BEBAN}
+        if not beban_df.to_numpy().any():
+            st.warning("⚠️ Isi gaya dalam minimal satu jenis beban.")
+            return
+        try:
+            st.session_state.hasil_kombinasi = wf_lib.load_combinations(
+                catalog, st.session_state.profil_terpilih, input_values, status_sendi, sendi_values, beban, metode)
+        except ValueError as e:
+            st.session_state.hasil_kombinasi = None
+            st.warning(f"⚠️ {e}. Lengkapi Parameter Struktur lalu tekan Hitung atau Cari Profil Teringan.")
+    
+    hasil = st.session_state.get("hasil_kombinasi")
+    if not hasil:
+        return
+    penentu = hasil["penentu"]
+    teks = f"Kombinasi penentu ({hasil['metode']}): **{penentu['kombinasi']}**, rasio {penentu['rasio']:.3f} ({penentu['penentu']})"
+    if penentu["status"] == "OK":
+        st.success(f"✅ {teks}")
+    else:
+        st.error(f"❌ {teks}")
+    df = pd.DataFrame([{
+        "Kombinasi": r["kombinasi"], **{satuan[a]: r[a] for a in AKSI},
+        **{f"Rasio {cek}": r[f"rasio {cek}"] for cek in PEMERIKSAAN},
+        "Rasio maks": r["rasio"], "Status": r["status"],
+    } for r in hasil["kombinasi"]])
+    st.dataframe(df, hide_index=True, use_container_width=True,
+                 column_config={kolom: st.column_config.NumberColumn(format="%.3f")
+                                for kolom in df.columns if kolom.startswith("Rasio")})
+
+bagian_kombinasi()
+
+# ========== Mode Proyek ==========
+# Kunci hasil -> kondisi batas, untuk kolom "Penentu" ringkasan
+KONDISI_HASIL = {key: kondisi for kondisi, tabel in KELOMPOK_HASIL.items() for key, _ in tabel}
+
+def mulai_proyek(anggota, error):
+    """Submit every valid member as a calculation job; cached members are filled in at once"""
+    selesai, jobs = {}, {}
+    for a in anggota:
+        if a.id in error:
+            continue
+        input_values, status_sendi, sendi_values = wf_lib.request_from_params(catalog, a.params, a.sendi)
+        kunci = kunci_hasil(a.profil, input_values, status_sendi, sendi_values)
+        hasil = get_result_cache().get(kunci[mode_hitung])
+        if hasil is not None:
+            selesai[a.id] = hasil
+            continue
+        # Anggota identik (atau yang sedang dihitung sesi lain) berbagi satu job
+        # Ringkasan cukup membaca tabel mentah; tabel bertipe diparse saat rincian anggota dibuka
+        jobs[a.id] = get_job_queue().submit(hitung_job, mode_hitung, kunci, a.profil, input_values, status_sendi,
+                                            sendi_values, parse=False, label=f"{a.id} ({a.profil})",
+                                            key=kunci[mode_hitung])
+    st.session_state.proyek = {"anggota": anggota, "selesai": selesai, "jobs": jobs, "error": dict(error),
+                               "catatan": set(), "ekspor": {}, "polling": bool(jobs)}
+
+def kumpulkan_proyek(proyek):
+    """Move finished member jobs into the project"""
+    queue = get_job_queue()
+    for id_, job_id in list(proyek["jobs"].items()):
+        job = queue.get(job_id)
+        if job is None:
+            proyek["error"][id_] = "Perhitungan kedaluwarsa, jalankan ulang proyek"
+        elif job["status"] == SELESAI:
+            proyek["selesai"][id_] = job["hasil"]
+            proyek["catatan"].update(job["catatan"])
+        elif job["status"] == GAGAL:
+            proyek["error"][id_] = job["error"]
+        else:
+            continue
+        del proyek["jobs"][id_]
+
+def tampilkan_ringkasan_proyek(proyek, metode):
+    """Sortable governing-ratio summary, one row per member"""
+    import pandas as pd
+    from wf_proyek import summary_rows
+
+    hasil = {id_: v["hasil"] for id_, v in proyek["selesai"].items()}
+    rows = summary_rows(proyek["anggota"], hasil, proyek["error"], metode)
+    df = pd.DataFrame([{
+        "ID": r["id"], "Profil": r["profil"], "Rasio": r["rasio_maks"],
+        "Penentu": KONDISI_HASIL.get(r["penentu"], r["penentu"]), "Kondisi": r["kondisi_penentu"],
+        "Status": r["status"] or ("❌ Error" if r["error"] else "⏳"), "Keterangan": r["error"],
+    } for r in rows])
+    st.dataframe(df, hide_index=True, use_container_width=True,
+                 column_config={"Rasio": st.column_config.NumberColumn(format="%.3f")})
+
+def ekspor_proyek(proyek, metode):
+    """CSV and Excel export of the whole run, built once per method"""
+    from wf_proyek import export_csv, export_excel
+
+    if metode not in proyek["ekspor"]:
+        hasil = {id_: v["hasil"] for id_, v in proyek["selesai"].items()}
+        berkas = {"csv": export_csv(proyek["anggota"], hasil, proyek["error"], metode)}
+        try:
+            berkas["xlsx"] = export_excel(proyek["anggota"], hasil, proyek["error"], metode)
+        except ImportError:
+            berkas["xlsx"] = None
+        proyek["ekspor"][metode] = berkas
+    berkas = proyek["ekspor"][metode]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Unduh CSV", berkas["csv"], file_name=f"proyek_wf_{metode.lower()}.csv",
+                           mime="text/csv", use_container_width=True)
+    with col2:
+        if berkas["xlsx"] is None:
+            st.caption("Ekspor Excel membutuhkan paket openpyxl.")
+        else:
+            st.download_button("⬇️ Unduh Excel", berkas["xlsx"], file_name=f"proyek_wf_{metode.lower()}.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                               use_container_width=True)
+
+def bagian_proyek():
+    """Project mode: check a whole member schedule; polls while member jobs are running"""
+    st.header("📋 Mode Proyek")
+    with st.expander("Format jadwal anggota"):
+        kunci, kunci_sendi = wf_lib.form_keys(catalog)
+        st.markdown(
+            "File CSV atau Excel, satu anggota per baris: kolom `id`, `profil`, lalu satu kolom per parameter "
+            f"dalam satuan form ({', '.join(kunci)}). Kolom sendi ({', '.join(kunci_sendi)}) yang kosong "
+            "berarti anggota tanpa sendi baut.")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        berkas = st.file_uploader("Jadwal anggota", type=["csv", "xlsx"], key="proyek_file")
+    with col2:
+        metode = st.radio("Metode", METODE, key="proyek_metode")
+        jalankan = st.button("▶️ Periksa Semua", disabled=berkas is None, use_container_width=True)
+    
+    if jalankan and berkas is not None:
+        from wf_proyek import read_schedule, validate
+
+        try:
+            anggota = read_schedule(berkas.getvalue(), berkas.name)
+        except ImportError:
+            st.error("❌ Membaca file Excel membutuhkan paket openpyxl; gunakan CSV.")
+            return
+        except (ValueError, KeyError) as e:
+            st.error(f"❌ Jadwal anggota tidak valid: {e}")
+            return
+        if not anggota:
+            st.warning("⚠️ Jadwal anggota kosong.")
+            return
+        mulai_proyek(anggota, validate(catalog, anggota))
+        # Rerun seluruh halaman agar bagian ini dibuat ulang dengan polling
+        st.rerun()
+    
+    proyek = st.session_state.get("proyek")
+    if proyek is None:
+        return
+    kumpulkan_proyek(proyek)
+    total = len(proyek["anggota"])
+    jumlah_selesai = len(proyek["selesai"]) + len(proyek["error"])
+    if proyek["jobs"]:
+        st.progress(jumlah_selesai / total, text=f"⏳ {jumlah_selesai} dari {total} anggota selesai...")
+    for catatan in sorted(proyek["catatan"]):
+        st.warning(catatan)
+    
+    tampilkan_ringkasan_proyek(proyek, metode)
+    if proyek["jobs"]:
+        return
+    if proyek["polling"]:
+        # Job terakhir baru selesai: rerun penuh untuk menghentikan polling
+        proyek["polling"] = False
+        st.rerun()
+    
+    ekspor_proyek(proyek, metode)
+    
+    # Rincian per anggota memakai tabel hasil yang sama dengan perhitungan tunggal
+    if proyek["selesai"]:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            id_ = st.selectbox("Rincian anggota", [a.id for a in proyek["anggota"] if a.id in proyek["selesai"]],
+                               key="proyek_anggota")
+        with col2:
+            kondisi = st.radio("Kondisi Batas", list(KELOMPOK_HASIL), horizontal=True, key="proyek_kondisi")
+        hasil = proyek["selesai"][id_]
+        if hasil["model"] is None:
+            from wf_hasil import parse_semua_hasil
+            hasil = proyek["selesai"][id_] = dict(hasil, model=parse_semua_hasil(hasil["hasil"]))
+        model = hasil["model"]
+        for key, judul in KELOMPOK_HASIL[kondisi]:
+            tampilkan_hasil(judul, model.get(key), f"proyek_{key}")
+
+if st.session_state.get("proyek") and st.session_state.proyek["polling"]:
+    st.fragment(bagian_proyek, run_every=1.0)()
+else:
+    st.fragment(bagian_proyek)()
@@ -0,0 +1,267 @@
+"""
+Batch parametric sweep: many profile x parameter cases across CPU cores.
+
+    python wf_batch.py sweep.json -o sweep.csv
+    python wf_batch.py cases.csv -o hasil_parquet --format parquet --workers 8
+
+A sweep file is JSON, either a list of cases (as for `wf_cli.py --file`) or a
+grid whose lists are expanded into their cartesian product:
+
+    {"profil": "*", "params": {"fy": 250, "fu": 410, "L": [2, 4, 6, 8], "Nc": [100, 200]}}
+
+`"profil": "*"` means every profile of the catalog. CSV case files are read
+as in `wf_cli.py`.
+
+Results are written as they complete, one row per result line tagged with a
+`case_id` (a hash of profile and parameters). CSV output is appended to and
+flushed per case; Parquet output is a directory of part files, one per flushed
+batch, each complete as soon as it appears.
+Re-running the same command skips cases already in the output, so an
+interrupted sweep resumes where it stopped (`--no-resume` starts over).
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import wf_lib
+from wf_catalog import SNAPSHOT_PATH
+from wf_cli import read_cases
+from wf_engine import INPUT_KEYS, KOLOM_HASIL, SENDI_KEYS
+
+logger = logging.getLogger(__name__)
+
+KOLOM_AWAL = ["case_id", "profil"]
+KOLOM_AKHIR = ["hasil", *KOLOM_HASIL, "error"]
+
+
+def case_id(profil, params):
+    teks = json.dumps([profil, {k: str(v) for k, v in params.items()}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(teks.encode("utf-8")).hexdigest()[:16]
+
+
+def expand_grid(spec, profil_katalog):
+    """[(profil, params)] from a grid spec: list values are swept, scalars fixed"""
+    profil = spec.get("profil", "*")
+    if profil == "*":
+        profil = list(profil_katalog)
+    elif isinstance(profil, str):
+        profil = [profil]
+    params = spec.get("params", {})
+    kunci = list(params)
+    nilai = [v if isinstance(v, list) else [v] for v in params.values()]
+    return [(p, dict(zip(kunci, kombinasi))) for p in profil for kombinasi in itertools.product(*nilai)]
+
+
+def load_cases(path, catalog):
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+        if isinstance(spec, dict) and (spec.get("profil") == "*" or
+                                       any(isinstance(v, list) for v in spec.get("params", {}).values())):
+            return expand_grid(spec, catalog.profil)
+    return read_cases(path)
+
+
+# ========== WORKER ==========
+_catalog = None
+
+
+def _init_worker(snapshot_path):
+    global _catalog
+    _catalog = wf_lib.load_catalog(snapshot_path)
+
+
+def _run(case):
+    cid, profil, params = case
+    try:
+        struktur, sendi = wf_lib.split_params(params)
+        hasil = wf_lib.calculate_params(_catalog, profil, struktur, sendi)
+    except Exception as e:  # satu kasus gagal tidak menghentikan sweep
+        return cid, profil, params, [], f"{type(e).__name__}: {e}"
+    return cid, profil, params, wf_lib.result_records(hasil), ""
+
+
+# ========== OUTPUT ==========
+class CsvSink:
+    """Append-only CSV; cases already present are reported by `done`"""
+
+    def __init__(self, path, kolom, resume=True):
+        self.path = path
+        self.kolom = kolom
+        self.done = set()
+        ada = resume and os.path.exists(path) and os.path.getsize(path) > 0
+        if ada:
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                if reader.fieldnames != kolom:
+                    raise ValueError(f"{path} has different columns; use another output or --no-resume")
+                rows = list(reader)
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                utuh = f.read() == b"\n"
+            # Baris terakhir tanpa akhir baris terpotong (case_id-nya pun bisa terpotong)
+            if rows and not utuh:
+                rows.pop()
+            # Kasus terakhir mungkin terpotong saat dihentikan: tulis ulang tanpa kasus itu
+            if rows:
+                terakhir = rows[-1]["case_id"]
+                rows = [row for row in rows if row["case_id"] != terakhir]
+                tmp = path + ".tmp"
+                with open(tmp, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=kolom)
+                    writer.writeheader()
+                    writer.writerows(rows)
+                os.replace(tmp, path)
+            self.done = {row["case_id"] for row in rows}
+        self._f = open(path, "a" if ada else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._f, fieldnames=kolom)
+        if not ada:
+            self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+        self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+class ParquetSink:
+    """
+    Directory of Parquet part files (needs pyarrow). Every flushed batch becomes its
+    own part, written under a temporary name and renamed once closed, so an
+    interrupted run keeps all batches flushed before it stopped.
+    """
+
+    def __init__(self, path, kolom, resume=True, batch=4096):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self.kolom = kolom
+        self.schema = pa.schema([(nama, pa.string()) for nama in kolom])
+        os.makedirs(path, exist_ok=True)
+        # Part yang sedang ditulis saat proses dihentikan tidak pernah diganti nama
+        for p in os.listdir(path):
+            if p.endswith(".parquet.tmp"):
+                os.remove(os.path.join(path, p))
+        parts = sorted(p for p in os.listdir(path) if p.startswith("part-") and p.endswith(".parquet"))
+        if not resume:
+            for p in parts:
+                os.remove(os.path.join(path, p))
+            parts = []
+        self.done = set()
+        for p in parts:
+            try:
+                self.done.update(pq.read_table(os.path.join(path, p), columns=["case_id"]).column(0).to_pylist())
+            except (OSError, pa.ArrowException) as e:  # part rusak: kasusnya dihitung ulang
+                logger.warning("skipping unreadable part %s: %s", p, e)
+                os.remove(os.path.join(path, p))
+        self._nomor = max((int(p[5:10]) for p in parts if p[5:10].isdigit()), default=-1) + 1
+        self._batch = batch
+        self._rows = []
+
+    def write(self, rows):
+        # Semua baris satu kasus masuk ke part yang sama
+        self._rows.extend(rows)
+        if len(self._rows) >= self._batch:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        data = {nama: [None if r.get(nama) is None else str(r.get(nama)) for r in self._rows] for nama in self.kolom}
+        nama = os.path.join(self.path, f"part-{self._nomor:05d}.parquet")
+        self._pq.write_table(self._pa.Table.from_pydict(data, schema=self.schema), nama + ".tmp")
+        os.replace(nama + ".tmp", nama)
+        self._nomor += 1
+        self._rows = []
+
+    def close(self):
+        self._flush()
+
+
+def _baris(cid, profil, params, records, error, kolom_param):
+    dasar = {"case_id": cid, "profil": profil, **{k: params.get(k, "") for k in kolom_param}}
+    if error or not records:
+        return [dict(dasar, error=error)]
+    return [dict(dasar, **record, error="") for record in records]
+
+
+def run_sweep(cases, sink, kolom_param, snapshot_path=SNAPSHOT_PATH, workers=None, report_every=5.0):
+    """Run the cases not yet in `sink` on a process pool; returns a throughput report"""
+    antrian = []
+    for profil, params in cases:
+        cid = case_id(profil, params)
+        if cid not in sink.done:
+            antrian.append((cid, profil, params))
+    dilewati = len(cases) - len(antrian)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(antrian) // (workers * 8) or 1))
+
+    t0 = time.perf_counter()
+    selesai = gagal = 0
+    terakhir = t0
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(snapshot_path,)) as pool:
+        for cid, profil, params, records, error in pool.imap_unordered(_run, antrian, chunksize=chunksize):
+            sink.write(_baris(cid, profil, params, records, error, kolom_param))
+            selesai += 1
+            gagal += bool(error)
+            sekarang = time.perf_counter()
+            if sekarang - terakhir >= report_every:
+                terakhir = sekarang
+                print(f"{selesai}/{len(antrian)} cases, {selesai / (sekarang - t0):.1f} cases/s", file=sys.stderr)
+    detik = time.perf_counter() - t0
+    return {"cases": len(cases), "skipped": dilewati, "computed": selesai, "errors": gagal,
+            "workers": workers, "seconds": round(detik, 3),
+            "cases_per_second": round(selesai / detik, 1) if detik > 0 else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parametric WF sweep on a process pool")
+    parser.add_argument("cases", help="JSON grid/case list or CSV case file")
+    parser.add_argument("-o", "--output", required=True, help="CSV file or Parquet directory")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv",
+                        help="output format; parquet needs the optional pyarrow package (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="catalog snapshot (default: %(default)s)")
+    parser.add_argument("--no-resume", action="store_true", help="discard existing output and start over")
+    args = parser.parse_args(argv)
+
+    try:
+        catalog = wf_lib.load_catalog(args.snapshot)
+    except FileNotFoundError as e:
+        parser.exit(2, f"error: {e}\n")
+    try:
+        cases = load_cases(args.cases, catalog)
+    except ValueError as e:
+        parser.exit(2, f"error: {args.cases}: {e}\n")
+    dipakai = {k for _, params in cases for k in params}
+    kolom_param = [k for k in INPUT_KEYS + SENDI_KEYS if k in dipakai] + sorted(dipakai - set(INPUT_KEYS + SENDI_KEYS))
+    kolom = KOLOM_AWAL + kolom_param + KOLOM_AKHIR
+
+    sink_cls = ParquetSink if args.format == "parquet" else CsvSink
+    try:
+        sink = sink_cls(args.output, kolom, resume=not args.no_resume)
+    except ImportError:
+        parser.exit(2, "error: --format parquet needs pyarrow (pip install pyarrow)\n")
+    except ValueError as e:
+        parser.exit(2, f"error: {e}\n")
+    try:
+        laporan = run_sweep(cases, sink, kolom_param, args.snapshot, args.workers)
+    finally:
+        sink.close()
+    print(json.dumps(laporan), file=sys.stderr)
+    return 1 if laporan["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
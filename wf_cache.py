@@ -0,0 +1,146 @@
+"""
+Content-addressed cache of calculation results.
+
+A result is stored under a hash of everything it depends on: the profile,
+the normalised form values, the catalog version and the version of the
+calculation model. A changed catalog or engine therefore yields new keys
+and old entries are simply never hit again (and age out of the tiers).
+
+Two tiers: a small in-memory LRU for the hot set, shared by every session
+of the process, and a size-bounded SQLite file that survives restarts and
+is shared by processes on the same host.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from wf_engine import parse_angka
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get(
+    "WF_RESULT_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hasil_cache.sqlite"),
+)
+
+
+def source_version(*paths):
+    """Hash of source files, so any formula edit changes the model version"""
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _nilai_normal(val):
+    """Form value in canonical form: numbers as floats ("250" == "250,0"), other text stripped"""
+    x = parse_angka(val)
+    return x if x is not None else str(val or "").strip()
+
+
+def cache_key(profil, input_values, status_sendi, sendi_values, catalog_version, model_version):
+    """Canonical hash of one calculation request"""
+    payload = {
+        "profil": profil,
+        "input": [_nilai_normal(v) for v in input_values],
+        "sendi": status_sendi,
+        # Nilai sendi hanya berpengaruh bila profil memakai sendi
+        "sendi_input": [_nilai_normal(v) for v in sendi_values] if status_sendi == "Ya" else [],
+        "katalog": catalog_version,
+        "model": model_version,
+    }
+    teks = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(teks.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Memory LRU in front of a size-bounded SQLite store; values must be picklable"""
+
+    def __init__(self, path=CACHE_PATH, max_memory=256, max_disk_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_memory = max_memory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS hasil ("
+                       "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS hasil_used ON hasil (used)")
+            self._db = db
+        return self._db
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached value for `key`, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return self._memory[key]
+            try:
+                db = self._conn()
+                row = db.execute("SELECT value FROM hasil WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE hasil SET used = ? WHERE key = ?", (time.time(), key))
+                    db.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Result cache read failed: %s", e)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            value = pickle.loads(row[0])
+            self._remember(key, value)
+            self.hits["disk"] += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            try:
+                db = self._conn()
+                db.execute("INSERT OR REPLACE INTO hasil (key, value, size, used) VALUES (?, ?, ?, ?)",
+                           (key, blob, len(blob), time.time()))
+                self._evict(db)
+                db.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Result cache write failed: %s", e)
+
+    def _evict(self, db):
+        """Drop least recently used rows until the store fits in max_disk_bytes"""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM hasil").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        lebih = total - self.max_disk_bytes
+        hapus, dibuang = [], 0
+        for key, size in db.execute("SELECT key, size FROM hasil ORDER BY used"):
+            if dibuang >= lebih:
+                break
+            hapus.append((key,))
+            dibuang += size
+        db.executemany("DELETE FROM hasil WHERE key = ?", hapus)
+
+    def stats(self):
+        with self._lock:
+            return {"memory_entries": len(self._memory), "hits": dict(self.hits), "misses": self.misses}
@@ -0,0 +1,275 @@
+"""
+Static WF catalog ("Tabel WF") and the form templates of the "WF" sheet.
+
+The raw ranges are kept as a versioned local snapshot in compact JSON so the
+app can start, and the profile picker keeps working, without waiting on (or
+reaching) Google Sheets. Its `version` is a content hash of the tables, so
+callers can tell a real catalog change from a spreadsheet edit elsewhere
+(e.g. calculation inputs).
+
+`build_catalog` parses the ranges once into a read-only `ProfileCatalog`
+that is shared by every session. The tables may have any number of rows;
+`ProfileCatalog.search` filters them by name prefix, series, depth and
+weight through sorted indexes, so lookups stay cheap as the catalog grows.
+"""
+import array
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from wf_engine import parse_angka, section_from_catalog, section_to_catalog
+from wf_penampang import BERAT_PER_LUAS, DIMENSI, complete
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_PATH = os.environ.get(
+    "WF_CATALOG_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "katalog_wf.json"),
+)
+CATALOG_KEYS = ("tabel_profil_wf", "tabel_wf", "input_template", "sendi_template")
+
+# Baris 1-3 tabel berisi header (parameter, simbol, satuan); data profil mulai baris 4 sampai baris terakhir
+HEADER_ROWS = 3
+DATA_ROWS = slice(HEADER_ROWS, None)
+KOLOM_TEMPLATE = ("Parameter", "Simbol", "Nilai", "Satuan")
+
+
+def catalog_version(data):
+    """Content hash of the catalog tables, stable across key order and re-downloads"""
+    payload = json.dumps({key: data[key] for key in CATALOG_KEYS}, sort_keys=True,
+                         ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Return the stored snapshot, or None if it is missing, corrupt or outdated"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    data = snapshot.get("data") or {}
+    if any(key not in data for key in CATALOG_KEYS):
+        return None
+    return snapshot
+
+
+def save_snapshot(data, source_modified=None, path=SNAPSHOT_PATH):
+    """Atomically write the catalog tables to disk and return the new snapshot"""
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "version": catalog_version(data),
+        "source_modified": source_modified,
+        "saved_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "data": {key: data[key] for key in CATALOG_KEYS},
+    }
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".katalog_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return snapshot
+
+
+# ========== KATALOG PROFIL TERINDEKS ==========
+def format_display(val):
+    """Display string for a sheet value: integers without decimals, others with two"""
+    if not val:
+        return ""
+    try:
+        val_num = float(str(val).replace(",", ".").strip())
+        return str(int(val_num)) if val_num.is_integer() else f"{val_num:.2f}"
+    except (ValueError, TypeError, OverflowError):
+        return str(val).strip()
+
+
+def _pad(row, width, fill=""):
+    return tuple(row) + (fill,) * (width - len(row))
+
+
+def _template(rows):
+    return tuple(MappingProxyType(dict(zip(KOLOM_TEMPLATE, _pad(row, len(KOLOM_TEMPLATE))))) for row in rows)
+
+
+_ProfileCatalog = namedtuple("_ProfileCatalog", [
+    "version",         # hash isi katalog (lihat catalog_version)
+    "profil",          # nama profil sesuai urutan tabel
+    "index",           # nama profil -> nomor baris
+    "parameter", "simbol", "satuan",
+    "nilai",           # nilai mentah per baris (tuple of tuples)
+    "kolom",           # parameter -> memoryview float64 read-only (NaN bila kosong)
+    "tampilan",        # per baris: baris {Parameter, Simbol, Nilai terformat, Satuan}
+    "penampang",       # per baris: properti penampang wf_engine (mm), read-only
+    "tabel_header", "tabel_rows",   # tabel profil; tabel_rows sejajar dengan `profil`
+    "input_template", "sendi_template",
+    "seri",            # per baris: seri dari awalan nama (WF, H, IWF, ...)
+    "baris_seri",      # seri -> tuple baris
+    "indeks_nama",     # (nama dinormalkan, baris) terurut, juga tanpa awalan seri; untuk cari awalan
+    "urutan",          # "nama" / "d" / "berat" -> tuple baris terurut menurut kunci itu
+    "nilai_urut",      # "d" / "berat" -> nilai terurut (sejajar dengan urutan), untuk bisect
+])
+
+_POLA_SERI = re.compile(r"^\s*([A-Za-z]+)")
+
+
+def _kunci_nama(teks):
+    return re.sub(r"\s+", "", str(teks)).lower()
+
+
+class ProfileCatalog(_ProfileCatalog):
+    """
+    Parsed WF catalog, built once per catalog version and shared read-only by
+    every session: typed numeric columns, an O(1) name -> row index and
+    pre-formatted display rows for the section panel.
+    """
+    __slots__ = ()
+
+    def row(self, profil):
+        """Row number of `profil`, or None when it is not in the catalog"""
+        return self.index.get(profil)
+
+    def bounds(self, kunci):
+        """(min, max) of "d" (mm) or "berat" (kg/m) over the catalog, or None when empty"""
+        nilai = self.nilai_urut[kunci]
+        return (nilai[0], nilai[-1]) if nilai else None
+
+    def _rentang(self, kunci, bawah, atas):
+        nilai = self.nilai_urut[kunci]
+        return set(self.urutan[kunci][bisect.bisect_left(nilai, bawah):bisect.bisect_right(nilai, atas)])
+
+    def search(self, teks="", seri=(), d=None, berat=None, urut=None):
+        """
+        Row numbers of the profiles whose name (or size, without the series) starts with
+        `teks`, of one of the series `seri`, with depth `d` and weight `berat` within the
+        given (min, max) ranges; in catalog order, or sorted by "nama", "d" or "berat"
+        """
+        baris = None
+        if teks:
+            kunci = _kunci_nama(teks)
+            nilai = self.indeks_nama
+            awal = bisect.bisect_left(nilai, (kunci,))
+            akhir = bisect.bisect_left(nilai, (kunci + "\uffff",))
+            baris = {i for _, i in nilai[awal:akhir]}
+        if seri:
+            pilih = {i for s in seri for i in self.baris_seri.get(s, ())}
+            baris = pilih if baris is None else baris & pilih
+        for kunci, rentang in (("d", d), ("berat", berat)):
+            if rentang is not None:
+                pilih = self._rentang(kunci, *rentang)
+                baris = pilih if baris is None else baris & pilih
+        if urut:
+            return [i for i in self.urutan[urut] if baris is None or i in baris]
+        return list(range(len(self.profil))) if baris is None else sorted(baris)
+
+
+def build_catalog(data, version=None):
+    """Parse the raw catalog ranges (see CATALOG_KEYS) into a ProfileCatalog"""
+    tabel_profil = data["tabel_profil_wf"]
+    tabel_wf = data["tabel_wf"]
+    parameter, simbol, satuan = (tuple(tabel_wf[i]) if len(tabel_wf) > i else () for i in range(HEADER_ROWS))
+    lebar = len(parameter)
+    simbol, satuan = _pad(simbol, lebar), _pad(satuan, lebar)
+
+    header = tuple(tabel_profil[0]) if tabel_profil else ()
+    profil, index, nilai, tabel_rows = [], {}, [], []
+    for row_profil, row_nilai in zip(tabel_profil[DATA_ROWS], tabel_wf[DATA_ROWS]):
+        if not row_profil or not row_profil[0] or row_profil[0] in index:
+            continue
+        index[row_profil[0]] = len(profil)
+        profil.append(row_profil[0])
+        nilai.append(_pad(row_nilai, lebar))
+        tabel_rows.append(_pad(row_profil, len(header)))
+
+    kolom = {}
+    for j, nama in enumerate(parameter):
+        if nama in kolom:
+            continue
+        angka = (parse_angka(row[j]) for row in nilai)
+        kolom[nama] = memoryview(array.array("d", (math.nan if x is None else x for x in angka))).toreadonly()
+
+    tampilan = tuple(
+        tuple(MappingProxyType(dict(zip(KOLOM_TEMPLATE, (par, sim, format_display(val), sat))))
+              for par, sim, val, sat in zip(parameter, simbol, row, satuan))
+        for row in nilai
+    )
+    penampang = tuple(MappingProxyType(section_from_catalog(parameter, simbol, satuan, row)) for row in nilai)
+
+    # Indeks pencarian: seri, nama (juga tanpa awalan seri), tinggi dan berat terurut
+    seri = tuple(m.group(1).upper() if m else "" for m in map(_POLA_SERI.match, profil))
+    baris_seri = {}
+    for i, s in enumerate(seri):
+        baris_seri.setdefault(s, []).append(i)
+    nama = sorted({(k, i) for i, p in enumerate(profil)
+                   for k in (_kunci_nama(p), _kunci_nama(p[len(seri[i]):]) if seri[i] else _kunci_nama(p))})
+    ukuran = {
+        "d": [p.get("d") for p in penampang],
+        "berat": [p.get("W") or (p["A"] * BERAT_PER_LUAS if p.get("A") else None) for p in penampang],
+    }
+    urut = {k: sorted((x, i) for i, x in enumerate(v) if x is not None and x == x) for k, v in ukuran.items()}
+    urutan = {"nama": tuple(sorted(range(len(profil)), key=lambda i: _kunci_nama(profil[i])))}
+    urutan.update({k: tuple(i for _, i in v) for k, v in urut.items()})
+    nilai_urut = {k: tuple(x for x, _ in v) for k, v in urut.items()}
+
+    return ProfileCatalog(
+        version=version or catalog_version(data),
+        profil=tuple(profil),
+        index=MappingProxyType(index),
+        parameter=parameter, simbol=simbol, satuan=satuan,
+        nilai=tuple(nilai),
+        kolom=MappingProxyType(kolom),
+        tampilan=tampilan,
+        penampang=penampang,
+        tabel_header=header, tabel_rows=tuple(tabel_rows),
+        input_template=_template(data["input_template"]),
+        sendi_template=_template(data["sendi_template"]),
+        seri=seri,
+        baris_seri=MappingProxyType({s: tuple(v) for s, v in baris_seri.items()}),
+        indeks_nama=tuple(nama),
+        urutan=MappingProxyType(urutan),
+        nilai_urut=MappingProxyType(nilai_urut),
+    )
+
+
+def section_display(catalog, section):
+    """Display rows like `catalog.tampilan` for section properties in mm (e.g. a custom section)"""
+    nilai = section_to_catalog(catalog.parameter, catalog.simbol, catalog.satuan, section)
+    return tuple(
+        MappingProxyType(dict(zip(KOLOM_TEMPLATE, (par, sim, "" if x is None else format_display(x) or "0", sat))))
+        for par, sim, x, sat in zip(catalog.parameter, catalog.simbol, nilai, catalog.satuan)
+    )
+
+
+def regenerate_tables(data):
+    """
+    Copy of the raw catalog ranges with every "Tabel WF" property recomputed from the
+    row's d, bf, tw, tf and r (see wf_penampang); rows without usable dimensions are kept
+    """
+    tabel_wf = data["tabel_wf"]
+    parameter, simbol, satuan = (tuple(tabel_wf[i]) if len(tabel_wf) > i else () for i in range(HEADER_ROWS))
+    lebar = len(parameter)
+    simbol, satuan = _pad(simbol, lebar), _pad(satuan, lebar)
+    rows = [list(row) for row in tabel_wf[:HEADER_ROWS]]
+    for row in tabel_wf[HEADER_ROWS:]:
+        dimensi = {k: v for k, v in section_from_catalog(parameter, simbol, satuan, row).items() if k in DIMENSI}
+        try:
+            p = complete(dimensi)
+        except ValueError:
+            rows.append(list(row))
+            continue
+        nilai = section_to_catalog(parameter, simbol, satuan, p)
+        rows.append([lama if x is None else f"{x:.4f}".replace(".", ",") for x, lama in zip(nilai, _pad(row, lebar))])
+    return dict(data, tabel_wf=rows)
@@ -0,0 +1,272 @@
+"""
+Command-line WF member check using the headless library (no Streamlit).
+
+    python wf_cli.py --list
+    python wf_cli.py "WF 300x150" -p fy=250 -p fu=410 -p L=3 -p Nc=100 -p Mux=50
+    python wf_cli.py --file cases.csv --format csv -o hasil.csv
+    python wf_cli.py "WF 300x150" --capacity -p fy=250 -p L=6 -p Cb=1.14
+    python wf_cli.py --lightest 5 --method DKI -p fy=250 -p fu=410 -p L=6 -p Mux=120
+    python wf_cli.py "Kustom 450x250x9x16" -p fy=250 -p fu=410 -p L=6 -p Mux=200
+    python wf_cli.py --validate-catalog
+    python wf_cli.py --regenerate-catalog data/katalog_turunan.json
+
+A case file is CSV with a `profil` column plus one column per parameter, or
+JSON: a list of objects with `profil` and either a `params` object or the
+parameters at top level. Parameter keys are those of `wf_engine.INPUT_KEYS`
+and `wf_engine.SENDI_KEYS`, in the units of the sheet form. A profile can
+also be a custom (e.g. welded) section "Kustom d x bf x tw x tf", whose
+properties are derived from its dimensions (see `wf_penampang`).
+"""
+import argparse
+import csv
+import json
+import sys
+
+import wf_lib
+from wf_catalog import SNAPSHOT_PATH, load_snapshot, regenerate_tables, save_snapshot
+from wf_engine import METODE
+from wf_penampang import validate_catalog
+
+STATUS_GAGAL = "TIDAK OK"
+
+
+def _param(teks):
+    kunci, sep, nilai = teks.partition("=")
+    if not sep or not kunci.strip():
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {teks!r}")
+    return kunci.strip(), nilai.strip()
+
+
+def _positif(teks):
+    try:
+        n = int(teks)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {teks!r}") from None
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def read_cases(path):
+    """[(profil, params)] from a CSV or JSON case file"""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        cases = []
+        for item in data if isinstance(data, list) else [data]:
+            item = dict(item)
+            profil = item.pop("profil")
+            cases.append((profil, dict(item.pop("params", {}), **item)))
+        return cases
+    cases = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # Kolom lebih banyak dari header: biasanya koma desimal ("6,5") tanpa tanda kutip
+            if None in row:
+                raise ValueError(f"line {reader.line_num}: more fields than the header; "
+                                 'quote values that contain a comma (e.g. "WF 300x150x6,5x9")')
+            cases.append((row.pop("profil"), {k: v for k, v in row.items() if v not in (None, "")}))
+    return cases
+
+
+def run_case(catalog, profil, params):
+    struktur, sendi = wf_lib.split_params(params)
+    return wf_lib.calculate_params(catalog, profil, struktur, sendi)
+
+
+def _tulis_tabel(out, profil, hasil):
+    out.write(f"== {profil} ==\n")
+    for key, table in hasil.items():
+        if not table:
+            continue
+        rows = [[str(c) for c in row] for row in table]
+        lebar = [max(len(row[j]) for row in rows) for j in range(len(rows[0]))]
+        out.write(f"\n[{key}]\n")
+        for row in rows:
+            out.write("  ".join(c.ljust(w) for c, w in zip(row, lebar)).rstrip() + "\n")
+    out.write("\n")
+
+
+def _capacity(catalog, args):
+    if not args.profil:
+        print("error: --capacity needs a profile", file=sys.stderr)
+        return 1
+    try:
+        hasil = wf_lib.capacities(catalog, args.profil, dict(args.param), args.method)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    satuan = {"tekan": "kN", "momen_mayor": "kNm", "momen_minor": "kNm", "geser": "kN"}
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump({"profil": args.profil, "metode": args.method, "kapasitas": hasil}, out, ensure_ascii=False, indent=2)
+            out.write("\n")
+        elif args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(["profil", "metode", "kondisi", "kapasitas", "satuan"])
+            for kondisi, nilai in hasil.items():
+                writer.writerow([args.profil, args.method, kondisi, f"{nilai:.3f}", satuan[kondisi]])
+        else:
+            _tulis_tabel(out, f"{args.profil} ({args.method})", {"kapasitas": [["kondisi", "kapasitas", "satuan"]] + [
+                [kondisi, f"{nilai:.2f}", satuan[kondisi]] for kondisi, nilai in hasil.items()]})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def _validate(catalog, args):
+    temuan = validate_catalog(catalog, args.tolerance)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(temuan, out, ensure_ascii=False, indent=2)
+            out.write("\n")
+        else:
+            kolom = ["profil", "properti", "katalog", "turunan", "selisih"]
+            rows = [{**t, **{k: f"{t[k]:.4g}" for k in ("katalog", "turunan") if t[k] is not None},
+                     "selisih": "" if t["selisih"] is None else f"{t['selisih']:+.1%}",
+                     "properti": t["properti"] or "dimensi tidak valid"} for t in temuan]
+            if args.format == "csv":
+                writer = csv.DictWriter(out, fieldnames=kolom)
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                _tulis_tabel(out, f"{len(catalog.profil)} profiles, tolerance {args.tolerance:.1%}: "
+                                  f"{len(temuan)} deviations", {"validate": [kolom] + [[r[k] for k in kolom] for r in rows]})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 3 if temuan and args.fail_on_ng else 0
+
+
+def _regenerate(args):
+    snapshot = load_snapshot(args.snapshot)
+    data = regenerate_tables(snapshot["data"])
+    baru = save_snapshot(data, snapshot.get("source_modified"), path=args.regenerate_catalog)
+    print(f"wrote {args.regenerate_catalog} (version {baru['version']})", file=sys.stderr)
+    return 0
+
+
+def _lightest(catalog, args):
+    try:
+        struktur, sendi = wf_lib.split_params(dict(args.param))
+        hasil = wf_lib.lightest_profiles_params(catalog, struktur, sendi, args.method, args.lightest)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(hasil, out, ensure_ascii=False, indent=2)
+            out.write("\n")
+        else:
+            kolom = ["profil", "berat", "rasio", "penentu"]
+            rows = [{**k, "berat": f"{k['berat']:.2f}", "rasio": f"{k['rasio']:.3f}"} for k in hasil["kandidat"]]
+            if args.format == "csv":
+                writer = csv.DictWriter(out, fieldnames=kolom)
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                _tulis_tabel(out, f"{args.method}: {hasil['dievaluasi']}/{hasil['jumlah_profil']} profiles evaluated",
+                             {"lightest": [kolom] + [[r[k] for k in kolom] for r in rows]})
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    # Tidak ada profil yang memenuhi -> sama seperti pemeriksaan yang TIDAK OK
+    return 3 if not hasil["kandidat"] and args.fail_on_ng else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SNI 1729 WF member check (local engine)")
+    parser.add_argument("profil", nargs="?", help='profile name as in the catalog, or "Kustom d x bf x tw x tf"')
+    parser.add_argument("-p", "--param", type=_param, action="append", default=[], metavar="KEY=VALUE",
+                        help="input parameter, repeatable (e.g. fy=250)")
+    parser.add_argument("-f", "--file", help="CSV or JSON file with one case per row")
+    parser.add_argument("--format", choices=("table", "json", "csv"), default="table")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help="catalog snapshot (default: %(default)s)")
+    parser.add_argument("--list", action="store_true", help="list profiles and input parameters, then exit")
+    parser.add_argument("--lightest", type=_positif, metavar="N",
+                        help="instead of checking one profile, list the N lightest profiles passing every check")
+    parser.add_argument("--capacity", action="store_true",
+                        help="print the profile's design strengths at L/Lb from the precomputed capacity tables")
+    parser.add_argument("--validate-catalog", action="store_true",
+                        help="compare catalog section properties with those derived from d, bf, tw, tf and r")
+    parser.add_argument("--tolerance", type=float, default=0.03, help="relative tolerance for --validate-catalog")
+    parser.add_argument("--regenerate-catalog", metavar="PATH",
+                        help="write a catalog snapshot whose properties are derived from the dimensions")
+    parser.add_argument("--method", choices=METODE, default="DFBT", help="design method for --lightest/--capacity")
+    parser.add_argument("--fail-on-ng", action="store_true",
+                        help=f"exit with status 3 when any check is '{STATUS_GAGAL}'")
+    args = parser.parse_args(argv)
+
+    try:
+        catalog = wf_lib.load_catalog(args.snapshot)
+    except FileNotFoundError as e:
+        parser.exit(2, f"error: {e}\n")
+
+    if args.list:
+        print("Profil:", ", ".join(catalog.profil))
+        for row in catalog.input_template:
+            print(f"  {row['Parameter']} ({row['Simbol']}) [{row['Satuan']}]")
+        return 0
+
+    if args.regenerate_catalog:
+        return _regenerate(args)
+    if args.validate_catalog:
+        return _validate(catalog, args)
+    if args.lightest is not None:
+        return _lightest(catalog, args)
+    if args.capacity:
+        return _capacity(catalog, args)
+
+    if args.file:
+        try:
+            cases = read_cases(args.file)
+        except ValueError as e:
+            parser.exit(2, f"error: {args.file}: {e}\n")
+    elif args.profil:
+        cases = [(args.profil, dict(args.param))]
+    else:
+        parser.error("give a profile or --file")
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    gagal = ng = False
+    try:
+        writer = None
+        semua = []
+        for i, (profil, params) in enumerate(cases, 1):
+            try:
+                hasil = run_case(catalog, profil, params)
+            except ValueError as e:
+                print(f"error: case {i} ({profil}): {e}", file=sys.stderr)
+                gagal = True
+                continue
+            records = wf_lib.result_records(hasil)
+            ng = ng or any(STATUS_GAGAL in str(r.get("Keterangan", "")) for r in records)
+            if args.format == "table":
+                _tulis_tabel(out, profil, hasil)
+            elif args.format == "json":
+                semua.append({"case": i, "profil": profil, "params": params, "hasil": hasil})
+            else:
+                if writer is None:
+                    writer = csv.DictWriter(out, fieldnames=["case", "profil", *records[0].keys()])
+                    writer.writeheader()
+                for record in records:
+                    writer.writerow({"case": i, "profil": profil, **record})
+        if args.format == "json":
+            json.dump(semua, out, ensure_ascii=False, indent=2)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if gagal:
+        return 1
+    return 3 if ng and args.fail_on_ng else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
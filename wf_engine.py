@@ -0,0 +1,704 @@
+"""
+Pure-Python SNI 1729:2020 calculation engine for WF (wide flange) members.
+
+Computes the same limit states as the "WF" worksheet - axial tension, axial
+compression, major/minor axis flexure, shear and torsion - for both DFBT
+(LRFD) and DKI (ASD), and returns the result tables in the sheet layout
+(header row + value rows) so they can be passed straight to `tampilkan_hasil`.
+
+Internal units are N, mm and MPa. Results are reported in kN, kNm, mm and MPa.
+"""
+import functools
+import math
+import re
+import unicodedata
+
+from wf_penampang import complete
+
+E_BAJA = 200000.0  # MPa
+G_BAJA = 77200.0   # MPa
+
+KOLOM_HASIL = ["Kondisi", "Simbol", "Nilai", "Satuan", "Perlu", "Rasio", "Keterangan"]
+TIDAK_BERLAKU = "Tidak berlaku"
+
+KUNCI_HASIL = (
+    "tarik_dfbt", "tarik_dki",
+    "tekan_dfbt", "tekan_dki",
+    "momen_mayor_dfbt", "momen_mayor_dki",
+    "momen_minor_dfbt", "momen_minor_dki",
+    "geser_dfbt", "geser_dki",
+    "torsi_dfbt", "torsi_dki",
+)
+
+METODE = ("DFBT", "DKI")
+
+# Faktor ketahanan (phi) dan faktor keamanan (omega) per kondisi batas
+FAKTOR = {
+    "tarik_leleh": (0.90, 1.67),
+    "tarik_putus": (0.75, 2.00),
+    "tekan": (0.90, 1.67),
+    "lentur": (0.90, 1.67),
+    "geser_rolled": (1.00, 1.50),
+    "geser": (0.90, 1.67),
+    "torsi": (0.90, 1.67),
+}
+
+# ========== PARSING ANGKA DAN SATUAN ==========
+def parse_angka(val):
+    """Parse a sheet/form number that may use the Indonesian decimal comma."""
+    if val is None or isinstance(val, bool):
+        return None
+    if isinstance(val, (int, float)):
+        return float(val) if math.isfinite(val) else None
+    s = str(val).strip().replace(" ", "")
+    if not s or s == "-":
+        return None
+    if "," in s and "." in s:
+        # Separator yang muncul terakhir adalah desimal
+        if s.rfind(",") > s.rfind("."):
+            s = s.replace(".", "").replace(",", ".")
+        else:
+            s = s.replace(",", "")
+    else:
+        s = s.replace(",", ".")
+    try:
+        x = float(s)
+    except ValueError:
+        return None
+    return x if math.isfinite(x) else None
+
+
+def _teks(x, digit=4):
+    """Format a number the way the sheet returns it (decimal comma)."""
+    if x is None:
+        return "-"
+    if isinstance(x, str):
+        return x
+    if not math.isfinite(x):
+        return "-"
+    s = f"{x:.{digit}f}".rstrip("0").rstrip(".")
+    if s in ("", "-0"):
+        s = "0"
+    return s.replace(".", ",")
+
+
+def _normal(teks):
+    """Normalise a symbol/unit: unfold sub/superscripts, drop accents, spaces and dots."""
+    s = unicodedata.normalize("NFKD", str(teks or ""))
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return re.sub(r"[\s_.·\-]", "", s)
+
+
+def _pisah_satuan(satuan):
+    """Split a unit string into (multiplier, unit), e.g. 'x10³ mm³' -> (1000.0, 'mm3')."""
+    s = _normal(satuan).lower().replace("^", "").replace("**", "")
+    kali = 1.0
+    m = re.search(r"(?:^|[x×*])10([0-9]+)", s)
+    if m:
+        kali = 10.0 ** int(m.group(1))
+        s = s[:m.start()] + s[m.end():]
+    return kali, s.lstrip("x×*")
+
+
+_PANJANG = {"mm": 1.0, "cm": 10.0, "m": 1000.0}
+_TEGANGAN = {"mpa": 1.0, "n/mm2": 1.0, "gpa": 1000.0, "kpa": 1e-3,
+             "kg/cm2": 0.0980665, "kgf/cm2": 0.0980665, "ksi": 6.894757}
+_GAYA = {"n": 1.0, "kn": 1e3, "kg": 9.80665, "kgf": 9.80665,
+         "t": 9806.65, "ton": 9806.65, "tf": 9806.65}
+_MOMEN = {"nmm": 1.0, "knmm": 1e3, "nm": 1e3, "knm": 1e6, "kgcm": 98.0665,
+          "kgfcm": 98.0665, "kgm": 9806.65, "kgfm": 9806.65, "tm": 9.80665e6,
+          "tonm": 9.80665e6, "tfm": 9.80665e6}
+
+
+def _faktor_panjang(satuan, pangkat):
+    """Factor converting a value in `satuan` to mm^pangkat (blank unit = mm)."""
+    kali, unit = _pisah_satuan(satuan)
+    m = re.match(r"(mm|cm|m)(?![a-z])", unit) or re.match(r"(mm|cm|m)", unit)
+    dasar = _PANJANG[m.group(1)] if m else 1.0
+    return kali * dasar ** pangkat
+
+
+def _faktor_besaran(jenis, satuan):
+    """Factor converting a form value to the engine's internal units."""
+    if jenis is None:
+        return 1.0
+    if jenis == "panjang":
+        return _faktor_panjang(satuan, 1)
+    kali, unit = _pisah_satuan(satuan)
+    tabel, bawaan = {
+        "tegangan": (_TEGANGAN, "mpa"),
+        "gaya": (_GAYA, "kn"),
+        "momen": (_MOMEN, "knm"),
+    }[jenis]
+    return kali * tabel.get(unit, tabel[bawaan])
+
+
+# ========== PEMETAAN DATA SHEET ==========
+# Dimensi panjang setiap properti penampang (untuk konversi satuan ke mm)
+DIMENSI_PENAMPANG = {
+    "d": 1, "bf": 1, "tw": 1, "tf": 1, "r": 1, "h": 1, "ho": 1,
+    "rx": 1, "ry": 1, "rts": 1, "A": 2,
+    "Sx": 3, "Sy": 3, "Zx": 3, "Zy": 3,
+    "Ix": 4, "Iy": 4, "J": 4, "Cw": 6,
+}
+
+_SIMBOL_PENAMPANG = {
+    "H": "d", "d": "d", "D": "d", "B": "bf", "bf": "bf", "b": "bf",
+    "tw": "tw", "t1": "tw", "tf": "tf", "t2": "tf", "r": "r", "r0": "r",
+    "A": "A", "Ag": "A", "W": "W", "w": "W", "q": "W",
+    "Ix": "Ix", "Iy": "Iy", "rx": "rx", "ix": "rx", "ry": "ry", "iy": "ry",
+    "Sx": "Sx", "Sy": "Sy", "Zx": "Zx", "Zy": "Zy",
+    "J": "J", "It": "J", "Cw": "Cw", "Iw": "Cw",
+    "h": "h", "hw": "h", "ho": "ho", "h0": "ho", "rts": "rts",
+}
+
+
+def _kunci_penampang(parameter, simbol):
+    """Map one catalog column to a canonical section property key (or None)."""
+    nama = str(parameter or "").lower()
+    sim = _normal(simbol)
+    sumbu = "y" if sim.lower().endswith("y") or "minor" in nama else "x"
+    if "plastis" in nama:
+        return "Z" + sumbu
+    if "elastis" in nama and "modulus" in nama and "elastisitas" not in nama:
+        return "S" + sumbu
+    if sim in _SIMBOL_PENAMPANG:
+        return _SIMBOL_PENAMPANG[sim]
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _kolom_penampang(parameter, simbol, satuan):
+    """(column index, property key, factor to mm) of each section column of a catalog header."""
+    kolom = []
+    for j, (par, sim, sat) in enumerate(zip(parameter, simbol, satuan)):
+        kunci = _kunci_penampang(par, sim)
+        if kunci is None:
+            continue
+        dim = DIMENSI_PENAMPANG.get(kunci)
+        kolom.append((j, kunci, _faktor_panjang(sat, dim) if dim else 1.0))
+    return tuple(kolom)
+
+
+def section_from_catalog(parameter, simbol, satuan, nilai):
+    """Build a section property dict (mm units) from one "Tabel WF" row."""
+    p = {}
+    for j, kunci, faktor in _kolom_penampang(tuple(parameter), tuple(simbol), tuple(satuan)):
+        x = parse_angka(nilai[j]) if j < len(nilai) and kunci not in p else None
+        if x is not None:
+            p[kunci] = x * faktor if faktor != 1.0 else x
+    return p
+
+
+def section_to_catalog(parameter, simbol, satuan, section):
+    """Inverse of section_from_catalog: one "Tabel WF" row (catalog units) from section properties in mm."""
+    nilai = [None] * len(parameter)
+    for j, kunci, faktor in _kolom_penampang(tuple(parameter), tuple(simbol), tuple(satuan)):
+        x = section.get(kunci)
+        if x is not None:
+            nilai[j] = x / faktor if faktor != 1.0 else x
+    return nilai
+
+
+# Kunci input: (jenis besaran, kata kunci parameter)
+_INPUT_FIELDS = [
+    ("fy", "tegangan", ("tegangan leleh", "kuat leleh", "leleh")),
+    ("fu", "tegangan", ("tegangan tarik", "tegangan putus", "tegangan ultimit")),
+    ("E", "tegangan", ("elastisitas",)),
+    ("Lb", "panjang", ("tak terkekang", "tidak terkekang", "terkekang lateral", "bentang lateral")),
+    ("K", None, ("panjang efektif", "faktor panjang", "faktor tekuk")),
+    ("Cb", None, ("modifikasi momen", "momen seragam")),
+    ("L", "panjang", ("panjang",)),
+    ("Tu", "momen", ("torsi", "puntir")),
+    ("Nt", "gaya", ("aksial tarik", "gaya tarik")),
+    ("Nc", "gaya", ("aksial tekan", "gaya tekan")),
+    ("N", "gaya", ("aksial",)),
+    ("Muy", "momen", ("momen minor", "sumbu lemah", "sumbu y", "arah y")),
+    ("Mux", "momen", ("momen",)),
+    ("Vu", "gaya", ("geser",)),
+]
+_JENIS_INPUT = {kunci: jenis for kunci, jenis, _ in _INPUT_FIELDS}
+INPUT_KEYS = tuple(_JENIS_INPUT)
+_SIMBOL_INPUT = {
+    "fy": "fy", "fu": "fu", "e": "E", "es": "E", "l": "L", "k": "K",
+    "lb": "Lb", "cb": "Cb", "nu": "N", "pu": "N", "p": "N",
+    "mux": "Mux", "mx": "Mux", "mu": "Mux", "muy": "Muy", "my": "Muy",
+    "vu": "Vu", "v": "Vu", "tu": "Tu",
+}
+
+_SENDI_FIELDS = [
+    ("dh", "panjang", ("diameter lubang",)),
+    ("db", "panjang", ("diameter",)),
+    ("n", None, ("jumlah",)),
+    ("t", "panjang", ("tebal",)),
+    ("U", None, ("shear lag", "faktor u")),
+    ("xbar", "panjang", ("eksentrisitas",)),
+    ("l", "panjang", ("panjang",)),
+]
+_JENIS_SENDI = {kunci: jenis for kunci, jenis, _ in _SENDI_FIELDS}
+SENDI_KEYS = tuple(_JENIS_SENDI)
+_SIMBOL_SENDI = {
+    "db": "db", "d": "db", "dh": "dh", "n": "n", "nb": "n", "t": "t",
+    "tp": "t", "u": "U", "x": "xbar", "l": "l", "lc": "l",
+}
+
+
+def _kunci_form(parameter, simbol, fields, simbol_map):
+    nama = str(parameter or "").lower()
+    for kunci, _, kata in fields:
+        if any(k in nama for k in kata):
+            return kunci
+    return simbol_map.get(_normal(simbol).lower())
+
+
+def _baca_form(template_rows, values, fields, simbol_map, jenis_map):
+    hasil = {}
+    for row, val in zip(template_rows, values):
+        parameter, simbol = row[0], row[1]
+        satuan = row[3] if len(row) > 3 else ""
+        kunci = _kunci_form(parameter, simbol, fields, simbol_map)
+        x = parse_angka(val)
+        if kunci is None or x is None or kunci in hasil:
+            continue
+        hasil[kunci] = x * _faktor_besaran(jenis_map[kunci], satuan)
+    return hasil
+
+
+def input_keys(template_rows):
+    """Engine input key of each form row (None for rows the engine does not use)."""
+    return [_kunci_form(row[0], row[1], _INPUT_FIELDS, _SIMBOL_INPUT) for row in template_rows]
+
+
+def sendi_keys(template_rows):
+    """Joint parameter key of each joint form row (None for unused rows)."""
+    return [_kunci_form(row[0], row[1], _SENDI_FIELDS, _SIMBOL_SENDI) for row in template_rows]
+
+
+def inputs_from_form(template_rows, values):
+    """Map `input_parameter_struktur` values to engine inputs (N, mm, MPa)."""
+    return _baca_form(template_rows, values, _INPUT_FIELDS, _SIMBOL_INPUT, _JENIS_INPUT)
+
+
+def sendi_from_form(template_rows, values):
+    """Map `input_parameter_sendi` values to joint/net-section parameters."""
+    return _baca_form(template_rows, values, _SENDI_FIELDS, _SIMBOL_SENDI, _JENIS_SENDI)
+
+
+# ========== NORMALISASI MASUKAN ==========
+def normalize_inputs(inputs):
+    """Apply defaults and validate engine inputs."""
+    q = dict(inputs)
+    for kunci, nama in (("fy", "Fy"), ("fu", "Fu")):
+        if not q.get(kunci) or q[kunci] <= 0:
+            raise ValueError(f"Nilai {nama} harus lebih besar dari 0")
+    q["E"] = q.get("E") or E_BAJA
+    q["G"] = q.get("G") or G_BAJA
+    q["L"] = abs(q.get("L") or 0.0)
+    q["Lb"] = abs(q["Lb"]) if q.get("Lb") is not None else q["L"]
+    # Nilai 0 berarti "tidak ditinjau" -> pakai nilai standar
+    q["K"] = q.get("K") or 1.0
+    q["Cb"] = q.get("Cb") or 1.0
+    aksial = abs(q.get("N") or 0.0)
+    q["Nt"] = abs(q["Nt"]) if q.get("Nt") is not None else aksial
+    q["Nc"] = abs(q["Nc"]) if q.get("Nc") is not None else aksial
+    for kunci in ("Mux", "Muy", "Vu", "Tu"):
+        q[kunci] = abs(q.get(kunci) or 0.0)
+    return q
+
+
+# ========== PEMBANTU BARIS HASIL ==========
+def _desain(rn, faktor, metode):
+    """Design (DFBT) or allowable (DKI) strength from a nominal strength."""
+    if rn is None:
+        return None
+    phi, omega = faktor
+    return rn * phi if metode == "DFBT" else rn / omega
+
+
+def _simbol(nominal, metode, indeks=""):
+    return f"φ{indeks}{nominal}" if metode == "DFBT" else f"{nominal}/Ω{indeks}"
+
+
+def _rasio(perlu, kapasitas):
+    if kapasitas is None:
+        return None
+    if kapasitas <= 0:
+        return 0.0 if perlu == 0 else math.inf
+    return perlu / kapasitas
+
+
+def _baris_info(kondisi, simbol, nilai, satuan):
+    return [kondisi, simbol, _teks(nilai), satuan, "-", "-", "-"]
+
+
+def _baris_cek(kondisi, simbol, kapasitas, satuan, perlu):
+    """Capacity row; `kapasitas=None` marks the limit state as not applicable."""
+    if kapasitas is None:
+        return [kondisi, simbol, "-", satuan, "-", "-", TIDAK_BERLAKU]
+    rasio = _rasio(perlu, kapasitas)
+    status = "OK" if rasio <= 1.0 else "TIDAK OK"
+    return [kondisi, simbol, _teks(kapasitas), satuan, _teks(perlu), _teks(rasio), status]
+
+
+def _baris_kelas(kondisi, simbol, lamda, batas, kelas):
+    return [kondisi, simbol, _teks(batas), "-", _teks(lamda), _teks(_rasio(lamda, batas)), kelas]
+
+
+def _kelas(lamda, lamda_p, lamda_r):
+    if lamda <= lamda_p:
+        return "Kompak"
+    return "Nonkompak" if lamda <= lamda_r else "Langsing"
+
+
+def _kn(x):
+    return None if x is None else x / 1e3
+
+
+def _knm(x):
+    return None if x is None else x / 1e6
+
+
+# ========== AKSIAL TARIK (BAB D) ==========
+def tension_nominal(p, q, sendi=None):
+    """Nominal tensile strengths (N): gross yielding and net-section rupture."""
+    hasil = {"Pn_leleh": q["fy"] * p["A"], "Pn_putus": None, "Ae": None, "U": None}
+    if sendi:
+        db = sendi.get("db", 0.0)
+        dh = sendi.get("dh") or (db + (2.0 if db <= 22 else 3.0) if db else 0.0)
+        n = sendi.get("n", 0.0)
+        t = sendi.get("t") or p["tf"]
+        # Lebar lubang ditambah 2 mm untuk perhitungan luas neto (SNI 1729 Pasal B4.3b)
+        an = p["A"] - n * (dh + 2.0) * t if dh else p["A"]
+        u = sendi.get("U")
+        if not u:
+            xbar, panjang = sendi.get("xbar", 0.0), sendi.get("l", 0.0)
+            u = 1.0 - xbar / panjang if panjang > 0 else 1.0
+        u = min(max(u, 0.0), 1.0)
+        hasil["U"] = u
+        hasil["Ae"] = max(u * an, 0.0)
+        hasil["Pn_putus"] = q["fu"] * hasil["Ae"]
+    return hasil
+
+
+def _tarik(p, q, sendi):
+    nom = tension_nominal(p, q, sendi)
+    kl_r = q["L"] / min(p["rx"], p["ry"])
+    hasil = {}
+    for metode in METODE:
+        leleh = _desain(nom["Pn_leleh"], FAKTOR["tarik_leleh"], metode)
+        putus = _desain(nom["Pn_putus"], FAKTOR["tarik_putus"], metode)
+        desain = min(x for x in (leleh, putus) if x is not None)
+        hasil[metode] = [
+            _baris_cek("Leleh tarik pada penampang bruto", _simbol("Pn", metode, "t"),
+                       _kn(leleh), "kN", _kn(q["Nt"])),
+            _baris_cek("Keruntuhan tarik pada penampang neto efektif", _simbol("Pn", metode, "t"),
+                       _kn(putus), "kN", _kn(q["Nt"])),
+            # Batas kelangsingan hanya berlaku bila batang memikul gaya tarik
+            _baris_cek("Batas kelangsingan batang tarik (L/r ≤ 300)", "L/r", 300.0 if q["Nt"] else None, "-", kl_r),
+            _baris_cek("Kuat tarik desain", _simbol("Pn", metode, "t"), _kn(desain), "kN", _kn(q["Nt"])),
+        ]
+    return hasil
+
+
+# ========== AKSIAL TEKAN (BAB E) ==========
+def compression_nominal(p, q):
+    """Nominal compressive strength (N) incl. flexural/torsional buckling and slender elements."""
+    fy, e, g = q["fy"], q["E"], q["G"]
+    lc = q["K"] * q["L"]
+    kl_r = max(lc / p["rx"], lc / p["ry"])
+    lamda_f, lamda_w = p["bf"] / (2 * p["tf"]), p["h"] / p["tw"]
+    lamda_rf, lamda_rw = 0.56 * math.sqrt(e / fy), 1.49 * math.sqrt(e / fy)
+
+    if lc > 0:
+        fe_lentur = math.pi ** 2 * e / kl_r ** 2
+        fe_torsi = (math.pi ** 2 * e * p["Cw"] / lc ** 2 + g * p["J"]) / (p["Ix"] + p["Iy"])
+        fe = min(fe_lentur, fe_torsi)
+        fcr = 0.658 ** (fy / fe) * fy if fy / fe <= 2.25 else 0.877 * fe
+    else:
+        fcr = fy
+
+    # Luas efektif elemen langsing (SNI 1729 Pasal E7)
+    ae = p["A"]
+    for lamda, lamda_r, lebar, tebal, jumlah, c1 in (
+        (lamda_f, lamda_rf, p["bf"] / 2, p["tf"], 4, 0.22),
+        (lamda_w, lamda_rw, p["h"], p["tw"], 1, 0.18),
+    ):
+        if lamda > lamda_r * math.sqrt(fy / fcr):
+            c2 = (1 - math.sqrt(1 - 4 * c1)) / (2 * c1)
+            fel = (c2 * lamda_r / lamda) ** 2 * fy
+            akar = math.sqrt(fel / fcr)
+            be = lebar * (1 - c1 * akar) * akar
+            ae -= jumlah * max(lebar - be, 0.0) * tebal
+
+    return {
+        "lamda_f": lamda_f, "lamda_rf": lamda_rf,
+        "lamda_w": lamda_w, "lamda_rw": lamda_rw,
+        "kl_r": kl_r, "Fcr": fcr, "Ae": ae, "Pn": fcr * ae,
+    }
+
+
+def _tekan(p, q, sendi):
+    nom = compression_nominal(p, q)
+    kelas_f = "Nonlangsing" if nom["lamda_f"] <= nom["lamda_rf"] else "Langsing"
+    kelas_w = "Nonlangsing" if nom["lamda_w"] <= nom["lamda_rw"] else "Langsing"
+    hasil = {}
+    for metode in METODE:
+        hasil[metode] = [
+            _baris_kelas("Kelangsingan sayap (tekan)", "bf/2tf", nom["lamda_f"], nom["lamda_rf"], kelas_f),
+            _baris_kelas("Kelangsingan badan (tekan)", "h/tw", nom["lamda_w"], nom["lamda_rw"], kelas_w),
+            _baris_cek("Batas kelangsingan batang tekan (KL/r ≤ 200)", "KL/r", 200.0 if q["Nc"] else None, "-",
+                       nom["kl_r"]),
+            _baris_info("Tegangan kritis", "Fcr", nom["Fcr"], "MPa"),
+            _baris_cek("Kuat tekan desain", _simbol("Pn", metode, "c"),
+                       _kn(_desain(nom["Pn"], FAKTOR["tekan"], metode)), "kN", _kn(q["Nc"])),
+        ]
+    return hasil
+
+
+# ========== LENTUR SUMBU MAYOR (BAB F2-F5) ==========
+def _interpolasi(m_atas, m_bawah, x, x_p, x_r):
+    return m_atas - (m_atas - m_bawah) * (x - x_p) / (x_r - x_p)
+
+
+def flexure_major_nominal(p, q):
+    """Nominal major-axis flexural strengths (N·mm) per SNI 1729 F2-F5."""
+    fy, e = q["fy"], q["E"]
+    lb, cb = q["Lb"], q["Cb"]
+    sx, ho = p["Sx"], p["ho"]
+    akar = math.sqrt(e / fy)
+    lamda_f, lamda_pf, lamda_rf = p["bf"] / (2 * p["tf"]), 0.38 * akar, 1.0 * akar
+    lamda_w, lamda_pw, lamda_rw = p["h"] / p["tw"], 3.76 * akar, 5.70 * akar
+    kelas_f = _kelas(lamda_f, lamda_pf, lamda_rf)
+    kelas_w = _kelas(lamda_w, lamda_pw, lamda_rw)
+    mp = fy * p["Zx"]
+    kc = min(max(4 / math.sqrt(lamda_w), 0.35), 0.76)
+    hasil = {
+        "lamda_f": lamda_f, "lamda_pf": lamda_pf, "lamda_rf": lamda_rf, "kelas_f": kelas_f,
+        "lamda_w": lamda_w, "lamda_pw": lamda_pw, "lamda_rw": lamda_rw, "kelas_w": kelas_w,
+        "Mp": mp, "Mn_ltb": None, "Mn_flb": None,
+    }
+
+    if kelas_w == "Kompak":
+        # F2 dan F3: badan kompak
+        rts = p["rts"]
+        jc = p["J"] / (sx * ho)
+        lp = 1.76 * p["ry"] * akar
+        lr = 1.95 * rts * e / (0.7 * fy) * math.sqrt(jc + math.sqrt(jc ** 2 + 6.76 * (0.7 * fy / e) ** 2))
+        m_leleh = mp
+        if lb > lr:
+            fcr = cb * math.pi ** 2 * e / (lb / rts) ** 2 * math.sqrt(1 + 0.078 * jc * (lb / rts) ** 2)
+            hasil["Mn_ltb"] = min(fcr * sx, mp)
+        elif lb > lp:
+            hasil["Mn_ltb"] = min(cb * _interpolasi(mp, 0.7 * fy * sx, lb, lp, lr), mp)
+        if kelas_f == "Nonkompak":
+            hasil["Mn_flb"] = _interpolasi(mp, 0.7 * fy * sx, lamda_f, lamda_pf, lamda_rf)
+        elif kelas_f == "Langsing":
+            hasil["Mn_flb"] = 0.9 * e * kc * sx / lamda_f ** 2
+    else:
+        aw = p["h"] * p["tw"] / (p["bf"] * p["tf"])
+        rt = p["bf"] / math.sqrt(12 * (1 + aw / 6))
+        lp = 1.1 * rt * akar
+        myc = fy * sx
+        if kelas_w == "Nonkompak":
+            # F4: badan nonkompak, profil simetris ganda (Sxt = Sxc)
+            rpc = min(_interpolasi(mp / myc, 1.0, lamda_w, lamda_pw, lamda_rw), mp / myc)
+            fl = 0.7 * fy
+            jc = p["J"] / (sx * ho)
+            lr = 1.95 * rt * e / fl * math.sqrt(jc + math.sqrt(jc ** 2 + 6.76 * (fl / e) ** 2))
+            m_leleh = rpc * myc
+            if lb > lr:
+                fcr = cb * math.pi ** 2 * e / (lb / rt) ** 2 * math.sqrt(1 + 0.078 * jc * (lb / rt) ** 2)
+                hasil["Mn_ltb"] = min(fcr * sx, m_leleh)
+            elif lb > lp:
+                hasil["Mn_ltb"] = min(cb * _interpolasi(m_leleh, fl * sx, lb, lp, lr), m_leleh)
+            if kelas_f == "Nonkompak":
+                hasil["Mn_flb"] = _interpolasi(m_leleh, fl * sx, lamda_f, lamda_pf, lamda_rf)
+            elif kelas_f == "Langsing":
+                hasil["Mn_flb"] = 0.9 * e * kc * sx / lamda_f ** 2
+        else:
+            # F5: badan langsing
+            rpg = min(1 - min(aw, 10) / (1200 + 300 * min(aw, 10)) * (lamda_w - lamda_rw), 1.0)
+            lr = math.pi * rt * math.sqrt(e / (0.7 * fy))
+            m_leleh = rpg * myc
+            if lb > lr:
+                hasil["Mn_ltb"] = rpg * min(cb * math.pi ** 2 * e / (lb / rt) ** 2, fy) * sx
+            elif lb > lp:
+                hasil["Mn_ltb"] = rpg * min(cb * _interpolasi(fy, 0.7 * fy, lb, lp, lr), fy) * sx
+            if kelas_f == "Nonkompak":
+                hasil["Mn_flb"] = rpg * _interpolasi(fy, 0.7 * fy, lamda_f, lamda_pf, lamda_rf) * sx
+            elif kelas_f == "Langsing":
+                hasil["Mn_flb"] = rpg * 0.9 * e * kc / lamda_f ** 2 * sx
+
+    hasil.update({"Lp": lp, "Lr": lr, "Mn_leleh": m_leleh})
+    hasil["Mn"] = min(x for x in (m_leleh, hasil["Mn_ltb"], hasil["Mn_flb"]) if x is not None)
+    return hasil
+
+
+def _momen_mayor(p, q, sendi):
+    nom = flexure_major_nominal(p, q)
+    faktor = FAKTOR["lentur"]
+    hasil = {}
+    for metode in METODE:
+        sim = _simbol("Mn", metode, "b")
+        hasil[metode] = [
+            _baris_kelas("Kelangsingan sayap (lentur)", "bf/2tf", nom["lamda_f"], nom["lamda_pf"], nom["kelas_f"]),
+            _baris_kelas("Kelangsingan badan (lentur)", "h/tw", nom["lamda_w"], nom["lamda_pw"], nom["kelas_w"]),
+            _baris_info("Momen plastis", "Mp", _knm(nom["Mp"]), "kNm"),
+            _baris_info("Panjang batas kondisi plastis", "Lp", nom["Lp"], "mm"),
+            _baris_info("Panjang batas tekuk torsi lateral inelastis", "Lr", nom["Lr"], "mm"),
+            _baris_info("Panjang tak terkekang lateral", "Lb", q["Lb"], "mm"),
+            _baris_info("Faktor modifikasi momen", "Cb", q["Cb"], "-"),
+            _baris_cek("Leleh", sim, _knm(_desain(nom["Mn_leleh"], faktor, metode)), "kNm", _knm(q["Mux"])),
+            _baris_cek("Tekuk torsi lateral", sim, _knm(_desain(nom["Mn_ltb"], faktor, metode)), "kNm", _knm(q["Mux"])),
+            _baris_cek("Tekuk lokal sayap tekan", sim, _knm(_desain(nom["Mn_flb"], faktor, metode)), "kNm", _knm(q["Mux"])),
+            _baris_cek("Kuat lentur desain sumbu mayor", sim, _knm(_desain(nom["Mn"], faktor, metode)), "kNm", _knm(q["Mux"])),
+        ]
+    return hasil
+
+
+# ========== LENTUR SUMBU MINOR (BAB F6) ==========
+def flexure_minor_nominal(p, q):
+    """Nominal minor-axis flexural strengths (N·mm) per SNI 1729 F6."""
+    fy, e = q["fy"], q["E"]
+    akar = math.sqrt(e / fy)
+    lamda_f, lamda_pf, lamda_rf = p["bf"] / (2 * p["tf"]), 0.38 * akar, 1.0 * akar
+    mp = min(fy * p["Zy"], 1.6 * fy * p["Sy"])
+    kelas_f = _kelas(lamda_f, lamda_pf, lamda_rf)
+    m_flb = None
+    if kelas_f == "Nonkompak":
+        m_flb = _interpolasi(mp, 0.7 * fy * p["Sy"], lamda_f, lamda_pf, lamda_rf)
+    elif kelas_f == "Langsing":
+        m_flb = 0.69 * e / lamda_f ** 2 * p["Sy"]
+    return {"kelas_f": kelas_f, "Mn_leleh": mp, "Mn_flb": m_flb,
+            "Mn": mp if m_flb is None else min(mp, m_flb)}
+
+
+def _momen_minor(p, q, sendi):
+    nom = flexure_minor_nominal(p, q)
+    faktor = FAKTOR["lentur"]
+    hasil = {}
+    for metode in METODE:
+        sim = _simbol("Mny", metode, "b")
+        hasil[metode] = [
+            _baris_cek("Leleh", sim, _knm(_desain(nom["Mn_leleh"], faktor, metode)), "kNm", _knm(q["Muy"])),
+            _baris_cek("Tekuk lokal sayap", sim, _knm(_desain(nom["Mn_flb"], faktor, metode)), "kNm", _knm(q["Muy"])),
+            _baris_cek("Kuat lentur desain sumbu minor", sim, _knm(_desain(nom["Mn"], faktor, metode)), "kNm", _knm(q["Muy"])),
+        ]
+    return hasil
+
+
+# ========== GESER (BAB G) ==========
+def shear_nominal(p, q):
+    """Nominal web shear strength (N) per SNI 1729 G2.1."""
+    fy, e = q["fy"], q["E"]
+    h_tw = p["h"] / p["tw"]
+    if h_tw <= 2.24 * math.sqrt(e / fy):
+        cv1, faktor = 1.0, FAKTOR["geser_rolled"]
+    else:
+        kv = 5.34
+        batas = 1.10 * math.sqrt(kv * e / fy)
+        cv1 = 1.0 if h_tw <= batas else batas / h_tw
+        faktor = FAKTOR["geser"]
+    return {"Cv1": cv1, "Vn": 0.6 * fy * p["d"] * p["tw"] * cv1, "faktor": faktor}
+
+
+def _geser(p, q, sendi):
+    nom = shear_nominal(p, q)
+    hasil = {}
+    for metode in METODE:
+        hasil[metode] = [
+            _baris_info("Koefisien tekuk geser badan", "Cv1", nom["Cv1"], "-"),
+            _baris_cek("Kuat geser desain", _simbol("Vn", metode, "v"),
+                       _kn(_desain(nom["Vn"], nom["faktor"], metode)), "kN", _kn(q["Vu"])),
+        ]
+    return hasil
+
+
+# ========== TORSI ==========
+def torsion_nominal(p, q):
+    """Nominal St. Venant torsional strength (N·mm) of the open section."""
+    t_maks = max(p["tf"], p["tw"])
+    tau_n = 0.6 * q["fy"]
+    return {"t_maks": t_maks, "tau_n": tau_n, "Tn": tau_n * p["J"] / t_maks}
+
+
+def _torsi(p, q, sendi):
+    nom = torsion_nominal(p, q)
+    geser = shear_nominal(p, q)
+    tau_u = q["Tu"] * nom["t_maks"] / p["J"]
+    hasil = {}
+    for metode in METODE:
+        tn = _desain(nom["Tn"], FAKTOR["torsi"], metode)
+        vn = _desain(geser["Vn"], geser["faktor"], metode)
+        interaksi = _rasio(q["Vu"], vn) + _rasio(q["Tu"], tn)
+        hasil[metode] = [
+            _baris_cek("Tegangan geser akibat torsi St. Venant", _simbol("τn", metode),
+                       _desain(nom["tau_n"], FAKTOR["torsi"], metode), "MPa", tau_u),
+            _baris_cek("Kuat torsi desain", _simbol("Tn", metode), _knm(tn), "kNm", _knm(q["Tu"])),
+            _baris_cek("Interaksi geser dan torsi", "Vu/Vc + Tu/Tc", 1.0, "-", interaksi),
+        ]
+    return hasil
+
+
+# ========== API UTAMA ==========
+KELOMPOK = (
+    ("tarik", _tarik),
+    ("tekan", _tekan),
+    ("momen_mayor", _momen_mayor),
+    ("momen_minor", _momen_minor),
+    ("geser", _geser),
+    ("torsi", _torsi),
+)
+
+# Masukan (setelah normalize_inputs) dan properti penampang (setelah wf_penampang.complete)
+# yang dibaca setiap kelompok; "sendi" menandai kelompok yang memakai data sambungan.
+# Ubah bersama fungsinya: kelompok yang masukannya tidak berubah tidak dihitung ulang.
+GANTUNGAN = {
+    "tarik": {"input": ("fy", "fu", "L", "Nt"), "penampang": ("A", "tf", "rx", "ry"), "sendi": True},
+    "tekan": {"input": ("fy", "E", "G", "K", "L", "Nc"),
+              "penampang": ("A", "bf", "tf", "h", "tw", "rx", "ry", "Ix", "Iy", "J", "Cw"), "sendi": False},
+    "momen_mayor": {"input": ("fy", "E", "Lb", "Cb", "Mux"),
+                    "penampang": ("bf", "tf", "h", "tw", "ry", "Sx", "Zx", "J", "ho", "rts"), "sendi": False},
+    "momen_minor": {"input": ("fy", "E", "Muy"), "penampang": ("bf", "tf", "Sy", "Zy"), "sendi": False},
+    "geser": {"input": ("fy", "E", "Vu"), "penampang": ("d", "h", "tw"), "sendi": False},
+    "torsi": {"input": ("fy", "E", "Vu", "Tu"), "penampang": ("d", "h", "tw", "tf", "J"), "sendi": False},
+}
+
+
+def result_keys(kelompok):
+    """Result keys ("tarik_dfbt", ...) of the named groups, in KUNCI_HASIL order."""
+    return [key for key in KUNCI_HASIL if key.rsplit("_", 1)[0] in kelompok]
+
+
+def affected_groups(lama, baru):
+    """
+    Names of the groups whose declared inputs differ between two requests, each
+    given as (section, inputs, sendi). Invalid requests raise ValueError.
+    """
+    (p_lama, q_lama, s_lama), (p, q, s) = [
+        (complete(section), normalize_inputs(inputs), sendi or None) for section, inputs, sendi in (lama, baru)
+    ]
+    return [
+        nama for nama, _ in KELOMPOK
+        if any(q_lama.get(k) != q.get(k) for k in GANTUNGAN[nama]["input"])
+        or any(p_lama.get(k) != p.get(k) for k in GANTUNGAN[nama]["penampang"])
+        or (GANTUNGAN[nama]["sendi"] and s_lama != s)
+    ]
+
+
+def calculate_wf(section, inputs, sendi=None, kelompok=None):
+    """
+    Run every limit state and return result tables keyed like the sheet ranges
+    ("tarik_dfbt", ..., "torsi_dki"), each as [header] + rows of strings.
+    `sendi` is None when the member has no bolted joint (status sendi "Tidak").
+    With `kelompok` only the named groups (see KELOMPOK) are computed.
+    """
+    p = complete(section)
+    q = normalize_inputs(inputs)
+    hasil = {}
+    for nama, fungsi in KELOMPOK:
+        if kelompok is not None and nama not in kelompok:
+            continue
+        for metode, rows in fungsi(p, q, sendi).items():
+            hasil[f"{nama}_{metode.lower()}"] = [list(KOLOM_HASIL)] + rows
+    return hasil
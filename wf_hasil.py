@@ -0,0 +1,102 @@
+"""
+Typed post-processing of calculation results.
+
+A result range (from `wf_engine.calculate_wf` or the "WF" sheet) is a list of
+rows of strings, header first. `parse_hasil` parses it once into a
+`TabelHasil`: numeric columns become float64 (Indonesian decimal comma
+handled the same way as `wf_engine.parse_angka`), the status column is kept
+as text and rows marked "Tidak berlaku" are flagged in a boolean mask.
+Formatting and filtering for display then work on whole columns.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from wf_engine import TIDAK_BERLAKU
+
+# Sel yang dianggap kosong pada kolom angka
+KOSONG = ("", "-")
+
+TabelHasil = namedtuple("TabelHasil", [
+    "data",            # DataFrame: kolom angka float64 (NaN bila kosong), kolom lain teks
+    "teks",            # DataFrame teks asli (sudah di-strip), untuk sel yang bukan angka
+    "angka",           # nama kolom angka
+    "status",          # kolom status / keterangan (teks), kolom terakhir
+    "tidak_berlaku",   # mask baris "Tidak berlaku" (numpy bool)
+])
+
+
+def _angka_kolom(teks):
+    """Vectorised parse_angka: Series of strings -> float64 Series, NaN when not a number"""
+    s = teks.str.replace(" ", "", regex=False)
+    koma = s.str.rfind(",")
+    titik = s.str.rfind(".")
+    # Bila kedua pemisah muncul, yang terakhir adalah desimal
+    desimal_koma = (koma > titik) & (titik >= 0)
+    desimal_titik = (titik > koma) & (koma >= 0)
+    s = s.mask(desimal_koma, s.str.replace(".", "", regex=False))
+    s = s.mask(desimal_titik, s.str.replace(",", "", regex=False))
+    s = s.str.replace(",", ".", regex=False)
+    x = pd.to_numeric(s, errors="coerce").astype("float64")
+    return x.where(np.isfinite(x))
+
+
+def parse_hasil(result_range):
+    """Parse a raw result range (header + rows) into a TabelHasil, or None when it has no rows"""
+    if not result_range or len(result_range) < 2:
+        return None
+    header = [str(h) for h in result_range[0]]
+    lebar = len(header)
+    rows = [list(row[:lebar]) + [""] * (lebar - len(row)) for row in result_range[1:]]
+    teks = pd.DataFrame(rows, columns=header, dtype=object).fillna("").astype(str)
+    teks = teks.apply(lambda kolom: kolom.str.strip())
+
+    tidak_berlaku = np.zeros(len(teks), dtype=bool)
+    for nama in teks.columns:
+        tidak_berlaku |= teks[nama].str.contains(TIDAK_BERLAKU, regex=False).to_numpy()
+
+    data = {}
+    angka = []
+    for j, nama in enumerate(header):
+        kolom = teks.iloc[:, j]
+        x = _angka_kolom(kolom)
+        # Kolom angka: setiap sel berisi angka, kosong, atau hanya pada baris "Tidak berlaku"
+        if x.notna().any() and (x.notna() | kolom.isin(KOSONG) | tidak_berlaku).all():
+            data[nama] = x
+            angka.append(nama)
+        else:
+            data[nama] = kolom
+    status = teks.iloc[:, -1] if lebar else pd.Series([], dtype=str)
+    return TabelHasil(pd.DataFrame(data), teks, tuple(angka), status, tidak_berlaku)
+
+
+def parse_semua_hasil(hasil):
+    """Parse every result range of a calculation: key -> TabelHasil (or None)"""
+    return {key: parse_hasil(result_range) for key, result_range in hasil.items()}
+
+
+def format_kolom(x, teks):
+    """Display strings for a float Series: integers without decimals, others with two; other cells keep `teks`"""
+    nilai = x.to_numpy(dtype="float64")
+    ada = ~np.isnan(nilai)
+    bulat = ada & (nilai == np.trunc(nilai)) & (np.abs(nilai) < 1e15)
+    hasil = teks.to_numpy(dtype=object).copy()
+    hasil[bulat] = nilai[bulat].astype(np.int64).astype(str)
+    desimal = ada & ~bulat
+    hasil[desimal] = np.char.mod("%.2f", nilai[desimal])
+    return pd.Series(hasil, index=x.index, dtype=object)
+
+
+def tabel_tampilan(tabel):
+    """Rows that apply, with numeric columns formatted for display"""
+    berlaku = ~tabel.tidak_berlaku
+    data = tabel.data.loc[berlaku]
+    teks = tabel.teks.loc[berlaku]
+    tampil = {}
+    for nama in data.columns:
+        if nama in tabel.angka:
+            tampil[nama] = format_kolom(data[nama], teks[nama])
+        else:
+            tampil[nama] = data[nama]
+    return pd.DataFrame(tampil, index=data.index).reset_index(drop=True)
@@ -0,0 +1,108 @@
+"""
+Background calculation jobs.
+
+The page submits a calculation as a job and gets a job id back immediately;
+a fixed pool of worker threads runs the jobs and records status, progress
+and the result in a process-wide store. Sessions poll the store by id, so a
+rerun (or a browser refresh that keeps the id in the URL) picks the job up
+where it is, and the number of concurrent calculations is bounded by the
+worker count rather than by open tabs.
+
+Jobs submitted with a `key` are coalesced: while a job with that key is
+queued or running, identical submissions get its id instead of a new job,
+so a burst of identical requests costs one calculation.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ANTRI = "antri"
+BERJALAN = "berjalan"
+SELESAI = "selesai"
+GAGAL = "gagal"
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Worker pool plus an in-memory job store; finished jobs are kept for `retain` seconds"""
+
+    def __init__(self, workers=4, retain=3600.0):
+        self.workers = workers
+        self.retain = retain
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wf-job")
+        self._jobs = {}
+        self._inflight = {}  # key -> job_id yang masih antri/berjalan
+        self.coalesced = 0
+        self._lock = threading.Lock()
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _prune(self, now):
+        lama = [job_id for job_id, job in self._jobs.items()
+                if job["finished"] is not None and now - job["finished"] > self.retain]
+        for job_id in lama:
+            del self._jobs[job_id]
+
+    def submit(self, func, *args, label=None, key=None, **kwargs):
+        """
+        Queue `func(progress, *args, **kwargs)` and return its job id. `progress(percent, text)`
+        updates the job record; `func` returns (result, notes). With `key`, an identical job
+        already in flight is joined instead.
+        """
+        job_id = uuid.uuid4().hex[:16]
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            if key is not None and key in self._inflight:
+                self.coalesced += 1
+                return self._inflight[key]
+            if key is not None:
+                self._inflight[key] = job_id
+            self._jobs[job_id] = {
+                "id": job_id, "label": label, "status": ANTRI, "progress": 0, "pesan": "Menunggu worker...",
+                "hasil": None, "catatan": [], "error": None,
+                "created": now, "started": None, "finished": None,
+            }
+
+        def progress(percent, text=None):
+            fields = {"progress": int(percent)}
+            if text is not None:
+                fields["pesan"] = text
+            self._update(job_id, **fields)
+
+        def run():
+            self._update(job_id, status=BERJALAN, started=time.time(), pesan="Menghitung...")
+            try:
+                hasil, catatan = func(progress, *args, **kwargs)
+            except Exception as e:
+                logger.exception("job %s failed", key if key is not None else job_id)
+                fields = {"status": GAGAL, "error": str(e)}
+            else:
+                fields = {"status": SELESAI, "hasil": hasil, "catatan": list(catatan),
+                          "progress": 100, "pesan": "Selesai"}
+            with self._lock:
+                self._jobs[job_id].update(fields, finished=time.time())
+                if key is not None and self._inflight.get(key) == job_id:
+                    del self._inflight[key]
+
+        self._executor.submit(run)
+        return job_id
+
+    def get(self, job_id):
+        """Copy of the job record, or None when the id is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def stats(self):
+        with self._lock:
+            status = [job["status"] for job in self._jobs.values()]
+        return {"workers": self.workers, "coalesced": self.coalesced,
+                **{s: status.count(s) for s in (ANTRI, BERJALAN, SELESAI, GAGAL)}}
@@ -0,0 +1,205 @@
+"""
+Precomputed capacity tables of every catalog profile versus unbraced length.
+
+For one steel grade (fy, E) the nominal strengths of all profiles are
+computed once on a dense length grid with the vectorised limit states of
+`wf_optimasi`:
+
+- compression Pn (K = 1, so a lookup at K·L covers any K);
+- major-axis flexure split into yielding, LTB at Cb = 1 and FLB, so a lookup
+  can apply any Cb ≥ 1 exactly (LTB scales with Cb, the cap does not);
+- minor-axis flexure and shear, which do not depend on the length.
+
+Tables of the standard grades (MUTU_STANDAR with E = E_BAJA) are stored as
+compressed float32 arrays in one `.npz` file per grade and tagged with the
+catalog version; a table whose version no longer matches the catalog is
+rebuilt on first use. Any other (fy, E) is computed in memory only and kept
+in a small LRU, so arbitrary user input cannot grow the disk or memory use. Lookups interpolate linearly
+between grid points, so after the first load a query is an array lookup.
+"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from wf_engine import E_BAJA, FAKTOR, G_BAJA, METODE
+from wf_optimasi import PROPERTI, geser_desain, momen_mayor_komponen, momen_minor_nominal, section_arrays, tekan_nominal
+
+TABLE_FORMAT = 1
+TABLE_DIR = os.environ.get(
+    "WF_CAPACITY_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "kapasitas"),
+)
+# Panjang tak terkekang 0-20 m setiap 100 mm
+GRID_LB = np.arange(0.0, 20000.0 + 1.0, 100.0)
+KONDISI = ("tekan", "momen_mayor", "momen_minor", "geser")
+# Fy mutu baja SNI BJ 34, 37, 41, 50 dan 55 (MPa): tabelnya disimpan ke disk
+MUTU_STANDAR = (210.0, 240.0, 250.0, 290.0, 410.0)
+# Tabel mutu lain hanya di memori, paling banyak sejumlah ini (LRU)
+MAKS_TABEL_LAIN = 4
+
+_tables = {}
+_tables_lain = OrderedDict()
+_lock = threading.Lock()
+
+
+class CapacityTable:
+    """Nominal strengths (N, N·mm) of every profile for one (fy, E) over `grid` (mm)"""
+
+    def __init__(self, data):
+        self.version = str(data["version"])
+        self.fy = float(data["fy"])
+        self.E = float(data["E"])
+        self.grid = np.asarray(data["grid"], dtype=float)
+        self.profil = [str(p) for p in data["profil"]]
+        self._indeks = {nama: i for i, nama in enumerate(self.profil)}
+        self.Pn = data["Pn"]
+        self.Mn_ltb = data["Mn_ltb"]
+        self.Mn_leleh = data["Mn_leleh"]
+        self.Mn_flb = data["Mn_flb"]
+        self.Mny = data["Mny"]
+        self.Vc = data["Vc"]
+
+    def _baris(self, profil):
+        i = self._indeks.get(profil)
+        if i is None:
+            raise ValueError(f"Profil {profil} tidak ditemukan di tabel kapasitas")
+        return i
+
+    def _interp(self, kurva, panjang):
+        panjang = np.abs(np.asarray(panjang, dtype=float))
+        if np.any(panjang > self.grid[-1]):
+            raise ValueError(f"Panjang di luar tabel kapasitas (maks. {self.grid[-1] / 1000:g} m)")
+        return np.interp(panjang, self.grid, kurva)
+
+    def nominal(self, profil, kondisi, panjang=0.0, K=1.0, Cb=1.0):
+        """Nominal strength of `profil` at unbraced length `panjang` (mm); scalar or array"""
+        i = self._baris(profil)
+        if kondisi == "tekan":
+            return self._interp(self.Pn[i], K * np.asarray(panjang, dtype=float))
+        if kondisi == "momen_mayor":
+            ltb = max(Cb, 1.0) * self._interp(self.Mn_ltb[i], panjang)
+            return np.minimum(np.minimum(ltb, self.Mn_leleh[i]), self.Mn_flb[i])
+        if kondisi == "momen_minor":
+            return np.broadcast_to(float(self.Mny[i]), np.shape(panjang))
+        raise ValueError(f"Kondisi {kondisi!r} tidak dikenal; pilih dari {', '.join(KONDISI)}")
+
+    def design(self, profil, kondisi, panjang=0.0, metode="DFBT", K=1.0, Cb=1.0):
+        """Design (DFBT) or allowable (DKI) strength, in N or N·mm"""
+        if kondisi == "geser":
+            return np.broadcast_to(float(self.Vc[self._baris(profil), METODE.index(metode)]), np.shape(panjang))
+        phi, omega = FAKTOR["tekan" if kondisi == "tekan" else "lentur"]
+        rn = self.nominal(profil, kondisi, panjang, K, Cb)
+        return rn * phi if metode == "DFBT" else rn / omega
+
+    def curves(self, profil, metode="DFBT", Cb=1.0):
+        """{kondisi: design strength over the grid} for plotting (compression over K·L)"""
+        return {kondisi: self.design(profil, kondisi, self.grid, metode, Cb=Cb) for kondisi in KONDISI}
+
+
+def _susun(kolom, profil, version, fy, E, grid):
+    grid = np.asarray(grid, dtype=float)
+    q = {"fy": float(fy), "E": float(E), "G": G_BAJA, "K": 1.0, "Cb": 1.0, "L": grid[None, :], "Lb": grid[None, :]}
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        pn, _ = tekan_nominal(kolom, q)
+        leleh, ltb, flb = momen_mayor_komponen(kolom, q)
+        mny = momen_minor_nominal(kolom, q)[:, 0]
+        vc = np.stack([geser_desain(kolom, q, metode)[:, 0] for metode in METODE], axis=1)
+    leleh = np.broadcast_to(leleh, ltb.shape)
+    return {
+        "format": TABLE_FORMAT, "version": version, "fy": float(fy), "E": float(E), "grid": grid,
+        "profil": np.array(profil),
+        "Pn": np.broadcast_to(pn, (len(profil), len(grid))).astype(np.float32),
+        # LTB dibatasi leleh agar tetap berhingga; untuk Cb >= 1 hasil akhirnya sama persis
+        "Mn_ltb": np.minimum(ltb, leleh).astype(np.float32),
+        "Mn_leleh": leleh[:, 0].astype(np.float32),
+        "Mn_flb": flb[:, 0].astype(np.float32),
+        "Mny": mny.astype(np.float32),
+        "Vc": vc.astype(np.float32),
+    }
+
+
+def build_table(catalog, fy, E=E_BAJA, grid=GRID_LB):
+    """Arrays of a CapacityTable computed from the catalog (profiles lacking dimensions are left out)"""
+    p = section_arrays(catalog)
+    idx = np.flatnonzero(p["ada"])
+    kolom = {k: p[k][idx][:, None] for k in PROPERTI}
+    return _susun(kolom, [catalog.profil[i] for i in idx], catalog.version, fy, E, grid)
+
+
+def section_table(profil, section, fy, E=E_BAJA, grid=GRID_LB):
+    """One-profile CapacityTable for a completed section not in the catalog (not stored)"""
+    kolom = {k: np.array([[float(section[k])]]) for k in PROPERTI}
+    return CapacityTable(_susun(kolom, [profil], "", fy, E, grid))
+
+
+def table_path(fy, E=E_BAJA, folder=TABLE_DIR):
+    return os.path.join(folder, f"wf_fy{float(fy):g}_E{float(E):g}.npz")
+
+
+def _baca(path, version, grid):
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            data = {k: f[k] for k in f.files}
+    except (OSError, ValueError):
+        return None
+    if int(data.get("format", -1)) != TABLE_FORMAT or str(data.get("version")) != version:
+        return None
+    if not np.array_equal(data["grid"], grid):
+        return None
+    return data
+
+
+def _tulis(path, data):
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".kapasitas_", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def standard_grade(fy, E=E_BAJA):
+    """Whether (fy, E) is a standard grade whose table is stored on disk"""
+    return float(E) == E_BAJA and float(fy) in MUTU_STANDAR
+
+
+def load_table(catalog, fy, E=E_BAJA, folder=TABLE_DIR, grid=GRID_LB):
+    """
+    CapacityTable for this catalog version and grade: from memory, from disk, or rebuilt.
+    Only standard grades are written to disk; other grades live in a bounded LRU.
+    """
+    kunci = (catalog.version, float(fy), float(E))
+    standar = standard_grade(fy, E)
+    with _lock:
+        tabel = (_tables if standar else _tables_lain).get(kunci)
+        if tabel is not None:
+            if not standar:
+                _tables_lain.move_to_end(kunci)
+            return tabel
+        # Tabel versi katalog lama tidak akan dipakai lagi
+        for cache in (_tables, _tables_lain):
+            for lama in [k for k in cache if k[0] != catalog.version]:
+                del cache[lama]
+        if not standar:
+            tabel = _tables_lain[kunci] = CapacityTable(build_table(catalog, fy, E, grid))
+            while len(_tables_lain) > MAKS_TABEL_LAIN:
+                _tables_lain.popitem(last=False)
+            return tabel
+        path = table_path(fy, E, folder)
+        data = _baca(path, catalog.version, np.asarray(grid, dtype=float))
+        if data is None:
+            data = build_table(catalog, fy, E, grid)
+            try:
+                _tulis(path, data)
+            except OSError:
+                pass  # folder tidak bisa ditulis: tabel tetap dipakai dari memori
+        tabel = _tables[kunci] = CapacityTable(data)
+    return tabel
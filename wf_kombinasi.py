@@ -0,0 +1,152 @@
+"""
+SNI 1727:2020 load combinations checked in one array operation.
+
+Nominal actions are entered once per load type (D, L, Lr, W, E) as
+N (positive = tension), Mux, Muy, Vu and Tu. `generate` builds every
+applicable combination for the method: DFBT (LRFD, Pasal 2.3) or
+DKI (ASD, Pasal 2.4). Wind and seismic actions are reversible, so their
+combinations appear with both signs. A factor matrix times the
+load-type actions gives all combined actions at once.
+
+`check` evaluates every combination against the capacities of the section
+arrays (one profile or the whole catalog) as (combination x profile) arrays:
+
+- combined axial force and flexure per SNI 1729 H1.1 (H1-1a/b), using the
+  tensile or compressive strength depending on the sign of N;
+- shear plus torsion, as in the result tables (Vu/Vc + Tu/Tc);
+- the slenderness limit of the governing axial sense (L/r ≤ 300 in
+  tension, KL/r ≤ 200 in compression).
+
+Rain load R and the vertical seismic effect Ev are not separate inputs.
+Enter R under Lr when it governs, and include Ev in E.
+"""
+import numpy as np
+
+from wf_optimasi import kapasitas_desain
+
+BEBAN = ("D", "L", "Lr", "W", "E")
+AKSI = ("N", "Mux", "Muy", "Vu", "Tu")
+BEBAN_BOLAK_BALIK = ("W", "E")
+PEMERIKSAAN = ("aksial-lentur (H1)", "geser-torsi", "kelangsingan")
+BATAS_LOLOS = 1.0
+# Satuan masukan aksi (kN, kNm) -> satuan engine (N, N·mm)
+SKALA_AKSI = np.array([1e3, 1e6, 1e6, 1e3, 1e6])
+
+# (faktor per jenis beban, beban utama); kombinasi dengan beban utama nol dilewati
+KOMBINASI = {
+    "DFBT": (
+        ({"D": 1.4}, None),
+        ({"D": 1.2, "L": 1.6, "Lr": 0.5}, None),
+        ({"D": 1.2, "Lr": 1.6, "L": 1.0}, "Lr"),
+        ({"D": 1.2, "Lr": 1.6, "W": 0.5}, "W"),
+        ({"D": 1.2, "W": 1.0, "L": 1.0, "Lr": 0.5}, "W"),
+        ({"D": 0.9, "W": 1.0}, "W"),
+        ({"D": 1.2, "E": 1.0, "L": 1.0}, "E"),
+        ({"D": 0.9, "E": 1.0}, "E"),
+    ),
+    "DKI": (
+        ({"D": 1.0}, None),
+        ({"D": 1.0, "L": 1.0}, "L"),
+        ({"D": 1.0, "Lr": 1.0}, "Lr"),
+        ({"D": 1.0, "L": 0.75, "Lr": 0.75}, "Lr"),
+        ({"D": 1.0, "W": 0.6}, "W"),
+        ({"D": 1.0, "L": 0.75, "W": 0.45, "Lr": 0.75}, "W"),
+        ({"D": 0.6, "W": 0.6}, "W"),
+        ({"D": 1.0, "E": 0.7}, "E"),
+        ({"D": 1.0, "L": 0.75, "E": 0.525}, "E"),
+        ({"D": 0.6, "E": 0.7}, "E"),
+    ),
+}
+
+
+def load_matrix(beban):
+    """(load types x actions) array from {jenis: {aksi: value}}; missing or empty (NaN) entries are 0"""
+    matriks = np.array([[float((beban.get(jenis) or {}).get(aksi) or 0.0) for aksi in AKSI] for jenis in BEBAN])
+    # Sel data_editor yang dikosongkan menjadi NaN (dan NaN bernilai benar untuk `or`)
+    matriks[np.isnan(matriks)] = 0.0
+    return matriks
+
+
+def label(koef):
+    """Combination name from its factors, e.g. "0,9D − W" (decimal comma as on the sheet)"""
+    teks = ""
+    for jenis, x in koef.items():
+        angka = "" if abs(x) == 1.0 else f"{abs(x):g}".replace(".", ",")
+        tanda = "−" if x < 0 else "+"
+        teks += f"{angka}{jenis}" if not teks else f" {tanda} {angka}{jenis}"
+    return teks
+
+
+def generate(beban, metode="DFBT"):
+    """(names, factor matrix combos x load types, combined actions combos x actions)"""
+    matriks = load_matrix(beban)
+    ada = {jenis: bool(np.any(matriks[i])) for i, jenis in enumerate(BEBAN)}
+    nama, faktor = [], []
+    for koef, utama in KOMBINASI[metode]:
+        if utama is not None and not ada[utama]:
+            continue
+        # Beban angin/gempa bolak-balik: kombinasi dengan kedua tanda
+        tanda = (1.0, -1.0) if any(koef.get(j) and ada[j] for j in BEBAN_BOLAK_BALIK) else (1.0,)
+        for s in tanda:
+            varian = {j: (x * s if j in BEBAN_BOLAK_BALIK else x) for j, x in koef.items()}
+            nama.append(label(varian))
+            faktor.append([varian.get(jenis, 0.0) for jenis in BEBAN])
+    faktor = np.array(faktor, dtype=float).reshape(-1, len(BEBAN))
+    return nama, faktor, faktor @ matriks
+
+
+def _rasio(perlu, kapasitas):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(kapasitas > 0, perlu / kapasitas, np.where(perlu == 0, 0.0, np.inf))
+    return np.where(np.isnan(r), np.inf, r)
+
+
+def check(p, q, aksi, sendi=None, metode="DFBT"):
+    """
+    Ratios of every combination (rows of `aksi`, engine units N / N·mm) against the
+    section arrays `p` (columns): {"rasio": combos x checks x profiles, "maks", "penentu"}
+    """
+    aksi = np.atleast_2d(np.asarray(aksi, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        c = kapasitas_desain(p, q, sendi, metode)
+        n = aksi[:, [0]]
+        mx, my, v, t = (np.abs(aksi[:, [j]]) for j in range(1, 5))
+        tarik = n > 0
+        rp = _rasio(np.abs(n), np.where(tarik, c["tarik"], c["tekan"]))
+        rm = _rasio(mx, c["momen_mayor"]) + _rasio(my, c["momen_minor"])
+        # SNI 1729 H1-1a / H1-1b
+        h1 = np.where(rp >= 0.2, rp + 8.0 / 9.0 * rm, rp / 2.0 + rm)
+        geser_torsi = _rasio(v, c["geser"]) + _rasio(t, c["torsi"])
+        kelangsingan = np.where(tarik, c["l_r"] / 300.0, np.where(n < 0, c["kl_r"] / 200.0, 0.0))
+        rasio = np.stack([h1, geser_torsi, np.broadcast_to(kelangsingan, h1.shape)], axis=1)
+    rasio = np.where(np.isnan(rasio), np.inf, rasio)
+    return {"rasio": rasio, "maks": rasio.max(axis=1), "penentu": rasio.argmax(axis=1)}
+
+
+def governing(nama, hasil, kolom=0):
+    """(index, name, ratio, check) of the governing combination for profile column `kolom`"""
+    maks = hasil["maks"][:, kolom]
+    i = int(np.argmax(maks))
+    return i, nama[i], float(maks[i]), PEMERIKSAAN[int(hasil["penentu"][i, kolom])]
+
+
+def evaluate(p, q, beban, sendi=None, metode="DFBT", kolom=0):
+    """
+    All combinations of `beban` ({jenis: {aksi: kN or kNm}}) for profile column `kolom` of
+    the section arrays `p`: {"metode", "kombinasi": [row per combination], "penentu": row}
+    """
+    nama, _, aksi = generate(beban, metode)
+    hasil = check(p, q, aksi * SKALA_AKSI, sendi, metode)
+    rows = []
+    for i, label_ in enumerate(nama):
+        rasio = hasil["rasio"][i, :, kolom]
+        rows.append({
+            "kombinasi": label_,
+            **{a: float(x) for a, x in zip(AKSI, aksi[i])},
+            **{f"rasio {cek}": float(r) for cek, r in zip(PEMERIKSAAN, rasio)},
+            "rasio": float(hasil["maks"][i, kolom]),
+            "penentu": PEMERIKSAAN[int(hasil["penentu"][i, kolom])],
+            "status": "OK" if hasil["maks"][i, kolom] <= BATAS_LOLOS else "TIDAK OK",
+        })
+    i, _, _, _ = governing(nama, hasil, kolom)
+    return {"metode": metode, "kombinasi": rows, "penentu": rows[i]}
@@ -0,0 +1,206 @@
+"""
+Headless API for WF member checks: catalog loading, input normalisation,
+calculation and result parsing without a Streamlit runtime.
+
+    import wf_lib
+    catalog = wf_lib.load_catalog()
+    hasil = wf_lib.calculate_params(catalog, "WF 300x150", {"fy": 250, "fu": 410, "L": 3, "Nt": 100})
+
+Parameters are given in the units of the "WF" sheet form (see
+`catalog.input_template`), keyed by engine key (`wf_engine.INPUT_KEYS`,
+joint parameters `wf_engine.SENDI_KEYS`). The catalog comes from the local
+snapshot written by the web app (`wf_catalog.SNAPSHOT_PATH`); the Google
+Sheets engine needs the app's credentials and stays in `wf.py`.
+"""
+from wf_catalog import KOLOM_TEMPLATE, SNAPSHOT_PATH, build_catalog, load_snapshot
+from wf_engine import (E_BAJA, INPUT_KEYS, KUNCI_HASIL, SENDI_KEYS, affected_groups, calculate_wf,
+                       input_keys, inputs_from_form, normalize_inputs, result_keys, sendi_from_form, sendi_keys)
+from wf_penampang import complete, parse_custom_name
+
+
+def load_catalog(path=SNAPSHOT_PATH):
+    """ProfileCatalog from the local catalog snapshot"""
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        raise FileNotFoundError(f"Catalog snapshot not found or invalid: {path} "
+                                "(run the web app once, or set WF_CATALOG_SNAPSHOT)")
+    return build_catalog(snapshot["data"], version=snapshot["version"])
+
+
+def _rows(template):
+    return [[row[k] for k in KOLOM_TEMPLATE] for row in template]
+
+
+def form_values(template, params, keys):
+    """Form values in template order from {engine key: value}; parameters not given become "0" """
+    kunci_form = keys(_rows(template))
+    lain = [k for k in params if k not in kunci_form]
+    if lain:
+        tersedia = ", ".join(k for k in kunci_form if k)
+        raise ValueError(f"Parameter(s) {', '.join(lain)} not on the form (available: {tersedia})")
+    return ["" if kunci is None else str(params.get(kunci, 0)) for kunci in kunci_form]
+
+
+def form_keys(catalog):
+    """(structural keys, joint keys) the catalog's forms accept, in form order"""
+    return ([k for k in input_keys(_rows(catalog.input_template)) if k],
+            [k for k in sendi_keys(_rows(catalog.sendi_template)) if k])
+
+
+def split_params(params):
+    """Split a flat parameter dict into (structural params, joint params or None)"""
+    tidak_dikenal = [k for k in params if k not in INPUT_KEYS and k not in SENDI_KEYS]
+    if tidak_dikenal:
+        raise ValueError(f"Unknown parameter(s): {', '.join(tidak_dikenal)}; "
+                         f"expected {', '.join(INPUT_KEYS + SENDI_KEYS)}")
+    struktur = {k: v for k, v in params.items() if k in INPUT_KEYS}
+    sendi = {k: v for k, v in params.items() if k in SENDI_KEYS and v not in (None, "")}
+    return struktur, (sendi or None)
+
+
+def section(catalog, profil):
+    """Section properties (mm) of a catalog profile, or the dimensions of a custom "Kustom d x bf x tw x tf" name"""
+    baris = catalog.row(profil)
+    if baris is not None:
+        return catalog.penampang[baris]
+    dimensi = parse_custom_name(profil)
+    if dimensi is None:
+        raise ValueError(f"Profil {profil} tidak ditemukan di tabel profil")
+    return dimensi
+
+
+def _request(catalog, profil, input_values, status_sendi="Tidak", sendi_values=()):
+    """(section, inputs, sendi) engine request from raw form values"""
+    inputs = inputs_from_form(_rows(catalog.input_template), input_values)
+    sendi = None
+    if status_sendi == "Ya":
+        sendi = sendi_from_form(_rows(catalog.sendi_template), sendi_values)
+    return section(catalog, profil), inputs, sendi
+
+
+def calculate(catalog, profil, input_values, status_sendi="Tidak", sendi_values=()):
+    """Compute all result tables from raw form values, as the page does for the local engine"""
+    return calculate_wf(*_request(catalog, profil, input_values, status_sendi, sendi_values))
+
+
+def affected_results(catalog, lama, baru):
+    """
+    Result keys that can differ between two form requests, each given as
+    (profil, input_values, status_sendi, sendi_values); see wf_engine.GANTUNGAN
+    """
+    return result_keys(affected_groups(_request(catalog, *lama), _request(catalog, *baru)))
+
+
+def recalculate(catalog, profil, input_values, status_sendi, sendi_values, sebelumnya, hasil_lama):
+    """
+    Result tables for a request that differs from `sebelumnya` (an earlier request) by
+    a few inputs: only the affected groups are computed, the rest is taken from
+    `hasil_lama`. Returns (hasil, recomputed result keys).
+    """
+    permintaan = _request(catalog, profil, input_values, status_sendi, sendi_values)
+    kelompok = affected_groups(_request(catalog, *sebelumnya), permintaan)
+    baru = calculate_wf(*permintaan, kelompok=kelompok)
+    return {key: baru.get(key, hasil_lama.get(key)) for key in KUNCI_HASIL}, list(baru)
+
+
+def request_from_params(catalog, params, sendi=None):
+    """(input_values, status_sendi, sendi_values) form request for engine-keyed parameters"""
+    input_values = form_values(catalog.input_template, params, input_keys)
+    if not sendi:
+        return input_values, "Tidak", []
+    return input_values, "Ya", form_values(catalog.sendi_template, sendi, sendi_keys)
+
+
+def calculate_params(catalog, profil, params, sendi=None):
+    """Compute all result tables from {engine key: value} parameters (form units)"""
+    return calculate(catalog, profil, *request_from_params(catalog, params, sendi))
+
+
+def lightest_profiles(catalog, input_values, status_sendi="Tidak", sendi_values=(), metode="DFBT", top=5):
+    """Lightest catalog profiles passing every check for raw form values (see wf_optimasi.optimize)"""
+    from wf_optimasi import optimize
+
+    inputs = inputs_from_form(_rows(catalog.input_template), input_values)
+    sendi = None
+    if status_sendi == "Ya":
+        sendi = sendi_from_form(_rows(catalog.sendi_template), sendi_values)
+    return optimize(catalog, inputs, sendi, metode, top)
+
+
+def lightest_profiles_params(catalog, params, sendi=None, metode="DFBT", top=5):
+    """Lightest catalog profiles passing every check for {engine key: value} parameters (form units)"""
+    return lightest_profiles(catalog, *request_from_params(catalog, params, sendi), metode=metode, top=top)
+
+
+def load_combinations(catalog, profil, input_values, status_sendi, sendi_values, beban, metode="DFBT"):
+    """
+    SNI 1727 combinations of the nominal actions `beban` ({"D": {"N": kN, "Mux": kNm, ...}, ...},
+    N positive in tension) checked for `profil` with the member data of the raw form values;
+    the form's own demand fields are not used (see wf_kombinasi.evaluate)
+    """
+    import numpy as np
+
+    from wf_kombinasi import evaluate
+    from wf_optimasi import PROPERTI
+
+    p = complete(section(catalog, profil))
+    q = normalize_inputs(inputs_from_form(_rows(catalog.input_template), input_values))
+    sendi = None
+    if status_sendi == "Ya":
+        sendi = sendi_from_form(_rows(catalog.sendi_template), sendi_values)
+    return evaluate({k: np.array([p[k]], dtype=float) for k in PROPERTI}, q, beban, sendi, metode)
+
+
+def load_combinations_params(catalog, profil, params, beban, sendi=None, metode="DFBT"):
+    """load_combinations for {engine key: value} member parameters (form units)"""
+    return load_combinations(catalog, profil, *request_from_params(catalog, params, sendi), beban, metode)
+
+
+def capacities(catalog, profil, params, metode="DFBT"):
+    """
+    Design strengths of `profil` from the precomputed capacity tables (see wf_kapasitas):
+    {"tekan": kN, "momen_mayor": kNm, "momen_minor": kNm, "geser": kN}. Uses fy, E, L, Lb,
+    K and Cb of {engine key: value} parameters (form units); Lb defaults to L.
+    """
+    from wf_kapasitas import load_table
+
+    params = dict(params)
+    # Cb tanpa satuan: boleh diberikan walau form tidak memuatnya
+    cb = params.pop("Cb", None) if "Cb" not in input_keys(_rows(catalog.input_template)) else None
+    q = inputs_from_form(_rows(catalog.input_template), form_values(catalog.input_template, params, input_keys))
+    if cb is not None:
+        q["Cb"] = float(cb)
+    if not q.get("fy") or q["fy"] <= 0:
+        raise ValueError("Nilai Fy harus lebih besar dari 0")
+    if catalog.row(profil) is None:
+        if parse_custom_name(profil) is not None:
+            raise ValueError("Tabel kapasitas hanya tersedia untuk profil katalog")
+        raise ValueError(f"Profil {profil} tidak ditemukan di tabel profil")
+    tabel = load_table(catalog, q["fy"], q.get("E") or E_BAJA)
+    panjang = abs(q.get("L") or 0.0)
+    lb = abs(q.get("Lb") or panjang)
+    k, cb = q.get("K") or 1.0, q.get("Cb") or 1.0
+    return {
+        "tekan": float(tabel.design(profil, "tekan", panjang, metode, K=k)) / 1e3,
+        "momen_mayor": float(tabel.design(profil, "momen_mayor", lb, metode, Cb=cb)) / 1e6,
+        "momen_minor": float(tabel.design(profil, "momen_minor", lb, metode)) / 1e6,
+        "geser": float(tabel.design(profil, "geser", lb, metode)) / 1e3,
+    }
+
+
+def parse_results(hasil):
+    """Typed result tables (see wf_hasil.TabelHasil); imports pandas"""
+    from wf_hasil import parse_semua_hasil
+    return parse_semua_hasil(hasil)
+
+
+def result_records(hasil):
+    """Flatten a result dict into one dict per row, tagged with the result key"""
+    records = []
+    for key, table in hasil.items():
+        if not table:
+            continue
+        header = table[0]
+        for row in table[1:]:
+            records.append({"hasil": key, **dict(zip(header, row))})
+    return records
@@ -0,0 +1,261 @@
+"""
+Whole-catalog evaluation and minimum-weight profile selection.
+
+The limit states of `wf_engine` are re-expressed with numpy so every catalog
+row is checked against the same demands in one pass of array operations.
+`optimize` walks the catalog in blocks of increasing weight and stops as soon
+as no heavier block can beat the candidates already found, so the cost grows
+with the number of sections that have to be looked at, not with the catalog.
+
+Utilisation is the largest demand/capacity ratio of the checks the result
+tables mark OK / TIDAK OK (tension, slenderness limits, compression, major
+and minor flexure, shear, torsion and shear-torsion interaction). A
+slenderness limit counts only when the member carries that axial force.
+"""
+import numpy as np
+
+from wf_engine import FAKTOR, normalize_inputs
+from wf_penampang import catalog_arrays
+
+PROPERTI = ("d", "bf", "tw", "tf", "r", "h", "ho", "A", "Ix", "Iy", "rx", "ry",
+            "Sx", "Sy", "Zx", "Zy", "J", "Cw", "rts")
+BATAS_LOLOS = 1.0
+
+PEMERIKSAAN = ("tarik", "kelangsingan tarik", "kelangsingan tekan", "tekan",
+               "momen mayor", "momen minor", "geser", "torsi", "interaksi geser-torsi")
+
+_arrays = {}
+
+
+def section_arrays(catalog):
+    """Completed section properties of every catalog row as float arrays (cached per catalog version)"""
+    cached = _arrays.get(catalog.version)
+    if cached is not None:
+        return cached
+    # Baris tanpa dimensi dasar yang valid tidak ikut dievaluasi
+    kolom = catalog_arrays(catalog, PROPERTI + ("W",))
+    ada = kolom["ada"] = kolom.pop("valid")
+    # Urutan ringan -> berat untuk pencarian
+    kolom["urutan"] = np.flatnonzero(ada)[np.argsort(kolom["W"][ada], kind="stable")]
+    _arrays.clear()
+    _arrays[catalog.version] = kolom
+    return kolom
+
+
+def _desain(rn, faktor, metode):
+    phi, omega = faktor
+    return rn * phi if metode == "DFBT" else rn / omega
+
+
+def _rasio(perlu, kapasitas):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(kapasitas > 0, perlu / kapasitas, np.where(perlu == 0, 0.0, np.inf))
+    return np.where(np.isnan(r), np.inf, r)
+
+
+def _interpolasi(m_atas, m_bawah, x, x_p, x_r):
+    return m_atas - (m_atas - m_bawah) * (x - x_p) / (x_r - x_p)
+
+
+def tekan_nominal(p, q):
+    """(Pn, KL/r) per SNI 1729 E3/E4/E7; broadcasts over section arrays and an array of `q["L"]`"""
+    fy, e, g = q["fy"], q["E"], q["G"]
+    lc = q["K"] * q["L"]
+    kl_r = lc / np.minimum(p["rx"], p["ry"])
+    lamda_f, lamda_w = p["bf"] / (2 * p["tf"]), p["h"] / p["tw"]
+    lamda_rf, lamda_rw = 0.56 * np.sqrt(e / fy), 1.49 * np.sqrt(e / fy)
+    # lc = 0 memberi Fe tak hingga sehingga Fcr = fy, sama seperti cabang lc = 0 pada engine
+    fe_lentur = np.pi ** 2 * e / kl_r ** 2
+    fe_torsi = (np.pi ** 2 * e * p["Cw"] / lc ** 2 + g * p["J"]) / (p["Ix"] + p["Iy"])
+    fe = np.minimum(fe_lentur, fe_torsi)
+    fcr = np.where(lc > 0, np.where(fy / fe <= 2.25, 0.658 ** (fy / fe) * fy, 0.877 * fe), fy)
+    ae = p["A"].copy()
+    for lamda, lamda_r, lebar, tebal, jumlah, c1 in (
+        (lamda_f, lamda_rf, p["bf"] / 2, p["tf"], 4, 0.22),
+        (lamda_w, lamda_rw, p["h"], p["tw"], 1, 0.18),
+    ):
+        langsing = lamda > lamda_r * np.sqrt(fy / fcr)
+        c2 = (1 - np.sqrt(1 - 4 * c1)) / (2 * c1)
+        fel = (c2 * lamda_r / lamda) ** 2 * fy
+        akar = np.sqrt(fel / fcr)
+        be = lebar * (1 - c1 * akar) * akar
+        ae = ae - np.where(langsing, jumlah * np.maximum(lebar - be, 0.0) * tebal, 0.0)
+    return fcr * ae, kl_r
+
+
+def momen_mayor_komponen(p, q):
+    """
+    Nominal major-axis strengths (yielding, LTB, FLB); LTB is not capped by yielding
+    (the engine's min with Mp/Rpc·Myc/Rpg·Myc is the final min) and is inf where it
+    does not apply. Broadcasts over section arrays and an array of `q["Lb"]`.
+    """
+    fy, e, lb, cb = q["fy"], q["E"], q["Lb"], q["Cb"]
+    sx, ho = p["Sx"], p["ho"]
+    akar = np.sqrt(e / fy)
+    lamda_f, lamda_pf, lamda_rf = p["bf"] / (2 * p["tf"]), 0.38 * akar, 1.0 * akar
+    lamda_w, lamda_pw, lamda_rw = p["h"] / p["tw"], 3.76 * akar, 5.70 * akar
+    mp = fy * p["Zx"]
+    kc = np.clip(4 / np.sqrt(lamda_w), 0.35, 0.76)
+    jc = p["J"] / (sx * ho)
+    f_nonkompak = lamda_f > lamda_pf
+    f_langsing = lamda_f > lamda_rf
+    inf = np.full_like(mp, np.inf)
+
+    def flb(m_atas, m_bawah):
+        return np.where(f_langsing, 0.9 * e * kc * sx / lamda_f ** 2,
+                        np.where(f_nonkompak, _interpolasi(m_atas, m_bawah, lamda_f, lamda_pf, lamda_rf), inf))
+
+    # F2/F3: badan kompak
+    rts = p["rts"]
+    lp2 = 1.76 * p["ry"] * akar
+    lr2 = 1.95 * rts * e / (0.7 * fy) * np.sqrt(jc + np.sqrt(jc ** 2 + 6.76 * (0.7 * fy / e) ** 2))
+    fcr2 = cb * np.pi ** 2 * e / (lb / rts) ** 2 * np.sqrt(1 + 0.078 * jc * (lb / rts) ** 2)
+    ltb2 = np.where(lb > lr2, fcr2 * sx, np.where(lb > lp2, cb * _interpolasi(mp, 0.7 * fy * sx, lb, lp2, lr2), inf))
+
+    # F4/F5: badan nonkompak / langsing
+    aw = p["h"] * p["tw"] / (p["bf"] * p["tf"])
+    rt = p["bf"] / np.sqrt(12 * (1 + aw / 6))
+    lp = 1.1 * rt * akar
+    myc = fy * sx
+    rpc = np.minimum(_interpolasi(mp / myc, 1.0, lamda_w, lamda_pw, lamda_rw), mp / myc)
+    fl = 0.7 * fy
+    lr4 = 1.95 * rt * e / fl * np.sqrt(jc + np.sqrt(jc ** 2 + 6.76 * (fl / e) ** 2))
+    m4 = rpc * myc
+    fcr4 = cb * np.pi ** 2 * e / (lb / rt) ** 2 * np.sqrt(1 + 0.078 * jc * (lb / rt) ** 2)
+    ltb4 = np.where(lb > lr4, fcr4 * sx, np.where(lb > lp, cb * _interpolasi(m4, fl * sx, lb, lp, lr4), inf))
+
+    awc = np.minimum(aw, 10)
+    rpg = np.minimum(1 - awc / (1200 + 300 * awc) * (lamda_w - lamda_rw), 1.0)
+    lr5 = np.pi * rt * np.sqrt(e / (0.7 * fy))
+    m5 = rpg * myc
+    fcr5 = cb * np.pi ** 2 * e / (lb / rt) ** 2
+    ltb5 = np.where(lb > lr5, rpg * fcr5 * sx, np.where(lb > lp, rpg * cb * _interpolasi(fy, 0.7 * fy, lb, lp, lr5) * sx, inf))
+    flb5 = np.where(f_langsing, rpg * 0.9 * e * kc / lamda_f ** 2 * sx,
+                    np.where(f_nonkompak, rpg * _interpolasi(fy, 0.7 * fy, lamda_f, lamda_pf, lamda_rf) * sx, inf))
+
+    def pilih(kompak, nonkompak, langsing):
+        return np.where(lamda_w <= lamda_pw, kompak, np.where(lamda_w <= lamda_rw, nonkompak, langsing))
+
+    return pilih(mp, m4, m5), pilih(ltb2, ltb4, ltb5), pilih(flb(mp, 0.7 * fy * sx), flb(m4, fl * sx), flb5)
+
+
+def _momen_mayor(p, q):
+    return np.minimum.reduce(momen_mayor_komponen(p, q))
+
+
+def momen_minor_nominal(p, q):
+    """Nominal minor-axis flexural strength per SNI 1729 F6"""
+    fy, e = q["fy"], q["E"]
+    akar = np.sqrt(e / fy)
+    lamda_f, lamda_pf, lamda_rf = p["bf"] / (2 * p["tf"]), 0.38 * akar, 1.0 * akar
+    mp = np.minimum(fy * p["Zy"], 1.6 * fy * p["Sy"])
+    flb = np.where(lamda_f > lamda_rf, 0.69 * e / lamda_f ** 2 * p["Sy"],
+                   np.where(lamda_f > lamda_pf, _interpolasi(mp, 0.7 * fy * p["Sy"], lamda_f, lamda_pf, lamda_rf), mp))
+    return np.minimum(mp, flb)
+
+
+def geser_desain(p, q, metode):
+    """Design (DFBT) or allowable (DKI) web shear strength per SNI 1729 G2.1"""
+    fy, e = q["fy"], q["E"]
+    h_tw = p["h"] / p["tw"]
+    batas = 1.10 * np.sqrt(5.34 * e / fy)
+    rolled = h_tw <= 2.24 * np.sqrt(e / fy)
+    cv1 = np.where(rolled | (h_tw <= batas), 1.0, batas / h_tw)
+    vn = 0.6 * fy * p["d"] * p["tw"] * cv1
+    return np.where(rolled, _desain(vn, FAKTOR["geser_rolled"], metode), _desain(vn, FAKTOR["geser"], metode))
+
+
+def kapasitas_desain(p, q, sendi=None, metode="DFBT"):
+    """
+    Design (DFBT) or allowable (DKI) strengths of the section arrays `p`: tarik, tekan,
+    momen_mayor, momen_minor, geser, torsi (N, N·mm), plus the slenderness ratios
+    L/r (tension) and KL/r (compression). Call inside np.errstate for degenerate rows.
+    """
+    pt = _desain(q["fy"] * p["A"], FAKTOR["tarik_leleh"], metode)
+    if sendi:
+        db = sendi.get("db", 0.0)
+        dh = sendi.get("dh") or (db + (2.0 if db <= 22 else 3.0) if db else 0.0)
+        n = sendi.get("n", 0.0)
+        t = sendi.get("t") or p["tf"]
+        an = p["A"] - n * (dh + 2.0) * t if dh else p["A"]
+        u = sendi.get("U")
+        if not u:
+            xbar, panjang = sendi.get("xbar", 0.0), sendi.get("l", 0.0)
+            u = 1.0 - xbar / panjang if panjang > 0 else 1.0
+        u = min(max(u, 0.0), 1.0)
+        pt = np.minimum(pt, _desain(q["fu"] * np.maximum(u * an, 0.0), FAKTOR["tarik_putus"], metode))
+    pc, kl_r = tekan_nominal(p, q)
+    return {
+        "tarik": pt,
+        "tekan": _desain(pc, FAKTOR["tekan"], metode),
+        "momen_mayor": _desain(_momen_mayor(p, q), FAKTOR["lentur"], metode),
+        "momen_minor": _desain(momen_minor_nominal(p, q), FAKTOR["lentur"], metode),
+        "geser": geser_desain(p, q, metode),
+        "torsi": _desain(0.6 * q["fy"] * p["J"] / np.maximum(p["tf"], p["tw"]), FAKTOR["torsi"], metode),
+        "l_r": q["L"] / np.minimum(p["rx"], p["ry"]),
+        "kl_r": kl_r,
+    }
+
+
+def utilization(p, q, sendi=None, metode="DFBT"):
+    """Demand/capacity ratio of every check (rows = PEMERIKSAAN) for the section arrays `p`"""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        c = kapasitas_desain(p, q, sendi, metode)
+        rasio = np.vstack([
+            _rasio(q["Nt"], c["tarik"]),
+            # Batas kelangsingan tidak berlaku tanpa gaya aksial yang bersangkutan (lihat wf_engine)
+            np.where(q["Nt"] > 0, c["l_r"] / 300.0, 0.0),
+            np.where(q["Nc"] > 0, c["kl_r"] / 200.0, 0.0),
+            _rasio(q["Nc"], c["tekan"]),
+            _rasio(q["Mux"], c["momen_mayor"]),
+            _rasio(q["Muy"], c["momen_minor"]),
+            _rasio(q["Vu"], c["geser"]),
+            _rasio(q["Tu"], c["torsi"]),
+            _rasio(q["Vu"], c["geser"]) + _rasio(q["Tu"], c["torsi"]),
+        ])
+    return np.where(np.isnan(rasio), np.inf, rasio)
+
+
+def evaluate_all(catalog, inputs, sendi=None, metode="DFBT"):
+    """(governing ratio, governing check index) for every catalog row; NaN/-1 for incomplete rows"""
+    p = section_arrays(catalog)
+    q = normalize_inputs(inputs)
+    idx = np.flatnonzero(p["ada"])
+    rasio = utilization({k: p[k][idx] for k in PROPERTI}, q, sendi, metode)
+    maks = np.full(len(p["ada"]), np.nan)
+    penentu = np.full(len(p["ada"]), -1)
+    maks[idx] = rasio.max(axis=0)
+    penentu[idx] = rasio.argmax(axis=0)
+    return maks, penentu
+
+
+def optimize(catalog, inputs, sendi=None, metode="DFBT", top=5, blok=32):
+    """
+    Lightest profiles passing every check, ranked by weight then governing ratio.
+    Rows are evaluated in blocks of increasing weight; the search stops once `top`
+    candidates are found and the next block is heavier than all of them.
+    """
+    p = section_arrays(catalog)
+    q = normalize_inputs(inputs)
+    urutan = p["urutan"]
+    kandidat = []
+    dievaluasi = 0
+    for mulai in range(0, len(urutan), blok):
+        idx = urutan[mulai:mulai + blok]
+        if len(kandidat) >= top and p["W"][idx[0]] > kandidat[top - 1][0]:
+            break
+        rasio = utilization({k: p[k][idx] for k in PROPERTI}, q, sendi, metode)
+        dievaluasi += len(idx)
+        maks = rasio.max(axis=0)
+        for j in np.flatnonzero(maks <= BATAS_LOLOS):
+            kandidat.append((p["W"][idx[j]], maks[j], idx[j], rasio[:, j].argmax()))
+        kandidat.sort(key=lambda c: (c[0], c[1]))
+    return {
+        "metode": metode,
+        "dievaluasi": dievaluasi,
+        "jumlah_profil": len(urutan),
+        "kandidat": [
+            {"profil": catalog.profil[i], "berat": float(w), "rasio": float(r), "penentu": PEMERIKSAAN[g]}
+            for w, r, i, g in kandidat[:top]
+        ],
+    }
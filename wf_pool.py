@@ -0,0 +1,123 @@
+"""
+Pool of identical calculation worksheets shared by every session of a process.
+
+Each Sheets calculation writes inputs into fixed cells and reads a fixed
+output block, so two sessions must never use the same worksheet at once.
+A session leases one worksheet from the pool, runs its calculation on it and
+releases it. Leases expire after `lease_ttl` seconds unless renewed, so a
+worksheet held by a session that died is reclaimed by the next caller.
+"""
+import logging
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no worksheet becomes free before the wait deadline"""
+
+
+class LeaseLost(Exception):
+    """Raised when a lease expired and its worksheet was handed to another session"""
+
+
+class Lease:
+    """Exclusive, time-limited right to use one worksheet of the pool"""
+    __slots__ = ("pool", "nama", "token", "owner", "expires")
+
+    def __init__(self, pool, nama, token, owner, expires):
+        self.pool = pool
+        self.nama = nama
+        self.token = token
+        self.owner = owner
+        self.expires = expires
+
+    def renew(self):
+        """Extend the lease; raises LeaseLost if it was already reclaimed"""
+        self.pool.renew(self)
+
+    def release(self):
+        self.pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+class WorksheetPool:
+    """
+    Lease/release bookkeeping for a fixed set of worksheet names. Only the
+    names are managed here; opening the worksheets is left to the caller.
+
+    Leases are held in memory, so exclusivity holds between the threads of
+    one process only. Two server processes sharing a pool of worksheet names
+    can lease the same worksheet at once.
+    """
+
+    def __init__(self, names, lease_ttl=60.0):
+        names = list(dict.fromkeys(names))
+        if not names:
+            raise ValueError("Worksheet pool needs at least one worksheet")
+        self.names = tuple(names)
+        self.lease_ttl = lease_ttl
+        self._leases = {}  # nama -> Lease aktif
+        self._cond = threading.Condition()
+
+    def _reclaim_expired(self, now):
+        for nama, lease in list(self._leases.items()):
+            if lease.expires <= now:
+                logger.warning("Worksheet lease expired: %s (owner %s)", nama, lease.owner)
+                del self._leases[nama]
+
+    def _free(self):
+        return [nama for nama in self.names if nama not in self._leases]
+
+    def acquire(self, owner=None, timeout=30.0):
+        """Lease a free worksheet, waiting up to `timeout` seconds for one"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._reclaim_expired(now)
+                free = self._free()
+                if free:
+                    lease = Lease(self, free[0], uuid.uuid4().hex, owner, now + self.lease_ttl)
+                    self._leases[lease.nama] = lease
+                    return lease
+                if now >= deadline:
+                    raise PoolTimeout(f"All {len(self.names)} calculation sheets are busy")
+                # Bangun paling lambat saat lease tercepat kedaluwarsa
+                next_expiry = min(lease.expires for lease in self._leases.values())
+                self._cond.wait(max(0.0, min(deadline, next_expiry) - now))
+
+    def _current(self, lease):
+        current = self._leases.get(lease.nama)
+        return current is not None and current.token == lease.token
+
+    def renew(self, lease):
+        with self._cond:
+            if not self._current(lease):
+                raise LeaseLost(f"Lease on worksheet {lease.nama} expired")
+            lease.expires = time.monotonic() + self.lease_ttl
+
+    def release(self, lease):
+        """Return the worksheet to the pool; releasing a lost lease is a no-op"""
+        with self._cond:
+            if self._current(lease):
+                del self._leases[lease.nama]
+                self._cond.notify()
+
+    def status(self):
+        """Snapshot of the pool for monitoring: size, leased worksheets and their owners"""
+        with self._cond:
+            self._reclaim_expired(time.monotonic())
+            return {
+                "size": len(self.names),
+                "in_use": len(self._leases),
+                "leases": {nama: lease.owner for nama, lease in self._leases.items()},
+            }
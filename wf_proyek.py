@@ -0,0 +1,176 @@
+"""
+Member schedules for project mode: many WF members checked in one run.
+
+A schedule is a CSV or Excel (.xlsx) table with one member per row: an
+`id` column, a `profil` column and one column per parameter, keyed like
+`wf_engine.INPUT_KEYS` and `wf_engine.SENDI_KEYS` in the units of the sheet
+form (the same keys as `wf_cli.py` case files). A member whose joint columns
+are all empty has no bolted joint. `profil` may also name a custom section,
+e.g. "Kustom 400x200x8x13" (see `wf_penampang`).
+
+    id,profil,fy,fu,L,Lb,K,Nc,Mux,Vu,db,n
+    B1,"WF 300x150x6,5x9",250,410,6,6,1,0,80,60,,
+    K1,WF 350x175x7x11,250,410,4,4,1,450,30,20,20,4
+
+`governing` reduces a result dict to the member's largest demand/capacity
+ratio, and `export_csv` / `export_excel` write a whole run to one file. The
+"Ringkasan" sheet of an Excel export reads back as a schedule; its result
+columns are ignored.
+"""
+import csv
+import io
+import math
+from collections import namedtuple
+
+import wf_lib
+from wf_engine import INPUT_KEYS, SENDI_KEYS, parse_angka
+from wf_penampang import complete
+
+Anggota = namedtuple("Anggota", ["id", "profil", "params", "sendi"])
+
+KOLOM_ID = "id"
+KOLOM_PROFIL = "profil"
+STATUS_OK = "OK"
+STATUS_GAGAL = "TIDAK OK"
+# Kolom hasil dari summary_rows; diabaikan saat ringkasan yang diekspor dibaca ulang sebagai jadwal
+KOLOM_RINGKASAN = ("rasio_maks", "penentu", "kondisi_penentu", "status", "error")
+
+
+def parse_rows(rows):
+    """[Anggota] from schedule rows (dicts of column -> text); errors name the schedule line"""
+    anggota = []
+    ids = set()
+    for baris, row in enumerate(rows, 2):  # baris 1 adalah header
+        row = {str(k).strip(): str(v).strip() for k, v in row.items() if k is not None and v is not None}
+        if not any(row.values()):
+            continue
+        kolom = {k.lower(): k for k in row}
+        profil = row.get(kolom.get(KOLOM_PROFIL, ""), "")
+        id_ = row.get(kolom.get(KOLOM_ID, ""), "") or str(baris - 1)
+        if not profil:
+            raise ValueError(f"line {baris}: empty '{KOLOM_PROFIL}'")
+        if id_ in ids:
+            raise ValueError(f"line {baris}: duplicate id {id_!r}")
+        ids.add(id_)
+        params = {k: v for k, v in row.items()
+                  if k.lower() not in (KOLOM_ID, KOLOM_PROFIL, *KOLOM_RINGKASAN) and v != ""}
+        try:
+            struktur, sendi = wf_lib.split_params(params)
+        except ValueError as e:
+            raise ValueError(f"line {baris}: {e}") from None
+        anggota.append(Anggota(id_, profil, struktur, sendi))
+    return anggota
+
+
+def read_schedule(data, nama):
+    """[Anggota] from the bytes of a .csv or .xlsx schedule (Excel needs pandas + openpyxl)"""
+    if nama.lower().endswith((".xlsx", ".xlsm")):
+        import pandas as pd
+
+        df = pd.read_excel(io.BytesIO(data), dtype=str).fillna("")
+        return parse_rows(df.to_dict("records"))
+    teks = data.decode("utf-8-sig")
+    try:
+        dialek = csv.Sniffer().sniff(teks.split("\n", 1)[0], delimiters=",;\t")
+    except csv.Error:
+        dialek = csv.excel
+    return parse_rows(csv.DictReader(io.StringIO(teks), dialect=dialek))
+
+
+def validate(catalog, anggota):
+    """{id: error} for members whose profile or parameters the form cannot take"""
+    error = {}
+    for a in anggota:
+        try:
+            complete(wf_lib.section(catalog, a.profil))
+            wf_lib.request_from_params(catalog, a.params, a.sendi)
+        except ValueError as e:
+            error[a.id] = str(e)
+    return error
+
+
+def governing(hasil, metode="DFBT"):
+    """
+    Largest demand/capacity ratio of one method over all result tables:
+    {"rasio", "penentu" (result key), "kondisi" (row), "status"}. A check that
+    fails without a numeric ratio counts as an infinite ratio.
+    """
+    akhiran = f"_{metode.lower()}"
+    terbesar = {"rasio": 0.0, "penentu": None, "kondisi": None, "status": STATUS_OK}
+    for key, table in hasil.items():
+        if not key.endswith(akhiran) or not table:
+            continue
+        header = [str(h) for h in table[0]]
+        i_rasio = header.index("Rasio") if "Rasio" in header else len(header) - 2
+        for row in table[1:]:
+            status = str(row[-1]).strip()
+            if status not in (STATUS_OK, STATUS_GAGAL):
+                continue
+            rasio = parse_angka(row[i_rasio]) if i_rasio < len(row) else None
+            if rasio is None:
+                rasio = math.inf if status == STATUS_GAGAL else 0.0
+            if status == STATUS_GAGAL:
+                terbesar["status"] = STATUS_GAGAL
+            if terbesar["penentu"] is None or rasio > terbesar["rasio"]:
+                terbesar.update(rasio=rasio, penentu=key, kondisi=str(row[0]))
+    return terbesar
+
+
+def _kolom_param(anggota):
+    dipakai = {k for a in anggota for k in list(a.params) + list(a.sendi or {})}
+    return [k for k in INPUT_KEYS + SENDI_KEYS if k in dipakai]
+
+
+def summary_rows(anggota, hasil, error, metode="DFBT"):
+    """One dict per member (schedule order): parameters, governing ratio and status, or the error"""
+    kolom_param = _kolom_param(anggota)
+    rows = []
+    for a in anggota:
+        semua = {**a.params, **(a.sendi or {})}
+        row = {"id": a.id, "profil": a.profil, **{k: semua.get(k, "") for k in kolom_param}}
+        if a.id in hasil:
+            g = governing(hasil[a.id], metode)
+            row.update(rasio_maks=g["rasio"], penentu=g["penentu"], kondisi_penentu=g["kondisi"], status=g["status"],
+                       error="")
+        else:
+            row.update(dict.fromkeys(KOLOM_RINGKASAN), error=error.get(a.id, ""))
+        rows.append(row)
+    return rows
+
+
+def detail_rows(anggota, hasil):
+    """Every result line of every finished member, tagged with id and profile"""
+    rows = []
+    for a in anggota:
+        if a.id in hasil:
+            rows.extend({"id": a.id, "profil": a.profil, **record} for record in wf_lib.result_records(hasil[a.id]))
+    return rows
+
+
+def export_csv(anggota, hasil, error, metode="DFBT"):
+    """One CSV (bytes): every result line, prefixed with the member's summary columns"""
+    ringkasan = {row["id"]: row for row in summary_rows(anggota, hasil, error, metode)}
+    detail = detail_rows(anggota, hasil)
+    kolom_detail = [k for k in (detail[0] if detail else {}) if k not in ("id", "profil")]
+    kolom = list(next(iter(ringkasan.values()), {"id": None}).keys()) + kolom_detail
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=kolom, extrasaction="ignore")
+    writer.writeheader()
+    ditulis = set()
+    for row in detail:
+        writer.writerow({**ringkasan[row["id"]], **row})
+        ditulis.add(row["id"])
+    # Anggota yang gagal/belum selesai tetap muncul dengan kolom error
+    writer.writerows(row for id_, row in ringkasan.items() if id_ not in ditulis)
+    return out.getvalue().encode("utf-8-sig")
+
+
+def export_excel(anggota, hasil, error, metode="DFBT"):
+    """One .xlsx (bytes) with a "Ringkasan" and a "Detail" sheet (needs pandas + openpyxl)"""
+    import pandas as pd
+
+    out = io.BytesIO()
+    with pd.ExcelWriter(out, engine="openpyxl") as writer:
+        pd.DataFrame(summary_rows(anggota, hasil, error, metode)).to_excel(writer, sheet_name="Ringkasan", index=False)
+        pd.DataFrame(detail_rows(anggota, hasil)).to_excel(writer, sheet_name="Detail", index=False)
+    return out.getvalue()
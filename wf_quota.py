@@ -0,0 +1,155 @@
+"""
+Client-side scheduling of Google Sheets API calls under the per-minute quotas.
+
+Every read and write request first takes a token from a token bucket sized to
+the quota, so bursts are spread out before they reach the API instead of
+being answered with 429s and retried. A caller that finds the bucket empty
+reserves the next token and sleeps until it is due, so waiters are served in
+arrival order rather than all retrying at the same moment.
+
+The bucket state lives in memory (shared by every session of the process) or,
+when a lock file is configured, in that file under an exclusive `flock`, so
+several worker processes on one host share the same budget.
+"""
+import json
+import os
+import threading
+import time
+
+# Kuota default Sheets API: 60 permintaan baca dan 60 tulis per menit per pengguna
+# (service account) per proyek
+READ_PER_MINUTE = 60
+WRITE_PER_MINUTE = 60
+
+
+class QuotaTimeout(Exception):
+    """Raised when a call would have to wait longer than its timeout for a token"""
+
+
+class _Bucket:
+    """Token bucket with reservations; subclasses decide where the state is kept"""
+
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or max(1, per_minute // 6))
+        self._local = threading.Lock()
+        self.waiting = 0          # permintaan yang sedang menunggu token di proses ini
+        self.calls = 0
+        self.waited = 0           # permintaan yang harus menunggu
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _reserve(self, state, now, n, timeout):
+        """Take n tokens from `state` (tokens, stamp); returns (new state, seconds to wait)"""
+        tokens, stamp = state
+        tokens = min(self.capacity, tokens + max(0.0, now - stamp) * self.rate) - n
+        wait = max(0.0, -tokens / self.rate)
+        if timeout is not None and wait > timeout:
+            raise QuotaTimeout(f"Sheets quota: next slot in {wait:.1f} s")
+        return (tokens, now), wait
+
+    def _take(self, n, timeout):
+        raise NotImplementedError
+
+    def acquire(self, n=1, timeout=None):
+        """Block until n tokens are available; returns the seconds waited"""
+        with self._local:
+            self.waiting += 1
+        try:
+            wait = self._take(n, timeout)
+            if wait > 0:
+                time.sleep(wait)
+        finally:
+            with self._local:
+                self.waiting -= 1
+        with self._local:
+            self.calls += 1
+            if wait > 0:
+                self.waited += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+        return wait
+
+    def stats(self):
+        with self._local:
+            return {
+                "per_minute": round(self.rate * 60),
+                "queue_depth": self.waiting,
+                "calls": self.calls,
+                "waited": self.waited,
+                "wait_avg": self.wait_total / self.calls if self.calls else 0.0,
+                "wait_max": self.wait_max,
+            }
+
+
+class MemoryBucket(_Bucket):
+    """Bucket shared by the threads of one process"""
+
+    def __init__(self, per_minute, burst=None):
+        super().__init__(per_minute, burst)
+        self._state = (self.capacity, time.time())
+        self._state_lock = threading.Lock()
+
+    def _take(self, n, timeout):
+        with self._state_lock:
+            self._state, wait = self._reserve(self._state, time.time(), n, timeout)
+        return wait
+
+
+class FileBucket(_Bucket):
+    """Bucket whose state is kept in a JSON file locked with flock, shared by processes on one host"""
+
+    def __init__(self, path, per_minute, burst=None):
+        super().__init__(per_minute, burst)
+        import fcntl  # POSIX saja
+        self._fcntl = fcntl
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _take(self, n, timeout):
+        with open(self.path, "a+", encoding="utf-8") as f:
+            self._fcntl.flock(f, self._fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    raw = json.loads(f.read() or "null")
+                    state = (float(raw["tokens"]), float(raw["stamp"]))
+                except (ValueError, TypeError, KeyError):
+                    state = (self.capacity, time.time())
+                (tokens, stamp), wait = self._reserve(state, time.time(), n, timeout)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "stamp": stamp}))
+                f.flush()
+            finally:
+                self._fcntl.flock(f, self._fcntl.LOCK_UN)
+        return wait
+
+
+class QuotaGovernor:
+    """Read and write buckets for the Sheets API"""
+
+    def __init__(self, read, write):
+        self.buckets = {"read": read, "write": write}
+
+    def acquire(self, kind, n=1, timeout=None):
+        """Wait for quota for n requests of `kind` ("read" or "write")"""
+        return self.buckets[kind].acquire(n, timeout)
+
+    def stats(self):
+        return {kind: bucket.stats() for kind, bucket in self.buckets.items()}
+
+
+def governor_from_env():
+    """
+    Build the governor from the environment: WF_SHEETS_READ_PER_MIN and
+    WF_SHEETS_WRITE_PER_MIN override the quotas, WF_QUOTA_LOCK_DIR switches to
+    file-backed buckets shared by every process using that directory.
+    """
+    read = int(os.environ.get("WF_SHEETS_READ_PER_MIN", READ_PER_MINUTE))
+    write = int(os.environ.get("WF_SHEETS_WRITE_PER_MIN", WRITE_PER_MINUTE))
+    folder = os.environ.get("WF_QUOTA_LOCK_DIR")
+    if folder:
+        return QuotaGovernor(FileBucket(os.path.join(folder, "sheets_read.json"), read),
+                             FileBucket(os.path.join(folder, "sheets_write.json"), write))
+    return QuotaGovernor(MemoryBucket(read), MemoryBucket(write))